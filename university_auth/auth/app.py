@@ -2,9 +2,7 @@ from jwt.exceptions import InvalidTokenError
 import jwt
 
 from core.config import settings
-from core.utils.database import db_helper
-from core.models.user import User
-from utils import get_user
+from user_loader import user_loader
 
 from schemas import TokenPaylod
 
@@ -14,7 +12,7 @@ import asyncio
 
 from core.config import settings
 
-broker = RabbitBroker(settings.rabbit.url)
+broker = RabbitBroker(settings.rabbit.url, max_consumers=settings.rabbit.prefetch_count)
 app = FastStream(broker)
 
 
@@ -32,19 +30,11 @@ async def validate_token_subscriber(token: str) -> TokenPaylod:
     except InvalidTokenError:
         return TokenPaylod(valid=False)
 
-    async with db_helper.session_factory() as session:
-        user: User | None = await get_user(session, username=username)
-        if not user:
-            return TokenPaylod(valid=False)
+    principal = await user_loader.load(username)
+    if principal is None:
+        return TokenPaylod(valid=False)
 
-    return TokenPaylod(
-        valid=True,
-        user_id=user.id,
-        group_id=payload.get("group_id"),
-        username=user.username,
-        role=user.roles[0].name if user.roles else None,
-        permissions=[p.name for r in user.roles for p in r.permissions],
-    )
+    return principal.model_copy(update={"group_id": payload.get("group_id")})
 
 
 if __name__ == "__main__":
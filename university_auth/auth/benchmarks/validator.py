@@ -0,0 +1,182 @@
+"""
+Token validation throughput of validate_token_subscriber, by lookup batch size.
+
+    python -m benchmarks.validator --users 2000 --messages 2000 --concurrency 256 --batch-sizes 1 16 100 256
+
+Users with a role and its permissions are committed under a unique tag and
+deleted afterwards. Signed tokens are published as RPC requests to the
+FastStream in-memory test broker, `--concurrency` at a time, so the
+subscriber runs exactly as it does behind RabbitMQ minus the network; the
+same tokens are also passed to the handler directly, because the test
+broker's own per-message overhead caps the first figure. The
+baseline resolves every message with its own get_user query, as the
+subscriber did before UserBatchLoader. Each batch-size run starts with an
+empty cache; the last one repeats the largest batch size with every user
+already cached.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from fastapi import HTTPException
+from faststream.rabbit import TestRabbitBroker
+from sqlalchemy import text
+
+import app
+from core.config import settings
+from core.utils.database import db_helper
+from schemas import TokenPaylod
+from user_loader import UserBatchLoader
+from utils import get_user
+
+PERMISSIONS = ("read:quiz", "create:quiz", "read:results", "read:questions")
+
+
+class PerMessageLoader:
+    """Lookup before micro-batching: one user query per message, no cache."""
+
+    async def load(self, username: str) -> TokenPaylod | None:
+        async with db_helper.session_factory() as session:
+            try:
+                user = await get_user(session, username)
+            except HTTPException:
+                return None
+        return TokenPaylod(
+            valid=True,
+            user_id=user.id,
+            username=user.username,
+            role=user.roles[0].name if user.roles else None,
+            permissions=[p.name for r in user.roles for p in r.permissions],
+        )
+
+
+async def seed_users(tag: str, count: int) -> list[str]:
+    """`count` users sharing one role with PERMISSIONS; returns their usernames."""
+    async with db_helper.session_factory() as session:
+        role_id = (await session.execute(
+            text("INSERT INTO roles (name) VALUES (:name) RETURNING id"), {"name": tag},
+        )).scalar_one()
+        await session.execute(
+            text(
+                """
+                WITH created AS (
+                    INSERT INTO permissions (name)
+                    SELECT :tag || '-' || name FROM unnest(CAST(:names AS varchar[])) AS name
+                    RETURNING id
+                )
+                INSERT INTO role_permissions (role_id, permission_id) SELECT :role_id, id FROM created
+                """
+            ),
+            {"tag": tag, "names": list(PERMISSIONS), "role_id": role_id},
+        )
+        usernames = (await session.execute(
+            text(
+                """
+                WITH created AS (
+                    INSERT INTO users (username, password)
+                    SELECT :tag || '-' || n, 'x' FROM generate_series(1, :count) AS n
+                    RETURNING id, username
+                ), linked AS (
+                    INSERT INTO user_roles (user_id, role_id) SELECT id, :role_id FROM created
+                )
+                SELECT username FROM created
+                """
+            ),
+            {"tag": tag, "count": count, "role_id": role_id},
+        )).scalars().all()
+        await session.commit()
+    return list(usernames)
+
+
+async def drop_seeded(tag: str) -> None:
+    async with db_helper.session_factory() as session:
+        await session.execute(text("DELETE FROM users WHERE username LIKE :tag || '%'"), {"tag": tag})
+        await session.execute(text("DELETE FROM permissions WHERE name LIKE :tag || '%'"), {"tag": tag})
+        await session.execute(text("DELETE FROM roles WHERE name LIKE :tag || '%'"), {"tag": tag})
+        await session.commit()
+
+
+def access_token(username: str) -> str:
+    expires = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt.access_secret_minutes)
+    return jwt.encode(
+        {"username": username, "exp": expires},
+        settings.jwt.access_secret_key,
+        algorithm=settings.jwt.algorithm,
+    )
+
+
+async def run(validate, tokens: list[str], concurrency: int) -> float:
+    """Validations per second; every reply must be a valid principal."""
+    pending = iter(tokens)
+
+    async def publisher():
+        for token in pending:
+            reply = await validate(token)
+            if not reply["valid"]:
+                raise RuntimeError(f"Token rejected: {reply}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(publisher() for _ in range(concurrency)))
+    return len(tokens) / (time.perf_counter() - started)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    loader = app.user_loader
+    try:
+        usernames = await seed_users(tag, args.users)
+        tokens = [access_token(usernames[n % len(usernames)]) for n in range(args.messages)]
+        print(f"{args.messages} messages over {len(usernames)} users, {args.concurrency} in flight")
+
+        def batch_loader(batch_size: int) -> UserBatchLoader:
+            return UserBatchLoader(
+                batch_size=batch_size,
+                batch_wait=settings.validator.batch_wait,
+                cache_ttl=settings.validator.cache_ttl,
+                cache_max_size=settings.validator.cache_max_size,
+            )
+
+        async def direct(token: str) -> dict:
+            return (await app.validate_token_subscriber(token)).model_dump()
+
+        async with TestRabbitBroker(app.broker) as broker:
+            async def published(token: str) -> dict:
+                return await broker.publish(token, settings.rabbit.queue_name, rpc=True)
+
+            async def measure(label: str, make_loader, warm: bool = False) -> None:
+                rates = []
+                for validate in (published, direct):
+                    # A fresh loader per measurement, so neither run inherits the other's cache
+                    app.user_loader = make_loader()
+                    if warm:
+                        await run(direct, tokens, args.concurrency)
+                    rates.append(await run(validate, tokens, args.concurrency))
+                print(f"{label:<32} {rates[0]:12.1f} {rates[1]:12.1f}")
+
+            print(f"{'':<32} {'test broker':>12} {'handler':>12}   validations/s")
+            await measure("one query per message", PerMessageLoader)
+            for batch_size in args.batch_sizes:
+                await measure(f"batch size {batch_size}", lambda: batch_loader(batch_size))
+            largest = args.batch_sizes[-1]
+            await measure(f"batch size {largest}, warm cache", lambda: batch_loader(largest), warm=True)
+    finally:
+        app.user_loader = loader
+        await drop_seeded(tag)
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark token validations per second")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=256, help="Requests in flight, like prefetch_count")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 100, 256])
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
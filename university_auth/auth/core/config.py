@@ -33,6 +33,16 @@ class RabbitMqSettings(BaseModel):
     
     url: str
     queue_name: str
+    # Messages in flight per consumer; bounds how large a micro-batch can get
+    prefetch_count: int = 256
+
+
+class ValidatorConfig(BaseModel):
+    # Usernames of concurrent messages are resolved together, see user_loader.py
+    batch_size: int = 100
+    batch_wait: float = 0.005
+    cache_ttl: int = 30
+    cache_max_size: int = 10_000
 
 class AppSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -45,5 +55,6 @@ class AppSettings(BaseSettings):
     db: DatabaseConfig
     jwt: JwtConfig
     rabbit: RabbitMqSettings
+    validator: ValidatorConfig = ValidatorConfig()
 
 settings = AppSettings()
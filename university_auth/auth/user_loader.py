@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from core.config import settings
+from core.utils.database import db_helper
+from schemas import TokenPaylod
+from utils import get_users
+
+log = logging.getLogger(__name__)
+
+
+class UserBatchLoader:
+    """
+    Resolves usernames to principals in micro-batches.
+
+    Concurrent `load()` calls are collected for up to `batch_wait` seconds (or
+    until `batch_size` distinct usernames are pending) and answered with a
+    single `username = ANY(...)` query, so all of them return, and their
+    replies go out, together. Found users are kept for `cache_ttl` seconds.
+    """
+
+    def __init__(self, batch_size: int, batch_wait: float, cache_ttl: int, cache_max_size: int):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self._cache: OrderedDict[str, tuple[float, TokenPaylod]] = OrderedDict()
+        self._pending: dict[str, asyncio.Future] = {}
+        self._flush_timer: asyncio.TimerHandle | None = None
+
+    def _cached(self, username: str) -> TokenPaylod | None:
+        entry = self._cache.get(username)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[username]
+            return None
+        self._cache.move_to_end(username)
+        return entry[1]
+
+    def _remember(self, username: str, principal: TokenPaylod) -> None:
+        self._cache[username] = (time.monotonic() + self.cache_ttl, principal)
+        self._cache.move_to_end(username)
+        while len(self._cache) > self.cache_max_size:
+            self._cache.popitem(last=False)
+
+    async def load(self, username: str) -> TokenPaylod | None:
+        principal = self._cached(username)
+        if principal is not None:
+            return principal
+
+        future = self._pending.get(username)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[username] = loop.create_future()
+            if len(self._pending) >= self.batch_size:
+                self._start_flush()
+            elif self._flush_timer is None:
+                self._flush_timer = loop.call_later(self.batch_wait, self._start_flush)
+
+        return await asyncio.shield(future)
+
+    def _start_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.get_running_loop().create_task(self._flush(batch))
+
+    async def _flush(self, batch: dict[str, asyncio.Future]) -> None:
+        try:
+            async with db_helper.session_factory() as session:
+                users = await get_users(session, usernames=list(batch))
+        except Exception as e:
+            log.exception(f"Failed to resolve a batch of {len(batch)} usernames")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        log.debug(f"Resolved {len(batch)} usernames, {len(users)} found")
+        for username, future in batch.items():
+            user = users.get(username)
+            principal = None
+            if user is not None:
+                principal = TokenPaylod(
+                    valid=True,
+                    user_id=user.id,
+                    username=user.username,
+                    role=user.roles[0].name if user.roles else None,
+                    permissions=[p.name for r in user.roles for p in r.permissions],
+                )
+                self._remember(username, principal)
+            if not future.done():
+                future.set_result(principal)
+
+
+user_loader = UserBatchLoader(
+    batch_size=settings.validator.batch_size,
+    batch_wait=settings.validator.batch_wait,
+    cache_ttl=settings.validator.cache_ttl,
+    cache_max_size=settings.validator.cache_max_size,
+)
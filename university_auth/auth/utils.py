@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select
+from sqlalchemy import select, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from fastapi import HTTPException, status
 from fastapi.security import  APIKeyHeader 
@@ -31,6 +32,18 @@ async def get_user(session: AsyncSession, username: str):
     return user_data
 
 
+async def get_users(session: AsyncSession, usernames: list[str]) -> dict[str, User]:
+    """Users among `usernames` with roles and permissions, in one round trip per relation."""
+    stmt = (
+        select(User)
+        .where(User.username == any_(bindparam("usernames", usernames, type_=ARRAY(String))))
+        .options(
+            selectinload(User.roles).selectinload(Role.permissions)
+        )
+    )
+    result = await session.execute(stmt)
+    return {user.username: user for user in result.scalars().all()}
+
 
 
 
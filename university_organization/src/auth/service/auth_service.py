@@ -10,12 +10,13 @@ from core.models import User
 from auth.schemas.auth import UserCredentials 
 from auth.utils.authenticate import authenticate_user_with_hemis, authenticate_user_from_db
 from auth.service.student_service import StudentService
-from auth.utils.security import create_access_token, create_refresh_token, hash_password 
+from auth.utils.security import create_access_token, create_refresh_token, build_token_claims
+from auth.utils.password_hasher import password_hasher
+from auth.utils.login_cache import login_cache
 from auth.exceptions import handle_jwt_exceptions
 from auth.schemas.auth import ChangePassword
 from sqlalchemy import update
 
-from auth.utils.security import hash_password
 
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -58,12 +59,7 @@ class AuthService:
             )
             
             if user_data:
-                roles = [role.name for role in user_data.roles]
-                data = {
-                    "user_id": user_data.id,
-                    "username": user_data.username,
-                    "role": roles
-                }
+                data = build_token_claims(user_data)
                 return {
                     "access_token": create_access_token(data=data),
                     "refresh_token": create_refresh_token(data=data),
@@ -82,7 +78,8 @@ class AuthService:
             
             try:
                 service = StudentService(session=self.session, token=token)
-                await service.save_student_data_to_db()
+                if not await service.is_provisioned(username=credentials.username):
+                    await service.save_student_data_to_db()
             except SQLAlchemyError as e:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -100,19 +97,7 @@ class AuthService:
                     detail="Foydalanuvchi ma'lumotlari topilmadi."
                 )
             
-            roles = [role.name for role in user_data.roles]
-            
-            # Fixed: Check if student exists before accessing group_id
-            group_id = None
-            if user_data.student:
-                group_id = user_data.student.group_id
-            
-            data = {
-                "user_id": user_data.id,
-                "username": user_data.username,
-                "group_id": group_id,
-                "role": roles,
-            }
+            data = build_token_claims(user_data)
             
             return {
                 "access_token": create_access_token(data=data),
@@ -128,7 +113,7 @@ class AuthService:
             )
 
     async def register(self, credentials: UserCredentials):
-        hashed_password = hash_password(password=credentials.password)
+        hashed_password = await password_hasher.hash(password=credentials.password)
         credentials_with_hash = UserCredentials(
             username=credentials.username,
             password=hashed_password,
@@ -159,7 +144,13 @@ class AuthService:
                 detail="Invalid token payload",
             )
 
-        access_token = create_access_token(data={"username": username, "role": role})
+        # Carry the remaining claims over so the new token is as complete as the old one
+        claims = {
+            key: payload[key]
+            for key in ("user_id", "group_id", "perms")
+            if key in payload
+        }
+        access_token = create_access_token(data={"username": username, "role": role, **claims})
         return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -184,7 +175,7 @@ class AuthService:
             )
 
         # 2. Hash new password
-        new_hashed_password = hash_password(credentials.new_password)
+        new_hashed_password = await password_hasher.hash(credentials.new_password)
 
         # 3. Update DB
         stmt = (
@@ -195,6 +186,7 @@ class AuthService:
 
         await self.session.execute(stmt)
         await self.session.commit()
+        login_cache.purge(user.username)
 
         return {"message": "Password successfully changed"}
 
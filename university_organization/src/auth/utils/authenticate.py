@@ -1,9 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from httpx import AsyncClient
-
-from .security import get_user , verify_password
-
-from core.config import settings
+from .security import get_user, UNUSABLE_PASSWORD
+from .password_hasher import password_hasher
+from .login_cache import login_cache
+from .hemis_client import hemis_client
 
 from auth.exceptions import validate_user_credentials , validate_token , handle_httpx_errors
 from auth.utils.register_user import student_register
@@ -17,15 +16,13 @@ async def authenticate_user_with_hemis(
 
     payload = await validate_user_credentials(credentials=credentials)
 
-    url = f"{settings.hemis.base_url}/auth/login"
     headers = {"Content-Type": "application/json"}
 
-    async with AsyncClient() as client:
-        response = await client.post(url=url, json=payload, headers=headers)
-        response.raise_for_status()
+    response = await hemis_client.post("auth/login", json=payload, headers=headers)
+    response.raise_for_status()
 
-        response_data = response.json()
-        token = response_data.get("data", {}).get("token")
+    response_data = response.json()
+    token = response_data.get("data", {}).get("token")
 
 
     validated_token = await validate_token(token=token)
@@ -45,9 +42,12 @@ async def authenticate_user_from_db(
         session=session, 
         username=credentials.username
     )
-    if not user_data:
+    if not user_data or user_data.password == UNUSABLE_PASSWORD:
         return False
-    if not verify_password(plain_password=credentials.password, hashed_password=user_data.password):
+    if login_cache.check(credentials.username, credentials.password, user_data.id, user_data.password):
+        return user_data
+    if not await password_hasher.verify(plain_password=credentials.password, hashed_password=user_data.password):
         return False
+    login_cache.remember(credentials.username, credentials.password, user_data.id, user_data.password)
     return user_data
     
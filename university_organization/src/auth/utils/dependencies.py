@@ -10,6 +10,8 @@ from core.config import settings
 from core.utils.database import db_helper
 from core.models.user import User
 from .security import get_user  # your local get_user function
+from .principal_cache import principal_cache
+from .permission_registry import mask_of, permission_registry
 
 
 
@@ -37,14 +39,27 @@ async def validate_token_subscriber(token: str) -> TokenPaylod:
         user_id=user.id,
         username=user.username,
         role=user.roles[0].name if user.roles else None,
-        permissions=[p.name for r in user.roles for p in r.permissions],
+        permission_mask=mask_of(p.id for r in user.roles for p in r.permissions),
     )
 
 
+def _token_exp(token: str) -> float | None:
+    """`exp` of an already validated token."""
+    return jwt.decode(token, options={"verify_signature": False}).get("exp")
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> TokenPaylod:
-    payload = await validate_token_subscriber(token)
+    if not settings.cache.principal_enabled:
+        payload = await validate_token_subscriber(token)
+    else:
+        key = principal_cache.key(token)
+        payload = principal_cache.get(key)
+        if payload is None:
+            payload = await validate_token_subscriber(token)
+            if payload.valid:
+                principal_cache.put(key, payload, token_exp=_token_exp(token))
 
     if not payload.valid:
         raise HTTPException(
@@ -59,22 +74,17 @@ def require_permission(*permissions: str, any_of: bool = True) -> Callable:
     """
     Dependency to protect routes by permissions.
 
+    The required permissions are compiled to a mask once, here, so the check
+    itself is a single AND against the principal's mask.
     """
+    required = permission_registry.compile(permissions)
+
     async def checker(user: TokenPaylod = Depends(get_current_user)) -> TokenPaylod:
-        user_perms = set(user.permissions or [])
-
-        if any_of:
-            if not any(p in user_perms for p in permissions):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Permission denied",
-                )
-        else:
-            if not all(p in user_perms for p in permissions):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Permission denied",
-                )
+        if not required.allows(user.permission_mask, any_of=any_of):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permission denied",
+            )
 
         return user
 
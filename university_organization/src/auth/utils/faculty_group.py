@@ -1,54 +1,129 @@
+import asyncio
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select
+
 from core.utils.normalize_type_name import normalize_type_name
-from core.utils.service import BasicService
+from core.utils.cache_invalidation import SCOPE_ALL, SCOPE_FACULTY_GROUP, subscribe
 from core.models.faculty import Faculty
 from core.models.group import Group
-from faculty.schemas import FacultyCreate
-from group.schemas import GroupCreate
-from sqlalchemy import select
 
+log = logging.getLogger(__name__)
+
+
+class NameIdCache:
+    """
+    In-process normalized name -> id map for faculties, and
+    (faculty id, normalized name) -> id map for groups.
+
+    Filled at startup, extended as rows are resolved, and cleared on the
+    "faculty_group" invalidation scope that renames and deletes publish.
+    Concurrent lookups of the same missing name share one resolution.
+    """
+
+    def __init__(self):
+        self.faculties: dict[str, int] = {}
+        self.groups: dict[tuple[int, str], int] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+    async def load(self, session: AsyncSession) -> None:
+        self.faculties = dict((await session.execute(select(Faculty.name, Faculty.id))).all())
+        self.groups = {
+            (faculty_id, name): row_id
+            for faculty_id, name, row_id in (await session.execute(select(Group.faculty_id, Group.name, Group.id))).all()
+        }
+        log.info(f"Loaded {len(self.faculties)} faculties and {len(self.groups)} groups")
+
+    def clear(self) -> None:
+        self.faculties.clear()
+        self.groups.clear()
+
+    def handle_invalidation(self, scope: str) -> None:
+        if scope in (SCOPE_ALL, SCOPE_FACULTY_GROUP):
+            self.clear()
+
+    async def single_flight(self, kind: str, name, resolve) -> int:
+        key = (kind, name)
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
 
-async def faculty_create_check(session: AsyncSession, faculty_name: str) -> Faculty:
-    crud = BasicService(session=session)
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            row_id = await resolve()
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; do not leave the exception unretrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(row_id)
+            return row_id
+        finally:
+            del self._inflight[key]
 
+
+name_id_cache = NameIdCache()
+subscribe(name_id_cache.handle_invalidation)
+
+
+async def _insert_or_get(session: AsyncSession, model, values: dict) -> int:
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING id on the unique key made of
+    all `values`; only a lost race needs the extra SELECT.
+    """
+    row_id = (await session.execute(
+        insert(model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=list(values))
+        .returning(model.id)
+    )).scalar_one_or_none()
+
+    if row_id is None:
+        row_id = (await session.execute(
+            select(model.id).where(*(getattr(model, key) == value for key, value in values.items()))
+        )).scalar_one()
+    return row_id
+
+
+async def faculty_create_check(session: AsyncSession, faculty_name: str) -> int:
     faculty_name = normalize_type_name(value=faculty_name)
-    faculty_create = FacultyCreate(name=faculty_name)
-    
-    stmt = select(Faculty).where(Faculty.name == faculty_create.name)
-    result = await session.execute(stmt)
-    existing_data = result.scalars().first()
-    
-    if not existing_data:
-        new_faculty = Faculty(name=faculty_create.name)
-        session.add(new_faculty)
-        await session.commit()
-        await session.refresh(new_faculty)
-        return new_faculty
-    
-    return existing_data
 
+    faculty_id = name_id_cache.faculties.get(faculty_name)
+    if faculty_id is not None:
+        return faculty_id
 
-async def group_create_check(session: AsyncSession, group_name: str, faculty_name: str) -> Group:
+    async def resolve() -> int:
+        row_id = await _insert_or_get(session, Faculty, {"name": faculty_name})
+        await session.commit()
+        name_id_cache.faculties[faculty_name] = row_id
+        return row_id
 
-    faculty_data: Faculty = await faculty_create_check(session=session, faculty_name=faculty_name)
+    return await name_id_cache.single_flight("faculty", faculty_name, resolve)
 
-    crud = BasicService(session=session)
 
+async def group_create_check(session: AsyncSession, group_name: str, faculty_name: str) -> int:
+    """Id of the group, creating it (and its faculty) on first sight in one transaction."""
     group_name = normalize_type_name(value=group_name)
-    group_create = GroupCreate(
-        faculty_id=faculty_data.id,
-        name=group_name
-    )
-    
-    stmt = select(Group).where(Group.name == group_create.name)
-    result = await session.execute(stmt)
-    existing_data = result.scalars().first()
-    
-    if not existing_data:
-        new_group = Group(name = group_create.name, faculty_id = group_create.faculty_id)
-        session.add(new_group)
+    faculty_name = normalize_type_name(value=faculty_name)
+
+    faculty_id = name_id_cache.faculties.get(faculty_name)
+    if faculty_id is not None:
+        group_id = name_id_cache.groups.get((faculty_id, group_name))
+        if group_id is not None:
+            return group_id
+
+    async def resolve() -> int:
+        row_faculty_id = faculty_id
+        if row_faculty_id is None:
+            row_faculty_id = await _insert_or_get(session, Faculty, {"name": faculty_name})
+        row_id = await _insert_or_get(session, Group, {"faculty_id": row_faculty_id, "name": group_name})
         await session.commit()
-        await session.refresh(new_group)
-        return new_group
-    
-    return existing_data
+        # Cached only once committed, so a rollback never leaves unknown ids behind
+        name_id_cache.faculties[faculty_name] = row_faculty_id
+        name_id_cache.groups[(row_faculty_id, group_name)] = row_id
+        return row_id
+
+    return await name_id_cache.single_flight("group", (faculty_name, group_name), resolve)
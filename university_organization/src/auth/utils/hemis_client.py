@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+from core.config import settings
+from core.utils.metrics import metrics
+
+try:
+    import h2  # noqa: F401  # enables HTTP/2 in httpx
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {502, 503, 504}
+
+
+class HemisClient:
+    """
+    Application-scoped HTTP client for the HEMIS API.
+
+    Keeps pooled keep-alive connections (HTTP/2 when `h2` is installed), caps
+    concurrent requests with a semaphore, and retries connection errors,
+    timeouts and 502/503/504 with exponential backoff and full jitter.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int,
+        max_concurrency: int,
+        timeout: float,
+        connect_timeout: float,
+        retries: int,
+        retry_backoff: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        # Only set in tests (httpx.MockTransport); None uses the default pool
+        self.transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: httpx.AsyncClient | None = None
+
+        self.retried = metrics.counter("hemis.retries")
+        self.failed = metrics.counter("hemis.failures")
+
+    def start(self) -> None:
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            transport=self.transport,
+        )
+        log.info(f"HEMIS client started for {self.base_url} (http2={HTTP2_AVAILABLE})")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, self.retry_backoff * 2 ** attempt)
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send a request; the caller decides what to do with the status code."""
+        self.start()
+        path = "/" + endpoint.lstrip("/")
+        latency = metrics.histogram(f"hemis.{path.strip('/').replace('/', '_')}.latency_ms")
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            started = time.perf_counter()
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    self.failed.inc()
+                    raise
+                log.warning(f"HEMIS {method} {path} failed ({e!r}), retrying")
+            else:
+                latency.observe((time.perf_counter() - started) * 1000)
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+                log.warning(f"HEMIS {method} {path} answered {response.status_code}, retrying")
+
+            self.retried.inc()
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def get(self, endpoint: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", endpoint, **kwargs)
+
+    async def post(self, endpoint: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", endpoint, **kwargs)
+
+
+hemis_client = HemisClient(
+    base_url=settings.hemis.base_url,
+    max_connections=settings.hemis.max_connections,
+    max_concurrency=settings.hemis.max_concurrency,
+    timeout=settings.hemis.timeout,
+    connect_timeout=settings.hemis.connect_timeout,
+    retries=settings.hemis.retries,
+    retry_backoff=settings.hemis.retry_backoff,
+)
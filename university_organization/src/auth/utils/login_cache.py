@@ -0,0 +1,75 @@
+import hashlib
+import hmac
+import secrets
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from core.config import settings
+from core.utils.metrics import metrics
+
+
+class _Verified(NamedTuple):
+    expires_at: float
+    digest: bytes
+    user_id: int
+    password_hash: str
+
+
+class LoginCache:
+    """
+    Short-lived record of successful password checks, so retried logins skip bcrypt.
+
+    Plain passwords are never stored: entries hold HMAC(password) under a key
+    generated per process. An entry only matches while the user's stored hash
+    is the one it was verified against, so a password changed by another worker
+    misses here as well; `purge()` drops it right away in this one.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._secret = secrets.token_bytes(32)
+        self._entries: OrderedDict[str, _Verified] = OrderedDict()
+
+        self.hits = metrics.counter("login_cache.hits")
+        self.misses = metrics.counter("login_cache.misses")
+        metrics.gauge("login_cache.size", lambda: len(self._entries))
+
+    def _digest(self, password: str) -> bytes:
+        return hmac.new(self._secret, password.encode("utf-8"), hashlib.sha256).digest()
+
+    def check(self, username: str, password: str, user_id: int, password_hash: str) -> bool:
+        entry = self._entries.get(username)
+        if (
+            entry is None
+            or entry.expires_at < time.monotonic()
+            or entry.user_id != user_id
+            or entry.password_hash != password_hash
+            or not hmac.compare_digest(entry.digest, self._digest(password))
+        ):
+            self.misses.inc()
+            return False
+
+        self.hits.inc()
+        return True
+
+    def remember(self, username: str, password: str, user_id: int, password_hash: str) -> None:
+        self._entries[username] = _Verified(
+            expires_at=time.monotonic() + self.ttl,
+            digest=self._digest(password),
+            user_id=user_id,
+            password_hash=password_hash,
+        )
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def purge(self, username: str) -> None:
+        self._entries.pop(username, None)
+
+
+login_cache = LoginCache(
+    ttl=settings.cache.login_ttl,
+    max_size=settings.cache.login_max_size,
+)
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+from core.utils.metrics import metrics
+from .security import hash_password, verify_password
+
+log = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a process pool so it never blocks the event loop.
+
+    At most `max_pending` operations may be queued or running at once; past
+    that callers get 429 instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending = 0
+
+        metrics.gauge("password_hasher.pending", lambda: self._pending)
+        self.rejected = metrics.counter("password_hasher.rejected")
+        self.hash_latency = metrics.histogram("password_hasher.hash_latency_ms")
+        self.verify_latency = metrics.histogram("password_hasher.verify_latency_ms")
+
+    def start(self) -> None:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            log.info(f"Password hashing pool started with {self.workers} workers")
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, histogram, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self.start()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        finally:
+            self._pending -= 1
+            histogram.observe((time.perf_counter() - started) * 1000)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hash_latency, hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.verify_latency, verify_password, plain_password, hashed_password)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hashing.workers,
+    max_pending=settings.password_hashing.max_pending,
+)
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from typing import Iterable
+
+from sqlalchemy import select
+
+from core.models.permission import Permission
+from core.utils.cache_invalidation import SCOPE_ALL, subscribe
+from core.utils.database import db_helper
+
+log = logging.getLogger(__name__)
+
+
+def mask_of(bits: Iterable[int]) -> int:
+    mask = 0
+    for bit in bits:
+        mask |= 1 << bit
+    return mask
+
+
+class PermissionRegistry:
+    """
+    Permission name -> bit index.
+
+    The bit index is the permission's primary key, so it is the same in every
+    worker and every service sharing the database, and a principal's mask can
+    be built straight from the ids of its permissions. Loaded at startup right
+    after sync_permissions, and reloaded whenever permissions are invalidated.
+    """
+
+    def __init__(self):
+        self._bits: dict[str, int] = {}
+        self.version = 0
+
+    def load(self, rows: Iterable[tuple[str, int]]) -> None:
+        self._bits = dict(rows)
+        self.version += 1
+
+    async def refresh(self) -> None:
+        async with db_helper.session_factory() as session:
+            rows = (await session.execute(select(Permission.name, Permission.id))).all()
+        self.load(rows)
+        log.info(f"Permission registry loaded {len(self._bits)} permissions")
+
+    def handle_invalidation(self, scope: str) -> None:
+        # A rename or re-creation moves a name to another id
+        if scope == SCOPE_ALL and self.version:
+            asyncio.get_running_loop().create_task(self.refresh())
+
+    def bit(self, name: str) -> int | None:
+        return self._bits.get(name)
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Mask of `names`; names the registry does not know are ignored."""
+        return mask_of(bit for bit in map(self._bits.get, names) if bit is not None)
+
+    def names(self, mask: int) -> list[str]:
+        return [name for name, bit in self._bits.items() if mask >> bit & 1]
+
+    def compile(self, names: Iterable[str]) -> "RequiredPermissions":
+        return RequiredPermissions(self, tuple(names))
+
+
+class RequiredPermissions:
+    """
+    A route's required permissions compiled to a mask.
+
+    Routes are declared before the registry is loaded, so the mask is resolved
+    on first use and again only after the registry is reloaded.
+    """
+
+    __slots__ = ("registry", "names", "_version", "_mask", "_complete")
+
+    def __init__(self, registry: PermissionRegistry, names: tuple[str, ...]):
+        self.registry = registry
+        self.names = names
+        self._version = -1
+        self._mask = 0
+        self._complete = False
+
+    def _resolve(self) -> None:
+        bits = [self.registry.bit(name) for name in self.names]
+        self._mask = mask_of(bit for bit in bits if bit is not None)
+        self._complete = None not in bits
+        self._version = self.registry.version
+
+    def allows(self, mask: int, any_of: bool = True) -> bool:
+        if self._version != self.registry.version:
+            self._resolve()
+        if any_of:
+            return bool(mask & self._mask)
+        # A permission missing from the registry can not be held by anyone
+        return self._complete and mask & self._mask == self._mask
+
+
+permission_registry = PermissionRegistry()
+subscribe(permission_registry.handle_invalidation)
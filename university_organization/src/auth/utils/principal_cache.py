@@ -0,0 +1,92 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from auth.schemas.auth import TokenPaylod
+from core.config import settings
+from core.utils.cache_invalidation import SCOPE_ALL, subscribe
+from core.utils.metrics import metrics
+
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of validated principals keyed by the SHA-256 of the token.
+
+    An entry lives for `ttl` seconds or until the token expires, whichever
+    comes first, and is dropped early by invalidation scopes published on
+    role/permission changes ("all" or "user:<id>").
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, TokenPaylod]] = OrderedDict()
+        self._by_user: dict[int, set[str]] = {}
+
+        self.hits = metrics.counter("principal_cache.hits")
+        self.misses = metrics.counter("principal_cache.misses")
+        metrics.gauge("principal_cache.size", lambda: len(self._entries))
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> TokenPaylod | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self.misses.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits.inc()
+        return entry[1]
+
+    def put(self, key: str, payload: TokenPaylod, token_exp: float | None = None) -> None:
+        lifetime = self.ttl
+        if token_exp is not None:
+            lifetime = min(lifetime, token_exp - time.time())
+        if lifetime <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + lifetime, payload)
+        self._entries.move_to_end(key)
+        if payload.user_id is not None:
+            self._by_user.setdefault(payload.user_id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest, _ = next(iter(self._entries.items()))
+            self._drop(oldest)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].user_id
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._by_user.pop(user_id, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        for key in list(self._by_user.get(user_id, ())):
+            self._drop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    def handle_invalidation(self, scope: str) -> None:
+        if scope == SCOPE_ALL:
+            self.clear()
+        elif scope.startswith("user:"):
+            self.invalidate_user(int(scope.split(":", 1)[1]))
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.cache.principal_ttl,
+    max_size=settings.cache.principal_max_size,
+)
+subscribe(principal_cache.handle_invalidation)
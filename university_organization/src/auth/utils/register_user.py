@@ -1,8 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 
-from .security import hash_password
+from .password_hasher import password_hasher
 from auth.schemas.auth import UserRoleCreate
 
 from core.utils.service import BasicService
@@ -33,7 +34,7 @@ async def student_register(session: AsyncSession, credentials: UserCredentials):
         result = await session.execute(stmt)
         existing_user = result.scalar_one_or_none()
 
-        hashed_password = hash_password(credentials.password)
+        hashed_password = await password_hasher.hash(credentials.password)
 
         if existing_user:
             # Update password if user already exists
@@ -53,14 +54,18 @@ async def student_register(session: AsyncSession, credentials: UserCredentials):
             )
 
      
-        await crud.create(
-            model=UserRole,
-            create_data=UserRoleCreate(role_id=user_role.id, user_id=user_data.id),
+        await session.execute(
+            insert(UserRole)
+            .values(**UserRoleCreate(role_id=user_role.id, user_id=user_data.id).model_dump())
+            .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
         )
 
         await session.commit()
         return user_data  
 
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception:
         await session.rollback()
         raise HTTPException(
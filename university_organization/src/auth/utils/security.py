@@ -6,7 +6,9 @@ from fastapi.security import  APIKeyHeader
 
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
+from typing import Iterable
 
+import hashlib
 import jwt
 
 from core.config import settings
@@ -17,6 +19,9 @@ from core.models import User, Role
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Stored for bulk-imported students until their first HEMIS login sets a real hash
+UNUSABLE_PASSWORD = "!"
+
 
 oauth2_scheme = APIKeyHeader(name="Authorization")
 
@@ -43,6 +48,28 @@ async def get_user(session: AsyncSession, username: str):
 
 
 
+def permissions_digest(permissions: Iterable[str]) -> str:
+    """Short fingerprint of a permission set, shared with the services that verify tokens."""
+    joined = "\n".join(sorted(set(permissions)))
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+
+def build_token_claims(user: User) -> dict:
+    """
+    Claims carried by access/refresh tokens.
+
+    They are complete enough for services to authorize a request from the
+    token alone: user, roles, group (students) and a digest of the permissions.
+    """
+    return {
+        "user_id": user.id,
+        "username": user.username,
+        "group_id": user.student.group_id if user.student else None,
+        "role": [role.name for role in user.roles],
+        "perms": permissions_digest(p.name for r in user.roles for p in r.permissions),
+    }
+
+
 def _create_token(data: dict, secret_key: str, expires_delta: timedelta):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + expires_delta
@@ -0,0 +1,97 @@
+"""
+Shared fixtures of the benchmark scripts.
+
+Read benchmarks seed their rows inside one transaction and roll it back,
+so nothing they create survives a run; ANALYZE inside the transaction
+counts the uncommitted rows, so the planner sees realistic statistics.
+Benchmarks that need several sessions commit their fixtures and remove
+them with drop_seeded().
+"""
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def run_tag() -> str:
+    """Unique prefix of the usernames and names created by one run."""
+    return f"bench-{uuid.uuid4().hex[:8]}"
+
+
+async def seed_users(session: AsyncSession, tag: str, count: int, password_hash: str = "x") -> list[int]:
+    """`count` users named `<tag>-<n>` sharing one password hash; returns their ids."""
+    user_ids = (await session.execute(
+        text(
+            """
+            INSERT INTO users (username, password)
+            SELECT :tag || '-' || n, :password FROM generate_series(1, :count) AS n
+            RETURNING id
+            """
+        ),
+        {"tag": tag, "count": count, "password": password_hash},
+    )).scalars().all()
+    return list(user_ids)
+
+
+async def seed_students(session: AsyncSession, tag: str, count: int) -> list[int]:
+    """A faculty and group holding `count` student users; returns the user ids."""
+    faculty_id = (await session.execute(
+        text("INSERT INTO facultys (name) VALUES (:name) RETURNING id"), {"name": tag},
+    )).scalar_one()
+    group_id = (await session.execute(
+        text("INSERT INTO groups (faculty_id, name) VALUES (:faculty_id, :name) RETURNING id"),
+        {"faculty_id": faculty_id, "name": tag},
+    )).scalar_one()
+    user_ids = await seed_users(session, tag, count)
+    # Names are drawn from a small vocabulary, like real ones, so a term
+    # matches a realistic share of rows instead of exactly one
+    await session.execute(
+        text(
+            """
+            INSERT INTO students (
+                user_id, group_id, first_name, last_name, third_name, full_name,
+                student_id_number, image_path, birth_date, phone, gender, university,
+                specialty, student_status, education_form, education_type, payment_form,
+                education_lang, level, semester, address, avg_gpa
+            )
+            SELECT id,
+                   :group_id,
+                   (ARRAY['Aziz', 'Bekzod', 'Dilnoza', 'Farrux', 'Gulnora', 'Jasur', 'Madina', 'Sardor'])[1 + id % 8] || (id % 997),
+                   (ARRAY['Karimov', 'Rahimova', 'Tursunov', 'Yusupova', 'Aliyev', 'Nazarova'])[1 + id % 6] || (id % 991),
+                   (ARRAY['Akmal', 'Botir', 'Sherzod', 'Ulug''bek'])[1 + id % 4] || ' o''g''li',
+                   'Full name ' || id,
+                   '3' || lpad(id::text, 11, '0'), '', DATE '2004-01-01', '', 'Erkak', 'NSUMT',
+                   'Specialty', 'Studying', 'Full-time', 'Bachelor', 'Contract',
+                   'Uzbek', '2', '3', '', 4.0
+            FROM users WHERE id = ANY(:user_ids)
+            """
+        ),
+        {"group_id": group_id, "user_ids": user_ids},
+    )
+    return user_ids
+
+
+async def drop_seeded(session: AsyncSession, tag: str) -> None:
+    """Delete everything seeded under `tag`; students go with their users, groups with their faculty."""
+    await session.execute(text("DELETE FROM users WHERE username LIKE :tag || '%'"), {"tag": tag})
+    await session.execute(text("DELETE FROM facultys WHERE name LIKE :tag || '%'"), {"tag": tag})
+    await session.commit()
+
+
+async def timed(call: Callable[[], Awaitable], runs: int) -> list[float]:
+    """Wall time of `runs` sequential calls, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    median = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {median:8.2f} ms   p95 {p95:8.2f} ms"
@@ -0,0 +1,91 @@
+"""
+Login throughput under retry storms, with and without the login cache.
+
+    python -m benchmarks.logins --users 200 --retries 4 --concurrency 1 8 32
+
+Every user logs in once and then retries `--retries` times with the same
+password, as a client on a flaky connection does; `--concurrency` workers
+play those bursts against authenticate_user_from_db. The run without the
+cache sets its TTL to 0, so every attempt pays a bcrypt check in the
+password-hashing pool. Users are committed under a unique tag and deleted
+afterwards.
+"""
+import argparse
+import asyncio
+import time
+
+from auth.schemas.auth import UserCredentials
+from auth.utils.authenticate import authenticate_user_from_db
+from auth.utils.login_cache import login_cache
+from auth.utils.password_hasher import password_hasher
+from benchmarks.fixtures import drop_seeded, run_tag, seed_users, summary
+
+PASSWORD = "correct horse battery staple"
+
+
+async def run(session_factory, usernames: list[str], attempts: int, concurrency: int):
+    latencies: list[float] = []
+    pending = iter(usernames)
+
+    async def worker():
+        for username in pending:
+            credentials = UserCredentials(username=username, password=PASSWORD)
+            for _ in range(attempts):
+                # One session per attempt, as each login request gets its own
+                started = time.perf_counter()
+                async with session_factory() as session:
+                    if not await authenticate_user_from_db(credentials=credentials, session=session):
+                        raise RuntimeError(f"Login of {username} failed")
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(latencies) / (time.perf_counter() - started), latencies
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.utils.database import db_helper
+
+    tag = run_tag()
+    ttl = login_cache.ttl
+    try:
+        async with db_helper.session_factory() as session:
+            user_ids = await seed_users(session, tag, args.users, await password_hasher.hash(PASSWORD))
+            await session.commit()
+        usernames = [f"{tag}-{n}" for n in range(1, len(user_ids) + 1)]
+        print(
+            f"{args.users} users x {args.retries + 1} attempts, "
+            f"{password_hasher.workers} bcrypt workers, cache TTL {ttl}s"
+        )
+
+        for concurrency in args.concurrency:
+            for label, cache_ttl in (("no cache", 0), ("login cache", ttl)):
+                login_cache.ttl = cache_ttl
+                for username in usernames:
+                    login_cache.purge(username)
+                hits = login_cache.hits.value
+
+                rate, latencies = await run(db_helper.session_factory, usernames, args.retries + 1, concurrency)
+                print(
+                    f"concurrency {concurrency:>3}  {label:<12} {rate:8.1f} logins/s   {summary(latencies)}"
+                    f"   bcrypt checks {len(latencies) - (login_cache.hits.value - hits)}"
+                )
+    finally:
+        login_cache.ttl = ttl
+        async with db_helper.session_factory() as session:
+            await drop_seeded(session, tag)
+        password_hasher.shutdown()
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark logins per second under retry storms")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--retries", type=int, default=4, help="Retries after each user's first login")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Student list search: CAST/ILIKE on every field against trigram-indexed predicates.
+
+    python -m benchmarks.search --students 100000 --runs 20 --terms Rahimova12 sardor 30000012345
+
+Seeds `--students` students in a transaction that is rolled back at the
+end and times one list request of StudentService.get_all (exact count plus
+the first page) for each term with three set-ups: the predicates search
+built before core/utils/search.py, search_clause with the pg_trgm GIN
+indexes of Student.__searchable__, and search_clause with those indexes
+dropped. The indexes are created inside the transaction when the database
+lacks them; without the pg_trgm extension the indexed run is skipped.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import String, cast, desc, func, or_, select, text
+from sqlalchemy.sql.elements import ColumnElement
+
+from benchmarks.fixtures import run_tag, seed_students, summary, timed
+from core.models.student import Student
+from core.utils.search import search_clause
+
+# The fields StudentService.get_all searches
+SEARCH_FIELDS = ["user_id", "last_name", "third_name", "first_name", "student_id_number"]
+PAGE_SIZE = 20
+
+
+def legacy_search_clause(model, search: str, search_fields: list[str]) -> ColumnElement[bool]:
+    """BasicService.get search before search_clause: ILIKE on text, CAST ... LIKE on the rest."""
+    clauses = []
+    for field_name in search_fields:
+        field = getattr(model, field_name)
+        if isinstance(field.type, String):
+            clauses.append(field.ilike(f"%{search}%"))
+        else:
+            clauses.append(cast(field, String).like(f"%{search}%"))
+    return or_(*clauses)
+
+
+async def list_page(session, clause: ColumnElement[bool]) -> None:
+    """What one search request costs: the exact total and the first page."""
+    await session.execute(select(func.count()).select_from(Student).where(clause))
+    await session.execute(select(Student).where(clause).order_by(desc(Student.id)).limit(PAGE_SIZE + 1))
+
+
+def trigram_indexes() -> list:
+    return [index for index in Student.__table__.indexes if index.name.endswith("_trgm")]
+
+
+async def ensure_trigram_indexes(session) -> bool:
+    """Create the student trigram indexes in this transaction if missing; False without pg_trgm."""
+    available = (await session.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )).scalar()
+    if not available:
+        return False
+
+    await session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    connection = await session.connection()
+    for index in trigram_indexes():
+        await connection.run_sync(lambda sync_connection: index.create(sync_connection, checkfirst=True))
+    return True
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.utils.database import db_helper
+
+    try:
+        async with db_helper.session_factory() as session:
+            try:
+                await seed_students(session, run_tag(), args.students)
+                indexed = await ensure_trigram_indexes(session)
+                await session.execute(text("ANALYZE users, students"))
+                total = (await session.execute(select(func.count()).select_from(Student))).scalar_one()
+                print(f"{total} students")
+                if not indexed:
+                    print("pg_trgm is not available, skipping the indexed run")
+
+                setups = [("CAST/ILIKE", legacy_search_clause)]
+                if indexed:
+                    setups.append(("trigram index", search_clause))
+                for label, build in setups:
+                    for term in args.terms:
+                        clause = build(Student, term, SEARCH_FIELDS)
+                        samples = await timed(lambda: list_page(session, clause), args.runs)
+                        print(f"{label:<16} {term!r:<16} {summary(samples)}")
+
+                for index in trigram_indexes():
+                    await session.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+                for term in args.terms:
+                    clause = search_clause(Student, term, SEARCH_FIELDS)
+                    samples = await timed(lambda: list_page(session, clause), args.runs)
+                    print(f"{'no trigram index':<16} {term!r:<16} {summary(samples)}")
+            finally:
+                await session.rollback()
+    finally:
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark student search with and without trigram indexes")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--terms", nargs="+", default=["Rahimova12", "sardor", "30000012345"])
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
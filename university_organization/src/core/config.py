@@ -58,9 +58,36 @@ class JwtConfig(BaseModel):
     
 class HemisConfig(BaseModel):
     base_url: str
+    # Shared client, see auth/utils/hemis_client.py
+    max_connections: int = 100
+    max_concurrency: int = 50
+    timeout: float = 10.0
+    connect_timeout: float = 5.0
+    retries: int = 2
+    retry_backoff: float = 0.2
     
 
 
+class CacheConfig(BaseModel):
+    # Validated principals keyed by token hash, see auth/utils/principal_cache.py
+    principal_enabled: bool = True
+    principal_ttl: int = 60
+    principal_max_size: int = 10_000
+    # total=cached list counts, see core/utils/totals.py
+    total_ttl: int = 30
+    total_max_size: int = 1024
+    # Successful password checks, see auth/utils/login_cache.py
+    login_ttl: int = 60
+    login_max_size: int = 10_000
+
+
+class PasswordHashingConfig(BaseModel):
+    # bcrypt runs in a per-worker process pool, see auth/utils/password_hasher.py
+    workers: int = 2
+    # Queued + running operations before login/register answer 429
+    max_pending: int = 64
+
+
 class AppSettings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=(".env.template", ".env"),
@@ -73,6 +100,8 @@ class AppSettings(BaseSettings):
     logging: LoggingConfig = LoggingConfig()
     server: ServerConfig = ServerConfig()
     hemis: HemisConfig = HemisConfig(base_url="https://student.ndki.uz/rest/v1")
+    cache: CacheConfig = CacheConfig()
+    password_hashing: PasswordHashingConfig = PasswordHashingConfig()
     db: DatabaseConfig
     jwt: JwtConfig
     admin: AdminData
@@ -4,6 +4,10 @@ from fastapi import FastAPI
 from core.lifespan.permissions_sync import sync_permissions
 
 from core.utils.database import db_helper
+from core.utils.cache_invalidation import invalidation_listener
+from auth.utils.password_hasher import password_hasher
+from auth.utils.hemis_client import hemis_client
+from auth.utils.faculty_group import name_id_cache
 from core.config import LOG_DEFAULT_FORMAT
 import logging
 
@@ -18,10 +22,20 @@ async def lifespan(app: FastAPI):
     
     logging.info("🚀 Lifespan startup...") 
     
+    # Fork the hashing workers before any connection or thread is opened
+    password_hasher.start()
+    
     async with db_helper.session_factory() as session:
         await sync_permissions(app, session)
+        await name_id_cache.load(session)
+    
+    await invalidation_listener.start()
+    hemis_client.start()
 
     yield
     
     logging.info("🛑 Lifespan shutdown...")
+    await invalidation_listener.stop()
+    password_hasher.shutdown()
+    await hemis_client.close()
     await db_helper.dispose()
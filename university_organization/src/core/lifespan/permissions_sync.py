@@ -12,6 +12,7 @@ from core.models.user_role_association import UserRole
 from core.config import settings
 from auth.service.auth_service import AuthService
 from auth.schemas.auth import UserCredentials
+from auth.utils.permission_registry import permission_registry
 
 def http_to_action(method: str) -> str:
     mapping = {
@@ -49,6 +50,7 @@ async def sync_permissions(app: FastAPI, session: AsyncSession):
         await session.commit()
 
     await seed_roles(session)
+    await permission_registry.refresh()
     
 async def seed_roles(session: AsyncSession):
     default_roles = ["admin"]
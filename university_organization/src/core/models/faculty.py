@@ -1,6 +1,6 @@
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
 
 class Faculty(Base, IntIdPkMixin):
 
-    name: Mapped[str]
+    name: Mapped[str] = mapped_column(unique=True)
     
     chairs: Mapped[list["Chair"]] = relationship(
         "Chair", 
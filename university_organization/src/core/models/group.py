@@ -1,7 +1,8 @@
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
+from .mixins.searchable import SearchableMixin
 from sqlalchemy.orm import Mapped , mapped_column , relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 
 from typing import TYPE_CHECKING
 
@@ -12,8 +13,9 @@ if TYPE_CHECKING:
     from .quiz import Quiz
     from .results import Result
 
-class Group(Base, IntIdPkMixin):
+class Group(Base, IntIdPkMixin, SearchableMixin):
     __tablename__ = "groups"
+    __searchable__ = ("name",)
     
     faculty_id: Mapped[int] = mapped_column(ForeignKey("facultys.id" , ondelete="CASCADE"))
     
@@ -50,6 +52,7 @@ class Group(Base, IntIdPkMixin):
         passive_deletes=True
     )
 
-   
-    
-    
\ No newline at end of file
+
+# Group names are only unique within a faculty. Declared outside the class
+# so SearchableMixin's __table_args__ (the name trigram index) stays in place.
+UniqueConstraint(Group.faculty_id, Group.name)
@@ -0,0 +1,27 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+
+from .base import Base
+from .mixins.int_id_pk import IntIdPkMixin
+
+
+class LatestResult(Base, IntIdPkMixin):
+    """
+    Newest result of each student per teacher.
+
+    Inserts are upserted next to the `results` row (core/utils/latest_results.py);
+    deletes, including cascades, are repaired by a trigger on `results`
+    (migration e1f7c3a9b5d2). `created_at` is the result's, not the row's.
+    """
+
+    __tablename__ = "latest_results"
+    __table_args__ = (
+        UniqueConstraint("teacher_id", "student_id"),
+        Index("ix_latest_results_teacher_id_created_at", "teacher_id", "created_at"),
+        Index("ix_latest_results_student_id_created_at", "student_id", "created_at"),
+    )
+
+    # --- Foreign Keys ---
+    teacher_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    student_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    result_id: Mapped[int] = mapped_column(ForeignKey("results.id", ondelete="CASCADE"), unique=True)
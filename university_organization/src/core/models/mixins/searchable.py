@@ -0,0 +1,24 @@
+from sqlalchemy import Index
+from sqlalchemy.orm import declared_attr
+
+
+def trigram_index(table_name: str, column: str) -> Index:
+    return Index(
+        f"ix_{table_name}_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
+class SearchableMixin:
+    """
+    Columns listed in `__searchable__` get a pg_trgm GIN index, which serves
+    the ILIKE '%term%' predicates built by core/utils/search.py.
+    """
+
+    __searchable__: tuple[str, ...] = ()
+
+    @declared_attr.directive
+    def __table_args__(cls):
+        return tuple(trigram_index(cls.__tablename__, column) for column in cls.__searchable__)
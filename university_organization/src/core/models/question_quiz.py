@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 
 from core.models.base import Base
 from core.models.mixins.int_id_pk import IntIdPkMixin
@@ -13,9 +13,16 @@ if TYPE_CHECKING:
 
 class QuestionQuiz(Base, IntIdPkMixin):
     __tablename__ = "question_quiz"
+    __table_args__ = (
+        # Dense 1..N position of the question inside its quiz, used for random sampling
+        UniqueConstraint("quiz_id", "ordinal"),
+        # A question is attached to a quiz at most once
+        UniqueConstraint("quiz_id", "question_id"),
+    )
 
-    question_id: Mapped[int] = mapped_column(ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    question_id: Mapped[int] = mapped_column(ForeignKey("questions.id", ondelete="CASCADE"), nullable=False, index=True)
     quiz_id: Mapped[int] = mapped_column(ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
+    ordinal: Mapped[int] = mapped_column(nullable=False)
 
     
     question: Mapped["Question"] = relationship("Question", back_populates="question_quizzes")
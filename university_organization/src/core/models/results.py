@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Integer, Float
+from sqlalchemy import ForeignKey, Integer, Float, Index
 from typing import TYPE_CHECKING
 
 from .base import Base
@@ -14,6 +14,12 @@ if TYPE_CHECKING:
 
 class Result(Base, IntIdPkMixin):
     __tablename__ = "results"
+    __table_args__ = (
+        # A student's attempts and a teacher's results, newest first
+        Index("ix_results_student_id_created_at", "student_id", "created_at"),
+        Index("ix_results_teacher_id_created_at", "teacher_id", "created_at"),
+        Index("ix_results_created_at", "created_at"),
+    )
 
     # --- Foreign Keys ---
     student_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
@@ -45,3 +51,14 @@ class Result(Base, IntIdPkMixin):
     group: Mapped["Group"] = relationship("Group", back_populates="results")
     
     subject: Mapped["Subject"] = relationship("Subject", back_populates="results")
+
+
+# Best attempt per student in a quiz (ResultService.get_by_field): DISTINCT ON
+# (student_id) ... ORDER BY grade DESC, id DESC reads it in index order
+Index(
+    "ix_results_quiz_id_student_id_grade_id",
+    Result.quiz_id,
+    Result.student_id,
+    Result.grade.desc(),
+    Result.id.desc(),
+)
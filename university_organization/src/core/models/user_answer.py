@@ -4,7 +4,7 @@ from .mixins.int_id_pk import IntIdPkMixin
 
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 
 from sqlalchemy.orm import relationship
 
@@ -16,9 +16,14 @@ if TYPE_CHECKING:
     from .questions import Question
 
 class UserAnswer(Base, IntIdPkMixin):
+    __table_args__ = (
+        # Keyset pages of a student's answers, optionally for one quiz
+        Index("ix_user_answers_user_id_id", "user_id", "id"),
+        Index("ix_user_answers_user_id_quiz_id_id", "user_id", "quiz_id", "id"),
+    )
     
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
-    quiz_id: Mapped[int] = mapped_column(ForeignKey("quizzes.id", ondelete="CASCADE"))
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("quizzes.id", ondelete="CASCADE"), index=True)
     question_id: Mapped[int] = mapped_column(ForeignKey("questions.id", ondelete="CASCADE"))
     options: Mapped[str] 
     
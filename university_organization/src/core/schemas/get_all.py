@@ -1,6 +1,33 @@
-from pydantic import BaseModel, Field
+from fastapi import HTTPException, status
+from pydantic import BaseModel, Field, model_validator
+
+from core.utils.totals import TotalMode
 
 class GetAll(BaseModel):
     
     limit: int = Field(default=20, le=500, ge=1, description="Number of items to return (max 500)")
     offset: int = Field(default=0, ge=0, description="Number of items to skip")
+    after: str | None = Field(default=None, description="`next_cursor` of the previous page (keyset pagination, offset is ignored)")
+    before: str | None = Field(default=None, description="`prev_cursor` of the next page (keyset pagination, offset is ignored)")
+    total: TotalMode | None = Field(default=None, description="How `total` is computed: exact, estimate, cached or none (default: exact, none for cursor pages)")
+
+    @model_validator(mode="after")
+    def check_single_cursor(self):
+        # HTTPException passes through pydantic unchanged, so both Depends()
+        # and handlers that build GetAll themselves answer 400 instead of 500
+        if self.after is not None and self.before is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either `after` or `before`, not both",
+            )
+        return self
+
+    @property
+    def keyset(self) -> bool:
+        return self.after is not None or self.before is not None
+
+    @property
+    def total_mode(self) -> TotalMode:
+        if self.total is not None:
+            return self.total
+        return "none" if self.keyset else "exact"
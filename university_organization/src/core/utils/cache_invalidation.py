@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Callable
+
+import asyncpg
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+# Shared by every service that caches principals or permissions
+CHANNEL = "auth_cache_invalidation"
+
+SCOPE_ALL = "all"
+# Faculty/group renamed or deleted, see auth/utils/faculty_group.py
+SCOPE_FACULTY_GROUP = "faculty_group"
+
+InvalidationHandler = Callable[[str], None]
+
+_handlers: list[InvalidationHandler] = []
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def subscribe(handler: InvalidationHandler) -> None:
+    """Register a local cache to be invalidated by scope ("all" or "user:<id>")."""
+    _handlers.append(handler)
+
+
+def apply_invalidation(scope: str) -> None:
+    for handler in _handlers:
+        try:
+            handler(scope)
+        except Exception:
+            log.exception(f"Cache invalidation handler failed for scope={scope}")
+
+
+async def publish_invalidation(session: AsyncSession, scope: str = SCOPE_ALL) -> None:
+    """
+    Invalidate locally right away and tell every other worker (and service)
+    through NOTIFY. Call it after the mutation has been committed.
+    """
+    apply_invalidation(scope)
+    await session.execute(select(func.pg_notify(CHANNEL, scope)))
+    await session.commit()
+
+
+class InvalidationListener:
+    """Dedicated asyncpg connection that LISTENs on CHANNEL and reconnects on loss."""
+
+    def __init__(self, dsn: str, reconnect_delay: float = 5.0):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self._conn: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopped = False
+
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        apply_invalidation(payload)
+
+    def _on_terminate(self, conn) -> None:
+        if self._stopped:
+            return
+        # Notifications may have been missed while disconnected
+        log.warning("Cache invalidation listener lost its connection, reconnecting")
+        apply_invalidation(SCOPE_ALL)
+        self._reconnect_task = asyncio.create_task(self._connect_forever())
+
+    async def _connect(self) -> None:
+        self._conn = await asyncpg.connect(self.dsn)
+        self._conn.add_termination_listener(self._on_terminate)
+        await self._conn.add_listener(CHANNEL, self._on_notify)
+
+    async def _connect_forever(self) -> None:
+        while not self._stopped:
+            try:
+                await self._connect()
+                log.info(f"Listening for cache invalidations on '{CHANNEL}'")
+                return
+            except (OSError, asyncpg.PostgresError):
+                log.exception("Cache invalidation listener failed to connect")
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self) -> None:
+        self._stopped = False
+        try:
+            await self._connect()
+            log.info(f"Listening for cache invalidations on '{CHANNEL}'")
+        except (OSError, asyncpg.PostgresError):
+            log.exception("Cache invalidation listener failed to connect")
+            self._reconnect_task = asyncio.create_task(self._connect_forever())
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+
+invalidation_listener = InvalidationListener(
+    dsn=str(settings.db.url).replace("postgresql+asyncpg://", "postgresql://", 1),
+)
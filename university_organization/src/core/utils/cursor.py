@@ -0,0 +1,23 @@
+import base64
+import binascii
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(id: int) -> str:
+    """Opaque keyset cursor for the row with this id."""
+    return base64.urlsafe_b64encode(f"id:{id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, value = raw.split(":", 1)
+        if prefix != "id":
+            raise ValueError(prefix)
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
@@ -0,0 +1,279 @@
+"""
+Missing-index audit over the shared models.
+
+    python -m core.utils.index_audit
+    python -m core.utils.index_audit --foreign-keys --emit "add missing indexes"
+
+Scans the services' sources for `Model.column` used as a filter (where(),
+filter(), having(), join conditions, comparisons and in_/like/... operators)
+and reports every column that is not the leading column of a btree index,
+unique constraint or primary key of `Base.metadata`. like/ilike/contains
+and equality uses of a column with a pg_trgm GIN index (see
+SearchableMixin) count as covered; gin_trgm_ops serves `=` since
+PostgreSQL 14. With --emit, an Alembic
+migration creating the missing indexes concurrently is written next to the
+existing revisions; declare the same indexes on the models so autogenerate
+keeps them.
+"""
+import argparse
+import ast
+import sys
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import PrimaryKeyConstraint, Table, UniqueConstraint
+
+from core.models import Base
+
+SRC_DIR = Path(__file__).resolve().parents[2]
+# Every service shares the same models; scan them all by default
+DEFAULT_ROOTS = [
+    SRC_DIR,
+    SRC_DIR.parents[1] / "university_student_test" / "src",
+]
+VERSIONS_DIR = SRC_DIR / "migrations" / "versions"
+
+FILTER_METHODS = {"where", "filter", "having", "join", "outerjoin"}
+# Pattern matches, served by a gin_trgm_ops index (as is `==`)
+PATTERN_METHODS = {"like", "ilike", "contains"}
+OPERATOR_METHODS = {"in_", "not_in", "is_", "is_not", "isnot", "between", "any_"} | PATTERN_METHODS
+SKIP_DIRS = {"migrations", "__pycache__", ".venv", "venv"}
+
+
+@dataclass
+class MissingIndex:
+    table: str
+    column: str
+    reasons: set[str] = field(default_factory=set)
+    locations: list[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f"ix_{self.table}_{self.column}"
+
+
+def mapped_tables() -> dict[str, Table]:
+    """Model class name -> table, for every mapped model of Base."""
+    return {mapper.class_.__name__: mapper.local_table for mapper in Base.registry.mappers}
+
+
+def indexed_leading_columns(table: Table) -> set[str]:
+    """Columns a btree lookup can start from: first column of each index, unique constraint and the PK."""
+    leading = set()
+    for index in table.indexes:
+        if index.dialect_options["postgresql"]["using"] not in (None, False, "btree"):
+            continue
+        expressions = list(index.columns)
+        if expressions:
+            leading.add(expressions[0].name)
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)) and constraint.columns:
+            leading.add(list(constraint.columns)[0].name)
+    for column in table.columns:
+        if column.unique or column.index:
+            leading.add(column.name)
+    return leading
+
+
+def trigram_indexed_columns(table: Table) -> set[str]:
+    """Columns with a GIN gin_trgm_ops index, which serves like/ilike/contains and `=`."""
+    columns = set()
+    for index in table.indexes:
+        if index.dialect_options["postgresql"]["using"] != "gin":
+            continue
+        ops = index.dialect_options["postgresql"]["ops"] or {}
+        for column in index.columns:
+            if ops.get(column.name) == "gin_trgm_ops":
+                columns.add(column.name)
+    return columns
+
+
+class FilterColumnVisitor(ast.NodeVisitor):
+    """
+    Collects (table, column, location, trigram) for every column used as a
+    filter in one module; `trigram` marks the uses a gin_trgm_ops index can
+    serve (like/ilike/contains and `==`).
+    """
+
+    def __init__(self, tables: dict[str, Table], path: str):
+        self.tables = tables
+        self.path = path
+        self.found: list[tuple[str, str, str, bool]] = []
+
+    def _column_ref(self, node: ast.AST) -> tuple[str, str] | None:
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in self.tables
+            and node.attr in self.tables[node.value.id].c
+        ):
+            return node.value.id, node.attr
+        return None
+
+    def _record(self, node: ast.AST, trigram: bool = False) -> None:
+        ref = self._column_ref(node)
+        if ref is not None:
+            model, column = ref
+            self.found.append((self.tables[model].name, column, f"{self.path}:{node.lineno}", trigram))
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        equality = all(isinstance(op, ast.Eq) for op in node.ops)
+        for operand in [node.left, *node.comparators]:
+            self._record(operand, trigram=equality)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Attribute):
+            if node.func.attr in OPERATOR_METHODS:
+                self._record(node.func.value, trigram=node.func.attr in PATTERN_METHODS)
+            elif node.func.attr in FILTER_METHODS:
+                for arg in [*node.args, *(keyword.value for keyword in node.keywords)]:
+                    self._record(arg)
+        self.generic_visit(node)
+
+
+def scan(roots: list[Path], tables: dict[str, Table]) -> dict[tuple[str, str], list[tuple[str, bool]]]:
+    """(table, column) -> (source location, trigram-servable) of every filter on it."""
+    usages: dict[tuple[str, str], list[tuple[str, bool]]] = defaultdict(list)
+    for root in roots:
+        for path in sorted(root.rglob("*.py")):
+            if SKIP_DIRS.intersection(path.relative_to(root).parts):
+                continue
+            try:
+                tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+            except SyntaxError as e:
+                print(f"skipping {path}: {e}", file=sys.stderr)
+                continue
+            visitor = FilterColumnVisitor(tables, str(path.relative_to(root.parents[1])))
+            visitor.visit(tree)
+            for table, column, location, trigram in visitor.found:
+                usages[(table, column)].append((location, trigram))
+    return usages
+
+
+def audit(roots: list[Path], foreign_keys: bool = False) -> list[MissingIndex]:
+    tables = mapped_tables()
+    indexed = {table.name: indexed_leading_columns(table) for table in Base.metadata.tables.values()}
+    trigram = {table.name: trigram_indexed_columns(table) for table in Base.metadata.tables.values()}
+
+    missing: dict[tuple[str, str], MissingIndex] = {}
+
+    def report(table: str, column: str, reason: str, locations: list[str] = ()) -> None:
+        if column in indexed[table]:
+            return
+        entry = missing.setdefault((table, column), MissingIndex(table, column))
+        entry.reasons.add(reason)
+        entry.locations.extend(locations)
+
+    for (table, column), uses in scan(roots, tables).items():
+        if column in trigram[table]:
+            uses = [(location, trigram) for location, trigram in uses if not trigram]
+        if uses:
+            report(table, column, "filter", [location for location, _ in uses])
+
+    if foreign_keys:
+        # Unindexed FKs turn every ON DELETE CASCADE / SET NULL of the parent into a scan
+        for table in Base.metadata.tables.values():
+            for fk in table.foreign_keys:
+                report(table.name, fk.parent.name, "foreign key")
+
+    return sorted(missing.values(), key=lambda entry: (entry.table, entry.column))
+
+
+def render_migration(missing: list[MissingIndex], message: str, revision: str, down_revision: str | None) -> str:
+    indexes = "\n".join(f"    ({entry.name!r}, {entry.table!r}, {entry.column!r})," for entry in missing)
+    return f'''"""{message}
+
+Revision ID: {revision}
+Revises: {down_revision or ''}
+Create Date: {datetime.now()}
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = {revision!r}
+down_revision: Union[str, Sequence[str], None] = {down_revision!r}
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Generated by core/utils/index_audit.py
+INDEXES = [
+{indexes}
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+'''
+
+
+def emit_migration(missing: list[MissingIndex], message: str) -> Path:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(Config(str(SRC_DIR / "alembic.ini")))
+    revision = uuid.uuid4().hex[-12:]
+    slug = "_".join(message.lower().split())[:40]
+    path = VERSIONS_DIR / f"{datetime.now():%Y_%m_%d_%H%M}-{revision}_{slug}.py"
+    path.write_text(render_migration(missing, message, revision, script.get_current_head()), encoding="utf-8")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report filtered columns without an index")
+    parser.add_argument("roots", nargs="*", type=Path, help="Source directories to scan (default: all services)")
+    parser.add_argument("--foreign-keys", action="store_true", help="Also report unindexed foreign key columns")
+    parser.add_argument("--emit", metavar="MESSAGE", help="Write an Alembic migration creating the missing indexes")
+    parser.add_argument("--verbose", action="store_true", help="List every location a column is filtered on")
+    args = parser.parse_args()
+
+    roots = args.roots or [root for root in DEFAULT_ROOTS if root.is_dir()]
+    missing = audit(roots, foreign_keys=args.foreign_keys)
+
+    for entry in missing:
+        print(f"{entry.table}.{entry.column}  [{', '.join(sorted(entry.reasons))}]  {len(entry.locations)} uses")
+        if args.verbose:
+            for location in entry.locations:
+                print(f"    {location}")
+
+    if not missing:
+        print("Every filtered column is indexed")
+        return
+
+    if args.emit:
+        print(f"Wrote {emit_migration(missing, args.emit)}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import bisect
+import threading
+from typing import Callable
+
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Counter:
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> int:
+        return self.value
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at snapshot time."""
+
+    def __init__(self, name: str, getter: Callable[[], float]):
+        self.name = name
+        self.getter = getter
+
+    def snapshot(self) -> float:
+        return self.getter()
+
+
+class Histogram:
+    def __init__(self, name: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{b}": c for b, c in zip(self.buckets, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "avg": round(self.sum / self.count, 3) if self.count else 0,
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    """Per-worker, in-process metrics served as JSON from /metrics."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def _register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str) -> Counter:
+        return self._register(Counter(name))
+
+    def gauge(self, name: str, getter: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, getter))
+
+    def histogram(self, name: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> Histogram:
+        return self._register(Histogram(name, buckets))
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+
+metrics = MetricsRegistry()
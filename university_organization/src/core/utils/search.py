@@ -0,0 +1,44 @@
+from sqlalchemy import BigInteger, Integer, String, false, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column, term: str) -> ColumnElement[bool]:
+    """
+    Case-insensitive substring match on the bare column, the form a pg_trgm
+    GIN index (see SearchableMixin) can serve. Wildcards in `term` match literally.
+    """
+    return column.ilike(f"%{escape_like(term)}%", escape="\\")
+
+
+def fits_column(column, value: int) -> bool:
+    """Whether `value` is in range of the integer column; larger ones can not match and overflow the parameter."""
+    bits = 64 if isinstance(column.type, BigInteger) else 32
+    return -(2 ** (bits - 1)) <= value < 2 ** (bits - 1)
+
+
+def search_clause(model, search: str, search_fields: list[str]) -> ColumnElement[bool] | None:
+    """
+    OR of one predicate per field: `contains` for text columns, equality for
+    integer columns when the term is a number (instead of casting every row
+    to text). Fields that can not match the term are left out; when none
+    can, nothing matches.
+    """
+    term = search.strip()
+    if not term:
+        return None
+
+    clauses = []
+    for field_name in search_fields:
+        column = getattr(model, field_name, None)
+        if column is None:
+            continue
+        if isinstance(column.type, String):
+            clauses.append(contains(column, term))
+        elif isinstance(column.type, Integer) and term.isdigit() and fits_column(column, int(term)):
+            clauses.append(column == int(term))
+
+    return or_(*clauses) if clauses else false()
@@ -1,6 +1,6 @@
 from typing import Generic, TypeVar, Type, Any, Optional, TypeAlias
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, update, delete, func, desc, or_, cast, String
+from sqlalchemy import select, and_, update, delete, func, desc
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import BaseModel
 from sqlalchemy.sql.elements import ColumnElement
@@ -8,6 +8,9 @@ from fastapi import HTTPException, status
 
 from core.models import Base
 from core.schemas.get_all import GetAll
+from core.utils.cursor import encode_cursor, decode_cursor
+from core.utils.totals import total_counter
+from core.utils.search import search_clause
 
 ModelType = TypeVar("ModelType", bound=Base)
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
@@ -20,18 +23,6 @@ class BasicService(Generic[ModelType, SchemaType]):
         self.session = session
 
 
-    def _is_text_column(self, column) -> bool:
-        """
-        Check if a column is a text/string type that supports ILIKE natively
-        """
-        try:
-            column_type = str(column.type).upper()
-            return any(text_type in column_type for text_type in [
-                'VARCHAR', 'TEXT', 'CHAR', 'STRING'
-            ])
-        except Exception:
-            return False
-
     
     @staticmethod
     def make_filter(filters: FilterList) -> list[ColumnElement[bool]]:
@@ -88,25 +79,22 @@ class BasicService(Generic[ModelType, SchemaType]):
                 if filters:
                     stmt = stmt.where(and_(*filters))
 
-                # --- Apply search ---
+                # --- Apply search (trigram-indexable predicates, see core/utils/search.py) ---
+                search_filter = None
                 if search and search_fields:
-                    search_clauses = []
-                    for field_name in search_fields:
-                        if hasattr(model, field_name):
-                            field = getattr(model, field_name)
+                    search_filter = search_clause(model, search, search_fields)
+                    if search_filter is not None:
+                        stmt = stmt.where(search_filter)
 
-
-                            if self._is_text_column(field):
-                                search_clauses.append(field.ilike(f"%{search}%"))
-                            else:
-                                search_clauses.append(
-                                    cast(field, String).like(f"%{search}%")   
-                                )
-                    if search_clauses:
-                        stmt = stmt.where(or_(*search_clauses))
+                # --- Keyset pagination: WHERE id < :after / id > :before ---
+                keyset = pagination is not None and pagination.keyset and hasattr(model, "id")
+                if keyset and pagination.before is not None:
+                    stmt = stmt.where(model.id > decode_cursor(pagination.before)).order_by(model.id)
+                elif keyset:
+                    stmt = stmt.where(model.id < decode_cursor(pagination.after))
 
                 # --- Order by newest first if model has id ---
-                if hasattr(model, "id"):
+                if hasattr(model, "id") and not (keyset and pagination.before is not None):
                     stmt = stmt.order_by(desc(model.id))
 
                 # --- Handle single fetch ---
@@ -120,22 +108,39 @@ class BasicService(Generic[ModelType, SchemaType]):
                         )
                     return obj
 
-                # --- Count total ---
+                # --- Count total, as requested (exact unless paging by cursor) ---
+                total_mode = pagination.total_mode if pagination else "exact"
                 count_stmt = select(func.count()).select_from(model)
                 if filters:
                     count_stmt = count_stmt.where(and_(*filters))
-                if search and search_fields and search_clauses:
-                    count_stmt = count_stmt.where(or_(*search_clauses))
-
-                total = (await self.session.execute(count_stmt)).scalar_one()
+                filtered = bool(filters)
+                if search_filter is not None:
+                    count_stmt = count_stmt.where(search_filter)
+                    filtered = True
+
+                total = await total_counter.total(
+                    self.session,
+                    mode=total_mode,
+                    count_stmt=count_stmt,
+                    rows_stmt=select(model).where(count_stmt.whereclause) if filtered else None,
+                    table=None if filtered else model.__tablename__,
+                )
 
-                # --- Apply pagination ---
+                # --- Apply pagination, one extra row tells whether another page exists ---
                 if pagination:
-                    stmt = stmt.offset(pagination.offset).limit(pagination.limit)
+                    if not keyset:
+                        stmt = stmt.offset(pagination.offset)
+                    stmt = stmt.limit(pagination.limit + 1)
 
                 # --- Get data ---
                 result = await self.session.execute(stmt)
-                data = result.scalars().all()
+                data = list(result.scalars().all())
+
+                has_more = pagination is not None and len(data) > pagination.limit
+                if has_more:
+                    data = data[:pagination.limit]
+                if keyset and pagination.before is not None:
+                    data.reverse()
 
                 if not data:
                     raise HTTPException(
@@ -143,9 +148,24 @@ class BasicService(Generic[ModelType, SchemaType]):
                         detail=f"{model.__name__}(s) not found"
                     )
 
+                next_cursor = prev_cursor = None
+                if pagination and hasattr(model, "id"):
+                    if keyset and pagination.before is not None:
+                        # Paged backwards, so rows after this page exist
+                        next_cursor = encode_cursor(data[-1].id)
+                        if has_more:
+                            prev_cursor = encode_cursor(data[0].id)
+                    else:
+                        if has_more:
+                            next_cursor = encode_cursor(data[-1].id)
+                        if keyset or pagination.offset > 0:
+                            prev_cursor = encode_cursor(data[0].id)
+
                 return {
                     "total": total,
                     "data": data,
+                    "next_cursor": next_cursor,
+                    "prev_cursor": prev_cursor,
                 }
 
             except SQLAlchemyError as e:
@@ -5,6 +5,7 @@ from .schemas import FacultyCreate, FacultyUpdate
 from core.utils.service import BasicService
 from core.models.faculty import Faculty
 from core.schemas.get_all import GetAll
+from core.utils.cache_invalidation import publish_invalidation, SCOPE_FACULTY_GROUP
 
 
 class FacultyService:
@@ -33,18 +34,21 @@ class FacultyService:
             )
 
     async def update(self, id: int, update_data: FacultyUpdate):
-        return await self.service.update(
+        updated = await self.service.update(
             model=Faculty,
             filters=[Faculty.id == id],
             unique_filters=[Faculty.name == update_data.name],
             update_data=update_data.model_dump(exclude_unset=True),
         )
+        await publish_invalidation(self.session, SCOPE_FACULTY_GROUP)
+        return updated
 
     async def delete(self, id: int):
         await self.service.delete(
             model=Faculty, 
             filters=[Faculty.id == id]
             )
+        await publish_invalidation(self.session, SCOPE_FACULTY_GROUP)
         return {"message": "Delete successfully"}
 
 
@@ -1,4 +1,6 @@
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from .schemas import (
     GroupCreate,
@@ -10,6 +12,7 @@ from core.utils.service import BasicService
 from core.models.group import Group
 from core.models.group_teacher import GroupTeacher
 from core.schemas.get_all import GetAll
+from core.utils.cache_invalidation import publish_invalidation, SCOPE_FACULTY_GROUP
 
 
 class GroupService:
@@ -21,7 +24,10 @@ class GroupService:
         return await self.service.create(
             model=Group,
             create_data=create_data,
-            filters=[Group.name == create_data.name]
+            filters=[
+                Group.faculty_id == create_data.faculty_id,
+                Group.name == create_data.name,
+                ]
             )
         
         
@@ -48,14 +54,22 @@ class GroupService:
             )
     
     async def update(self, group_get: GroupGet, update_data: GroupUpdate):
-        return await self.service.update(
+        # Names are unique within the group's faculty
+        current = aliased(Group)
+        faculty_id = select(current.faculty_id).where(current.id == group_get.id).scalar_subquery()
+        updated = await self.service.update(
             model=Group,
             filters=[
                 Group.id == group_get.id,
                 ],
-            unique_filters=[Group.name == update_data.name],
+            unique_filters=[
+                Group.faculty_id == faculty_id,
+                Group.name == update_data.name,
+                ],
             update_data=update_data
             )
+        await publish_invalidation(self.session, SCOPE_FACULTY_GROUP)
+        return updated
         
     
     async def delete(self, group_get: GroupGet):
@@ -65,6 +79,7 @@ class GroupService:
                 Group.id == group_get.id,
             ]
             )
+        await publish_invalidation(self.session, SCOPE_FACULTY_GROUP)
         return {"message": "Group delete successfully"}
 
     
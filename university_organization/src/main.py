@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.responses import JSONResponse
 import uvicorn
 
@@ -6,6 +6,9 @@ import uvicorn
 from router import router as api_router
 from core.config import settings
 from core.lifespan.lifespan import lifespan
+from core.utils.metrics import metrics
+from auth.schemas.auth import TokenPaylod
+from auth.utils.dependencies import require_permission
 
 
 
@@ -26,6 +29,14 @@ async def health_check():
     return JSONResponse(status_code=200, content={"status": "ok"})
 
 
+@app.get("/metrics", tags=["Metrics"])
+async def get_metrics(
+    _ : TokenPaylod = Depends(require_permission("read:metrics")),
+):
+    """In-process metrics of this worker."""
+    return metrics.snapshot()
+
+
 if __name__ == "__main__":
     uvicorn.run(                    
         "main:app", 
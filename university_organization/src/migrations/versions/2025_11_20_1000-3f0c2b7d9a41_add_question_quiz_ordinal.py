@@ -0,0 +1,51 @@
+"""Add question_quiz ordinal
+
+Revision ID: 3f0c2b7d9a41
+Revises: 56a585838afe
+Create Date: 2025-11-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f0c2b7d9a41'
+down_revision: Union[str, Sequence[str], None] = '56a585838afe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('question_quiz', sa.Column('ordinal', sa.Integer(), nullable=True))
+
+    # Backfill a dense 1..N position per quiz
+    op.execute(
+        """
+        UPDATE question_quiz AS qq
+        SET ordinal = numbered.rn
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY quiz_id ORDER BY id) AS rn
+            FROM question_quiz
+        ) AS numbered
+        WHERE qq.id = numbered.id
+        """
+    )
+
+    op.alter_column('question_quiz', 'ordinal',
+               existing_type=sa.Integer(),
+               nullable=False)
+    op.create_unique_constraint(
+        op.f('uq_question_quiz_quiz_id_ordinal'),
+        'question_quiz',
+        ['quiz_id', 'ordinal']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('uq_question_quiz_quiz_id_ordinal'), 'question_quiz', type_='unique')
+    op.drop_column('question_quiz', 'ordinal')
@@ -0,0 +1,96 @@
+"""Add unique constraints used by the student importer
+
+Revision ID: 8c4e1a9d2b57
+Revises: 3f0c2b7d9a41
+Create Date: 2025-11-25 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e1a9d2b57'
+down_revision: Union[str, Sequence[str], None] = '3f0c2b7d9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Re-logins through HEMIS used to assign the student role again
+    op.execute(
+        """
+        DELETE FROM user_roles AS ur
+        USING user_roles AS kept
+        WHERE ur.user_id = kept.user_id
+          AND ur.role_id = kept.role_id
+          AND ur.id > kept.id
+        """
+    )
+    op.create_unique_constraint(
+        op.f('uq_user_roles_user_id_role_id'),
+        'user_roles',
+        ['user_id', 'role_id']
+    )
+
+    # Users own results, answers, questions and quizzes; merging them is a
+    # decision for a person, so refuse to guess
+    duplicates = op.get_bind().execute(sa.text(
+        """
+        SELECT username, count(*) FROM users
+        GROUP BY username HAVING count(*) > 1
+        ORDER BY username LIMIT 20
+        """
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{username!r} x{count}" for username, count in duplicates)
+        raise RuntimeError(
+            f"users.username has duplicates ({listed}); merge or rename them before upgrading"
+        )
+    op.create_unique_constraint(op.f('uq_users_username'), 'users', ['username'])
+
+    # Faculties with the same name are the same faculty: repoint to the oldest row
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE faculty_merge ON COMMIT DROP AS
+        SELECT id, min(id) OVER (PARTITION BY name) AS kept_id FROM facultys
+        """
+    )
+    for table in ('groups', 'chairs'):
+        op.execute(
+            f"""
+            UPDATE {table} SET faculty_id = m.kept_id
+            FROM faculty_merge m
+            WHERE {table}.faculty_id = m.id AND m.id <> m.kept_id
+            """
+        )
+    op.execute("DELETE FROM facultys USING faculty_merge m WHERE facultys.id = m.id AND m.id <> m.kept_id")
+    op.create_unique_constraint(op.f('uq_facultys_name'), 'facultys', ['name'])
+
+    # Group names repeat across faculties; within one faculty they are the same group
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE group_merge ON COMMIT DROP AS
+        SELECT id, min(id) OVER (PARTITION BY faculty_id, name) AS kept_id FROM groups
+        """
+    )
+    for table in ('students', 'group_teachers', 'quizzes', 'results'):
+        op.execute(
+            f"""
+            UPDATE {table} SET group_id = m.kept_id
+            FROM group_merge m
+            WHERE {table}.group_id = m.id AND m.id <> m.kept_id
+            """
+        )
+    op.execute("DELETE FROM groups USING group_merge m WHERE groups.id = m.id AND m.id <> m.kept_id")
+    op.create_unique_constraint(op.f('uq_groups_faculty_id_name'), 'groups', ['faculty_id', 'name'])
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('uq_groups_faculty_id_name'), 'groups', type_='unique')
+    op.drop_constraint(op.f('uq_facultys_name'), 'facultys', type_='unique')
+    op.drop_constraint(op.f('uq_users_username'), 'users', type_='unique')
+    op.drop_constraint(op.f('uq_user_roles_user_id_role_id'), 'user_roles', type_='unique')
@@ -0,0 +1,61 @@
+"""Add pg_trgm indexes for searchable columns
+
+Revision ID: b7d3f19c0e62
+Revises: 8c4e1a9d2b57
+Create Date: 2025-11-27 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f19c0e62'
+down_revision: Union[str, Sequence[str], None] = '8c4e1a9d2b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mirrors __searchable__ of the models (SearchableMixin)
+SEARCHABLE = {
+    'students': ['first_name', 'last_name', 'third_name', 'student_id_number'],
+    'teachers': ['first_name', 'last_name', 'patronymic'],
+    'users': ['username'],
+    'groups': ['name'],
+    'subjects': ['name'],
+    'quizzes': ['quiz_name'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCHABLE.items():
+            for column in columns:
+                op.create_index(
+                    f'ix_{table}_{column}_trgm',
+                    table,
+                    [column],
+                    unique=False,
+                    postgresql_using='gin',
+                    postgresql_ops={column: 'gin_trgm_ops'},
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCHABLE.items():
+            for column in columns:
+                op.drop_index(
+                    f'ix_{table}_{column}_trgm',
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
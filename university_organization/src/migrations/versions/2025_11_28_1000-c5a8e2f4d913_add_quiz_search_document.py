@@ -0,0 +1,163 @@
+"""Add quizzes.search_document maintained by triggers
+
+Revision ID: c5a8e2f4d913
+Revises: b7d3f19c0e62
+Create Date: 2025-11-28 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8e2f4d913'
+down_revision: Union[str, Sequence[str], None] = 'b7d3f19c0e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quizzes', sa.Column('search_document', sa.Text(), nullable=True))
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION quiz_search_document(
+            p_quiz_name text, p_user_id integer, p_group_id integer, p_subject_id integer
+        ) RETURNS text LANGUAGE sql STABLE AS $$
+            SELECT lower(concat_ws(' ',
+                p_quiz_name,
+                (SELECT concat_ws(' ', t.first_name, t.last_name, t.patronymic)
+                   FROM teachers t WHERE t.user_id = p_user_id),
+                (SELECT g.name FROM groups g WHERE g.id = p_group_id),
+                (SELECT s.name FROM subjects s WHERE s.id = p_subject_id)
+            ))
+        $$
+        """
+    )
+
+    # The quiz row itself
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION quizzes_set_search_document() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_document := quiz_search_document(
+                NEW.quiz_name, NEW.user_id, NEW.group_id, NEW.subject_id
+            );
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER quizzes_search_document
+        BEFORE INSERT OR UPDATE OF quiz_name, user_id, group_id, subject_id ON quizzes
+        FOR EACH ROW EXECUTE FUNCTION quizzes_set_search_document()
+        """
+    )
+
+    # Renamed teachers, groups and subjects
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION quizzes_refresh_search_document() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_TABLE_NAME = 'teachers' THEN
+                UPDATE quizzes
+                SET search_document = quiz_search_document(quiz_name, user_id, group_id, subject_id)
+                WHERE user_id = CASE WHEN TG_OP = 'DELETE' THEN OLD.user_id ELSE NEW.user_id END;
+            ELSIF TG_TABLE_NAME = 'groups' THEN
+                UPDATE quizzes
+                SET search_document = quiz_search_document(quiz_name, user_id, group_id, subject_id)
+                WHERE group_id = NEW.id;
+            ELSE
+                UPDATE quizzes
+                SET search_document = quiz_search_document(quiz_name, user_id, group_id, subject_id)
+                WHERE subject_id = NEW.id;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER teachers_quiz_search_document
+        AFTER INSERT OR DELETE OR UPDATE OF first_name, last_name, patronymic, user_id ON teachers
+        FOR EACH ROW EXECUTE FUNCTION quizzes_refresh_search_document()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER groups_quiz_search_document
+        AFTER UPDATE OF name ON groups
+        FOR EACH ROW EXECUTE FUNCTION quizzes_refresh_search_document()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER subjects_quiz_search_document
+        AFTER UPDATE OF name ON subjects
+        FOR EACH ROW EXECUTE FUNCTION quizzes_refresh_search_document()
+        """
+    )
+
+    op.execute(
+        """
+        UPDATE quizzes
+        SET search_document = quiz_search_document(quiz_name, user_id, group_id, subject_id)
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_quizzes_search_document_trgm',
+            'quizzes',
+            ['search_document'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'search_document': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Superseded: quiz_name is part of the document
+        op.drop_index(
+            'ix_quizzes_quiz_name_trgm',
+            table_name='quizzes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_quizzes_quiz_name_trgm',
+            'quizzes',
+            ['quiz_name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'quiz_name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_quizzes_search_document_trgm',
+            table_name='quizzes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.execute('DROP TRIGGER IF EXISTS subjects_quiz_search_document ON subjects')
+    op.execute('DROP TRIGGER IF EXISTS groups_quiz_search_document ON groups')
+    op.execute('DROP TRIGGER IF EXISTS teachers_quiz_search_document ON teachers')
+    op.execute('DROP TRIGGER IF EXISTS quizzes_search_document ON quizzes')
+    op.execute('DROP FUNCTION IF EXISTS quizzes_refresh_search_document()')
+    op.execute('DROP FUNCTION IF EXISTS quizzes_set_search_document()')
+    op.execute('DROP FUNCTION IF EXISTS quiz_search_document(text, integer, integer, integer)')
+    op.drop_column('quizzes', 'search_document')
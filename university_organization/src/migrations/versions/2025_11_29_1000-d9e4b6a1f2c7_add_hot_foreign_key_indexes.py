@@ -0,0 +1,95 @@
+"""Add indexes for filtered foreign keys and unique question_quiz pairs
+
+Revision ID: d9e4b6a1f2c7
+Revises: c5a8e2f4d913
+Create Date: 2025-11-29 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4b6a1f2c7'
+down_revision: Union[str, Sequence[str], None] = 'c5a8e2f4d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Reported by core/utils/index_audit.py; mirrors the index declarations of the models.
+# users.username and students.user_id are already covered by their unique constraints.
+INDEXES = [
+    ('ix_results_student_id_created_at', 'results', ['student_id', 'created_at']),
+    ('ix_results_teacher_id_created_at', 'results', ['teacher_id', 'created_at']),
+    ('ix_results_quiz_id', 'results', ['quiz_id']),
+    ('ix_results_created_at', 'results', ['created_at']),
+    ('ix_user_answers_user_id_quiz_id', 'user_answers', ['user_id', 'quiz_id']),
+    ('ix_user_answers_quiz_id', 'user_answers', ['quiz_id']),
+    ('ix_question_quiz_question_id', 'question_quiz', ['question_id']),
+    ('ix_questions_user_id_subject_id', 'questions', ['user_id', 'subject_id']),
+    ('ix_questions_subject_id', 'questions', ['subject_id']),
+    ('ix_quizzes_user_id', 'quizzes', ['user_id']),
+    ('ix_quizzes_group_id', 'quizzes', ['group_id']),
+    ('ix_students_group_id', 'students', ['group_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Attaching questions twice used to be possible; keep the first link
+    op.execute(
+        """
+        DELETE FROM question_quiz AS qq
+        USING question_quiz AS kept
+        WHERE qq.quiz_id = kept.quiz_id
+          AND qq.question_id = kept.question_id
+          AND qq.id > kept.id
+        """
+    )
+    # Close the gaps so ordinals stay dense (1..N); negate first to dodge
+    # uq_question_quiz_quiz_id_ordinal while rows are renumbered
+    op.execute(
+        """
+        UPDATE question_quiz AS qq
+        SET ordinal = -numbered.rn
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY quiz_id ORDER BY ordinal) AS rn
+            FROM question_quiz
+        ) AS numbered
+        WHERE qq.id = numbered.id
+          AND qq.ordinal <> numbered.rn
+        """
+    )
+    op.execute('UPDATE question_quiz SET ordinal = -ordinal WHERE ordinal < 0')
+    op.create_unique_constraint(
+        op.f('uq_question_quiz_quiz_id_question_id'),
+        'question_quiz',
+        ['quiz_id', 'question_id']
+    )
+
+    # CONCURRENTLY keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    op.drop_constraint(op.f('uq_question_quiz_quiz_id_question_id'), 'question_quiz', type_='unique')
@@ -0,0 +1,85 @@
+"""Add latest_results projection
+
+Revision ID: e1f7c3a9b5d2
+Revises: d9e4b6a1f2c7
+Create Date: 2025-11-30 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f7c3a9b5d2'
+down_revision: Union[str, Sequence[str], None] = 'd9e4b6a1f2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('latest_results',
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('result_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['result_id'], ['results.id'], name=op.f('fk_latest_results_result_id_results'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], name=op.f('fk_latest_results_student_id_users'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], name=op.f('fk_latest_results_teacher_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_latest_results')),
+    sa.UniqueConstraint('result_id', name=op.f('uq_latest_results_result_id')),
+    sa.UniqueConstraint('teacher_id', 'student_id', name=op.f('uq_latest_results_teacher_id_student_id'))
+    )
+    op.create_index('ix_latest_results_teacher_id_created_at', 'latest_results', ['teacher_id', 'created_at'], unique=False)
+    op.create_index('ix_latest_results_student_id_created_at', 'latest_results', ['student_id', 'created_at'], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO latest_results (teacher_id, student_id, result_id, created_at)
+        SELECT DISTINCT ON (teacher_id, student_id) teacher_id, student_id, id, created_at
+        FROM results
+        ORDER BY teacher_id, student_id, created_at DESC, id DESC
+        """
+    )
+
+    # Inserts are upserted by the application; deletes come from both services
+    # and from cascades (users, quizzes, groups, subjects), so the database
+    # falls back to the previous attempt of the pair
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION latest_results_on_result_delete() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM latest_results WHERE result_id = OLD.id;
+            INSERT INTO latest_results (teacher_id, student_id, result_id, created_at)
+            SELECT r.teacher_id, r.student_id, r.id, r.created_at
+            FROM results r
+            WHERE r.teacher_id = OLD.teacher_id AND r.student_id = OLD.student_id
+            ORDER BY r.created_at DESC, r.id DESC
+            LIMIT 1
+            ON CONFLICT (teacher_id, student_id) DO NOTHING;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER results_latest_results
+        AFTER DELETE ON results
+        FOR EACH ROW EXECUTE FUNCTION latest_results_on_result_delete()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS results_latest_results ON results')
+    op.execute('DROP FUNCTION IF EXISTS latest_results_on_result_delete()')
+    op.drop_index('ix_latest_results_student_id_created_at', table_name='latest_results')
+    op.drop_index('ix_latest_results_teacher_id_created_at', table_name='latest_results')
+    op.drop_table('latest_results')
@@ -0,0 +1,57 @@
+"""Add results best-attempt ranking index
+
+Revision ID: f3b8d2c6a4e1
+Revises: e1f7c3a9b5d2
+Create Date: 2025-12-01 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2c6a4e1'
+down_revision: Union[str, Sequence[str], None] = 'e1f7c3a9b5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_results_quiz_id_student_id_grade_id',
+            'results',
+            ['quiz_id', 'student_id', sa.text('grade DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Superseded: quiz_id leads the new index
+        op.drop_index(
+            'ix_results_quiz_id',
+            table_name='results',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_results_quiz_id',
+            'results',
+            ['quiz_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_results_quiz_id_student_id_grade_id',
+            table_name='results',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,70 @@
+"""Add user_answers keyset pagination indexes
+
+Revision ID: a4c9e7b1d3f8
+Revises: f3b8d2c6a4e1
+Create Date: 2025-12-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e7b1d3f8'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2c6a4e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_answers_user_id_id',
+            'user_answers',
+            ['user_id', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_answers_user_id_quiz_id_id',
+            'user_answers',
+            ['user_id', 'quiz_id', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Superseded: a prefix of ix_user_answers_user_id_quiz_id_id
+        op.drop_index(
+            'ix_user_answers_user_id_quiz_id',
+            table_name='user_answers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_answers_user_id_quiz_id',
+            'user_answers',
+            ['user_id', 'quiz_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_user_answers_user_id_quiz_id_id',
+            table_name='user_answers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_user_answers_user_id_id',
+            table_name='user_answers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,117 @@
+"""Add result_rollups for statistics
+
+Revision ID: b8d2f6a0c4e9
+Revises: a4c9e7b1d3f8
+Create Date: 2025-12-03 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f6a0c4e9'
+down_revision: Union[str, Sequence[str], None] = 'a4c9e7b1d3f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('result_rollups',
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('grade_sum', sa.Float(), nullable=False),
+    sa.Column('grade_2', sa.Integer(), nullable=False),
+    sa.Column('grade_3', sa.Integer(), nullable=False),
+    sa.Column('grade_4', sa.Integer(), nullable=False),
+    sa.Column('grade_5', sa.Integer(), nullable=False),
+    sa.Column('correct_sum', sa.Integer(), nullable=False),
+    sa.Column('incorrect_sum', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], name=op.f('fk_result_rollups_group_id_groups'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], name=op.f('fk_result_rollups_quiz_id_quizzes'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], name=op.f('fk_result_rollups_subject_id_subjects'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], name=op.f('fk_result_rollups_teacher_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_result_rollups')),
+    sa.UniqueConstraint('quiz_id', 'group_id', 'subject_id', 'teacher_id', 'day', name=op.f('uq_result_rollups_quiz_id_group_id_subject_id_teacher_id_day'))
+    )
+    op.create_index('ix_result_rollups_group_id_day', 'result_rollups', ['group_id', 'day'], unique=False)
+    op.create_index('ix_result_rollups_teacher_id_day', 'result_rollups', ['teacher_id', 'day'], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO result_rollups (
+            quiz_id, group_id, subject_id, teacher_id, day,
+            attempts, grade_sum, grade_2, grade_3, grade_4, grade_5,
+            correct_sum, incorrect_sum
+        )
+        SELECT
+            quiz_id, group_id, subject_id, teacher_id, created_at::date,
+            count(*), sum(grade),
+            count(*) FILTER (WHERE grade = 2), count(*) FILTER (WHERE grade = 3),
+            count(*) FILTER (WHERE grade = 4), count(*) FILTER (WHERE grade = 5),
+            sum(correct_answers), sum(incorrect_answers)
+        FROM results
+        GROUP BY quiz_id, group_id, subject_id, teacher_id, created_at::date
+        """
+    )
+
+    # Inserts are added by the application; deletes come from both services
+    # and from cascades, so the database subtracts them
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION result_rollups_on_result_delete() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE result_rollups
+            SET attempts = attempts - 1,
+                grade_sum = grade_sum - OLD.grade,
+                grade_2 = grade_2 - (OLD.grade = 2)::int,
+                grade_3 = grade_3 - (OLD.grade = 3)::int,
+                grade_4 = grade_4 - (OLD.grade = 4)::int,
+                grade_5 = grade_5 - (OLD.grade = 5)::int,
+                correct_sum = correct_sum - OLD.correct_answers,
+                incorrect_sum = incorrect_sum - OLD.incorrect_answers,
+                updated_at = now()
+            WHERE quiz_id = OLD.quiz_id
+              AND group_id = OLD.group_id
+              AND subject_id = OLD.subject_id
+              AND teacher_id = OLD.teacher_id
+              AND day = OLD.created_at::date;
+            DELETE FROM result_rollups
+            WHERE quiz_id = OLD.quiz_id
+              AND group_id = OLD.group_id
+              AND subject_id = OLD.subject_id
+              AND teacher_id = OLD.teacher_id
+              AND day = OLD.created_at::date
+              AND attempts <= 0;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER results_result_rollups
+        AFTER DELETE ON results
+        FOR EACH ROW EXECUTE FUNCTION result_rollups_on_result_delete()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS results_result_rollups ON results')
+    op.execute('DROP FUNCTION IF EXISTS result_rollups_on_result_delete()')
+    op.drop_index('ix_result_rollups_teacher_id_day', table_name='result_rollups')
+    op.drop_index('ix_result_rollups_group_id_day', table_name='result_rollups')
+    op.drop_table('result_rollups')
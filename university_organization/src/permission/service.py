@@ -6,6 +6,7 @@ from .schemas import PermissionCreate, PermissionUpdate
 from core.utils.service import BasicService
 from core.models.permission import Permission
 from core.schemas.get_all import GetAll
+from core.utils.cache_invalidation import publish_invalidation
 
 
 class PermissionService:
@@ -36,18 +37,22 @@ class PermissionService:
         )
     
     async def update(self, id: int, update_data: PermissionUpdate):
-        return await self.service.update(
+        updated = await self.service.update(
             model=Permission,
             filters=[Permission.id == id],
             unique_filters=[Permission.name == update_data.name],
             update_data=update_data
         )
+        await publish_invalidation(self.session)
+        return updated
     
     async def delete(self, id: int):
-        return await self.service.delete(
+        deleted = await self.service.delete(
             model=Permission,
             filters=[Permission.id == id]
         )
+        await publish_invalidation(self.session)
+        return deleted
         
         
     async def sync_permissions(self, perms: list[PermissionCreate]):
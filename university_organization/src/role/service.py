@@ -7,6 +7,7 @@ from .schemas import (
 )
 
 from core.utils.service import BasicService
+from core.utils.cache_invalidation import publish_invalidation
 from core.models.role_permission_association import RolePermission
 from core.schemas.get_all import GetAll
 from core.models.role import Role
@@ -49,7 +50,7 @@ class RoleService:
             )
     
     async def update(self, id: int, update_data: RoleUpdate):
-        return await self.service.update(
+        updated = await self.service.update(
             model=Role,
             filters=[
                 Role.id == id
@@ -59,19 +60,25 @@ class RoleService:
             ],
             update_data=update_data
             )
+        await publish_invalidation(self.session)
+        return updated
     
     async def delete(self, id: int):
-        return await self.service.delete(
+        deleted = await self.service.delete(
             model=Role,
             filters=[
                 Role.id == id
             ]
             )
+        await publish_invalidation(self.session)
+        return deleted
     
     async def assignment(self, create_data: RolePermission):
-        return await self.service.create(
+        created = await self.service.create(
             model=RolePermission,
             create_data=create_data,
             )
+        await publish_invalidation(self.session)
+        return created
         
     
\ No newline at end of file
@@ -8,6 +8,7 @@ from .schemas import RolePermissionCreate, RolePermissionUpdate
 from core.models.role_permission_association import RolePermission
 from core.models.role import Role
 from core.utils.service import BasicService
+from core.utils.cache_invalidation import publish_invalidation
 
 
 class RolePermissionService:
@@ -19,7 +20,7 @@ class RolePermissionService:
 
     async def create(self, create_data: RolePermissionCreate):
         """Create a new RolePermission if it does not already exist."""
-        return await self.service.create(
+        created = await self.service.create(
             model=RolePermission,
             filters=[
                 RolePermission.role_id == create_data.role_id,
@@ -27,6 +28,8 @@ class RolePermissionService:
             ],
             create_data=create_data,
         )
+        await publish_invalidation(self.session)
+        return created
 
     async def get_by_id(self, id: int):
         """Retrieve a RolePermission by its ID."""
@@ -83,7 +86,7 @@ class RolePermissionService:
 
     async def update(self, id: int, update_data: RolePermissionUpdate):
         """Update an existing RolePermission by ID."""
-        return await self.service.update(
+        updated = await self.service.update(
             model=RolePermission,
             filters=[RolePermission.id == id],
             unique_filters=[
@@ -92,10 +95,14 @@ class RolePermissionService:
             ],
             update_data=update_data,
         )
+        await publish_invalidation(self.session)
+        return updated
 
     async def delete(self, id: int):
         """Delete a RolePermission by ID."""
-        return await self.service.delete(
+        deleted = await self.service.delete(
             model=RolePermission,
             filters=[RolePermission.id == id],
         )
+        await publish_invalidation(self.session)
+        return deleted
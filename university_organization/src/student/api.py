@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Query, Path
+from fastapi import APIRouter, Depends, Query, Path, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from .schemas import StudentResponse, StudentGet
 from .service import StudentService
+from .importer import StudentImportReport
 
 
 from core.utils.database import db_helper
@@ -34,6 +35,17 @@ async def get_all(
     return await service.get_all(pagination=pagination, search=search)
 
 
+@router.post("/import", response_model=StudentImportReport)
+async def import_students(
+    file: UploadFile = File(..., description="HEMIS eksporti: JSON yoki NDJSON (.ndjson/.jsonl)"),
+    service: StudentService = Depends(get_student_service),
+    _: User = Depends(require_permission("create:students"))
+    ):
+    ndjson = (file.filename or "").endswith((".ndjson", ".jsonl"))
+    # The spooled file is read in the threadpool, see importer.read_upload
+    return await service.import_students(file=file.file, ndjson=ndjson)
+
+
 @router.get("/get/{id}", response_model=StudentResponse)
 async def get_by_id(
     id: int = Path(..., description="Talabaning yagona ID raqami"),
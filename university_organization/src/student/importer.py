@@ -0,0 +1,281 @@
+"""
+Bulk import of students from a HEMIS export or the paginated HEMIS API.
+
+    python -m student.importer students.ndjson
+    python -m student.importer --hemis-token <token>
+
+Faculties, groups, users, their student role and the student rows are
+upserted in batches, so a student that was imported logs in without the
+login path ever fetching account/me. Imported users get UNUSABLE_PASSWORD;
+the first HEMIS login sets the real hash.
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import logging
+from typing import AsyncIterator, Callable, IO, Iterable
+
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.service.student_service import map_hemis_student
+from auth.utils.hemis_client import hemis_client
+from auth.utils.security import UNUSABLE_PASSWORD
+from core.models import Faculty, Group, Role, Student, User, UserRole
+from core.utils.normalize_type_name import normalize_type_name
+
+log = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 100
+
+# asyncpg sends at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
+
+class StudentImportReport(BaseModel):
+    read: int = 0
+    imported: int = 0
+    skipped: int = 0
+    batches: int = 0
+    errors: list[str] = Field(default_factory=list)
+
+
+def _items(document) -> list[dict]:
+    """Records of a JSON export: a bare list or a HEMIS {"data": {"items": [...]}} page."""
+    if isinstance(document, list):
+        return document
+    data = document.get("data", document)
+    return data.get("items", []) if isinstance(data, dict) else data
+
+
+def read_export(file: IO, ndjson: bool) -> Iterable[dict]:
+    """Stream records from an NDJSON export, or load a JSON export."""
+    if not ndjson:
+        yield from _items(json.load(file))
+        return
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+async def read_upload(file: IO[bytes], ndjson: bool, chunk_size: int = 1000) -> AsyncIterator[dict]:
+    """
+    read_export for an uploaded (spooled) file without blocking the event loop:
+    reading and parsing run in the threadpool, `chunk_size` records at a time.
+    A JSON export is parsed whole in the first chunk; NDJSON streams.
+    """
+    records = iter(read_export(io.TextIOWrapper(file, encoding="utf-8"), ndjson=ndjson))
+    while True:
+        chunk = await run_in_threadpool(lambda: list(itertools.islice(records, chunk_size)))
+        if not chunk:
+            return
+        for record in chunk:
+            yield record
+
+
+async def iter_hemis_api(token: str, endpoint: str = "data/student-list", page_size: int = 200) -> AsyncIterator[dict]:
+    """Page through a HEMIS list endpoint with an admin token."""
+    headers = {"Authorization": f"Bearer {token}"}
+    page = 1
+    while True:
+        response = await hemis_client.get(endpoint, headers=headers, params={"page": page, "limit": page_size})
+        response.raise_for_status()
+        data = response.json().get("data", {})
+        for item in data.get("items", []):
+            yield item
+
+        page_count = data.get("pagination", {}).get("pageCount", page)
+        if page >= page_count:
+            return
+        page += 1
+
+
+async def _aiter(records: Iterable[dict] | AsyncIterator[dict]) -> AsyncIterator[dict]:
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
+class HemisStudentImporter:
+    def __init__(
+        self,
+        session: AsyncSession,
+        batch_size: int = 1000,
+        on_progress: Callable[[StudentImportReport], None] | None = None,
+    ):
+        # Users are inserted two columns per row in one statement
+        if not 0 < batch_size <= MAX_BIND_PARAMS // 2:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BIND_PARAMS // 2}")
+        self.session = session
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.report = StudentImportReport()
+        self._student_role_id: int | None = None
+
+    def _error(self, message: str) -> None:
+        self.report.skipped += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(message)
+
+    def _normalize(self, record: dict) -> dict | None:
+        try:
+            student = map_hemis_student(record)
+            # Same keys group_create_check looks faculties and groups up by
+            student["faculty_name"] = normalize_type_name(student["faculty"])
+            student["group"] = normalize_type_name(student["group"])
+        except Exception as e:
+            self._error(f"{record.get('student_id_number')}: {getattr(e, 'detail', e)}")
+            return None
+        return student
+
+    async def run(self, records: Iterable[dict] | AsyncIterator[dict]) -> StudentImportReport:
+        self._student_role_id = await self._ensure_student_role()
+
+        batch: dict[str, dict] = {}
+        async for record in _aiter(records):
+            self.report.read += 1
+            student = self._normalize(record)
+            if student is None:
+                continue
+            # Last record wins; one upsert can not touch the same row twice
+            batch[student["student_id_number"]] = student
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = {}
+
+        if batch:
+            await self._flush(batch)
+        return self.report
+
+    async def _ensure_student_role(self) -> int:
+        await self.session.execute(
+            insert(Role).values(name="student").on_conflict_do_nothing(index_elements=["name"])
+        )
+        role_id = (await self.session.execute(select(Role.id).where(Role.name == "student"))).scalar_one()
+        await self.session.commit()
+        return role_id
+
+    async def _upsert_faculties(self, names: set[str]) -> dict[str, int]:
+        """INSERT ... ON CONFLICT (name) DO NOTHING, then name -> id for every faculty."""
+        await self.session.execute(
+            insert(Faculty).values([{"name": name} for name in names]).on_conflict_do_nothing(index_elements=["name"])
+        )
+        result = await self.session.execute(select(Faculty.name, Faculty.id).where(Faculty.name.in_(names)))
+        return dict(result.all())
+
+    async def _upsert_groups(self, keys: set[tuple[int, str]]) -> dict[tuple[int, str], int]:
+        """INSERT ... ON CONFLICT (faculty_id, name) DO NOTHING, then (faculty_id, name) -> id for every group."""
+        await self.session.execute(
+            insert(Group)
+            .values([{"faculty_id": faculty_id, "name": name} for faculty_id, name in keys])
+            .on_conflict_do_nothing(index_elements=["faculty_id", "name"])
+        )
+        result = await self.session.execute(
+            select(Group.faculty_id, Group.name, Group.id)
+            .where(tuple_(Group.faculty_id, Group.name).in_(list(keys)))
+        )
+        return {(faculty_id, name): row_id for faculty_id, name, row_id in result.all()}
+
+    async def _flush(self, batch: dict[str, dict]) -> None:
+        students = list(batch.values())
+        try:
+            faculty_ids = await self._upsert_faculties({s["faculty_name"] for s in students})
+            group_ids = await self._upsert_groups(
+                {(faculty_ids[s["faculty_name"]], s["group"]) for s in students}
+            )
+
+            await self.session.execute(
+                insert(User)
+                .values([{"username": username, "password": UNUSABLE_PASSWORD} for username in batch])
+                .on_conflict_do_nothing(index_elements=["username"])
+            )
+            user_ids = dict(
+                (await self.session.execute(
+                    select(User.username, User.id).where(User.username.in_(list(batch)))
+                )).all()
+            )
+
+            await self.session.execute(
+                insert(UserRole)
+                .values([{"user_id": user_id, "role_id": self._student_role_id} for user_id in user_ids.values()])
+                .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
+            )
+
+            rows = []
+            for student in students:
+                row = {key: value for key, value in student.items() if key not in ("group", "faculty_name")}
+                row["user_id"] = user_ids[student["student_id_number"]]
+                row["group_id"] = group_ids[(faculty_ids[student["faculty_name"]], student["group"])]
+                rows.append(row)
+
+            # A student row has ~25 columns; keep each statement under the bind limit
+            chunk_size = MAX_BIND_PARAMS // len(rows[0])
+            for start in range(0, len(rows), chunk_size):
+                stmt = insert(Student).values(rows[start:start + chunk_size])
+                await self.session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["user_id"],
+                        set_={key: stmt.excluded[key] for key in rows[0] if key != "user_id"},
+                    )
+                )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            log.exception(f"Student import batch of {len(students)} failed")
+            for username in batch:
+                self._error(f"{username}: batch failed ({e.__class__.__name__})")
+            return
+
+        self.report.imported += len(students)
+        self.report.batches += 1
+        if self.on_progress is not None:
+            self.on_progress(self.report)
+
+
+def _log_progress(report: StudentImportReport) -> None:
+    log.info(f"Student import: read={report.read} imported={report.imported} skipped={report.skipped}")
+
+
+async def _main(args: argparse.Namespace) -> StudentImportReport:
+    from core.utils.database import db_helper
+
+    try:
+        async with db_helper.session_factory() as session:
+            importer = HemisStudentImporter(session, batch_size=args.batch_size, on_progress=_log_progress)
+            if args.hemis_token:
+                return await importer.run(iter_hemis_api(args.hemis_token, page_size=args.page_size))
+            with open(args.path, encoding="utf-8") as file:
+                ndjson = args.path.endswith((".ndjson", ".jsonl"))
+                return await importer.run(read_export(file, ndjson=ndjson))
+    finally:
+        await hemis_client.close()
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import students from HEMIS")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("path", nargs="?", help="JSON or NDJSON (.ndjson/.jsonl) export")
+    source.add_argument("--hemis-token", help="Admin token for the paginated HEMIS API")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+    if not 0 < args.batch_size <= MAX_BIND_PARAMS // 2:
+        parser.error(f"--batch-size must be between 1 and {MAX_BIND_PARAMS // 2}")
+
+    logging.basicConfig(level=logging.INFO)
+    report = asyncio.run(_main(args))
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import IO
 
 
 from .schemas import StudentGet
@@ -6,6 +7,7 @@ from .schemas import StudentGet
 from core.utils.service import BasicService
 from core.models.student import Student
 from core.schemas.get_all import GetAll
+from .importer import HemisStudentImporter, StudentImportReport, read_upload
 
 
 class StudentService:
@@ -20,6 +22,10 @@ class StudentService:
             single=True
         )
     
+    async def import_students(self, file: IO[bytes], ndjson: bool) -> StudentImportReport:
+        importer = HemisStudentImporter(session=self.session)
+        return await importer.run(read_upload(file, ndjson=ndjson, chunk_size=importer.batch_size))
+
     async def get_all(
             self,
             pagination: GetAll,
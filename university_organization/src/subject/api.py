@@ -10,6 +10,7 @@ from core.utils.database import db_helper
 from auth.schemas.auth import TokenPaylod
 from auth.utils.dependencies import require_permission
 from core.schemas.get_all import GetAll
+from core.utils.totals import TotalMode
 
 router = APIRouter(
     tags=["Subject"],
@@ -44,10 +45,14 @@ async def get_all(
     search: str | None = None, 
     limit: int = 500,
     offset: int = 0,
+    after: str | None = None,
+    before: str | None = None,
+    total: TotalMode | None = None,
     service: SubjectService = Depends(get_subject_service),
     _ : TokenPaylod = Depends(require_permission("read:subjects"))
 ):
-    pagination = GetAll(limit = limit, offset = offset)
+    # Built by hand to keep this list's 500-row default page
+    pagination = GetAll(limit = limit, offset = offset, after = after, before = before, total = total)
     return await service.get_all_subjects(pagination = pagination, search=search)
 
 @router.put("/update/{subject_id}")
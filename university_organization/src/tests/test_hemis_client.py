@@ -0,0 +1,147 @@
+import asyncio
+
+import httpx
+import pytest
+
+from auth.utils import hemis_client as hemis_module
+from auth.utils.hemis_client import HemisClient
+
+
+def make_client(handler, retries: int = 3, max_concurrency: int = 10, retry_backoff: float = 0.5) -> HemisClient:
+    return HemisClient(
+        base_url="https://hemis.test/rest/v1/",
+        max_connections=10,
+        max_concurrency=max_concurrency,
+        timeout=5,
+        connect_timeout=1,
+        retries=retries,
+        retry_backoff=retry_backoff,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays the client asked for; no real sleeping."""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(hemis_module.asyncio, "sleep", sleep)
+    return delays
+
+
+async def test_retries_gateway_errors_with_full_jitter(monkeypatch, sleeps):
+    statuses = iter([503, 502, 200])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(next(statuses), json={"success": True})
+
+    # Full jitter: each delay is drawn from [0, backoff * 2 ** attempt]
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append((low, high))
+        return high / 2
+
+    monkeypatch.setattr(hemis_module.random, "uniform", uniform)
+
+    client = make_client(handler)
+    retried = client.retried.value
+    try:
+        response = await client.get("account/me", headers={"Authorization": "Bearer token"})
+    finally:
+        await client.close()
+
+    assert response.status_code == 200
+    assert len(requests) == 3
+    assert requests[0].url == "https://hemis.test/rest/v1/account/me"
+    assert bounds == [(0, 0.5), (0, 1.0)]
+    assert sleeps == [0.25, 0.5]
+    assert client.retried.value - retried == 2
+
+
+async def test_jitter_stays_within_the_exponential_bound():
+    client = make_client(lambda request: httpx.Response(200), retry_backoff=0.2)
+
+    for attempt in range(5):
+        delays = [client._backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= 0.2 * 2 ** attempt for delay in delays)
+        # Jittered, not a fixed step
+        assert len(set(delays)) > 1
+
+
+async def test_gives_up_after_the_last_retry(sleeps):
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = make_client(handler, retries=2)
+    failed = client.failed.value
+    try:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("account/me")
+    finally:
+        await client.close()
+
+    assert calls == 3
+    assert len(sleeps) == 2
+    assert client.failed.value - failed == 1
+
+
+async def test_last_gateway_error_is_returned(sleeps):
+    client = make_client(lambda request: httpx.Response(504), retries=1)
+    try:
+        response = await client.get("account/me")
+    finally:
+        await client.close()
+
+    assert response.status_code == 504
+    assert len(sleeps) == 1
+
+
+async def test_client_errors_are_not_retried(sleeps):
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(401)
+
+    client = make_client(handler)
+    try:
+        response = await client.post("auth/login", json={"login": "x", "password": "y"})
+    finally:
+        await client.close()
+
+    assert response.status_code == 401
+    assert calls == 1
+    assert sleeps == []
+
+
+async def test_semaphore_bounds_concurrent_requests():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    client = make_client(handler, max_concurrency=3)
+    try:
+        responses = await asyncio.gather(*(client.get(f"data/student-list?page={page}") for page in range(20)))
+    finally:
+        await client.close()
+
+    assert all(response.status_code == 200 for response in responses)
+    assert peak == 3
@@ -0,0 +1,78 @@
+import ast
+import textwrap
+
+from core.models import Base
+from core.utils.index_audit import (
+    FilterColumnVisitor,
+    audit,
+    indexed_leading_columns,
+    mapped_tables,
+    trigram_indexed_columns,
+)
+
+
+def visit(source: str) -> list[tuple[str, str, str, bool]]:
+    visitor = FilterColumnVisitor(mapped_tables(), "module.py")
+    visitor.visit(ast.parse(textwrap.dedent(source)))
+    return visitor.found
+
+
+def test_visitor_collects_filter_columns():
+    found = visit(
+        """
+        stmt = (
+            select(Result)
+            .join(Quiz, Quiz.id == Result.quiz_id)
+            .where(Result.student_id == user_id, Result.grade >= 4)
+            .where(Teacher.first_name.ilike(term), Student.group_id.in_(group_ids))
+        )
+        """
+    )
+
+    assert set(found) == {
+        ("quizzes", "id", "module.py:4", True),
+        ("results", "quiz_id", "module.py:4", True),
+        ("results", "student_id", "module.py:5", True),
+        ("results", "grade", "module.py:5", False),
+        ("teachers", "first_name", "module.py:6", True),
+        ("students", "group_id", "module.py:6", False),
+    }
+
+
+def test_visitor_ignores_unmapped_names_and_columns():
+    assert visit("select(x).where(Foo.bar == 1, Result.not_a_column == 2, result.grade == 3)") == []
+
+
+def test_composite_and_trigram_indexes():
+    tables = Base.metadata.tables
+
+    # (quiz_id, student_id, grade DESC, id DESC) covers quiz_id only
+    assert "quiz_id" in indexed_leading_columns(tables["results"])
+    assert "grade" not in indexed_leading_columns(tables["results"])
+
+    # GIN indexes are not btree leading columns, but serve pattern matches
+    assert "first_name" not in indexed_leading_columns(tables["teachers"])
+    assert {"first_name", "last_name", "patronymic"} <= trigram_indexed_columns(tables["teachers"])
+    assert trigram_indexed_columns(tables["workers"]) == set()
+
+
+def test_audit_treats_trigram_indexes_as_covering(tmp_path):
+    (tmp_path / "service.py").write_text(
+        textwrap.dedent(
+            """
+            select(Teacher).where(Teacher.first_name.ilike(term), Teacher.last_name == name)
+            select(Teacher).where(Teacher.patronymic > name)
+            select(Worker).where(Worker.first_name.ilike(term))
+            """
+        ),
+        encoding="utf-8",
+    )
+
+    missing = {(entry.table, entry.column): entry for entry in audit([tmp_path])}
+
+    assert ("teachers", "first_name") not in missing
+    assert ("teachers", "last_name") not in missing
+    # A range comparison is not something gin_trgm_ops can serve
+    assert ("teachers", "patronymic") in missing
+    assert ("workers", "first_name") in missing
+    assert missing[("workers", "first_name")].name == "ix_workers_first_name"
@@ -0,0 +1,29 @@
+from sqlalchemy.dialects import postgresql
+
+from core.models.student import Student
+from core.utils.search import search_clause
+
+
+def compile_clause(term: str):
+    clause = search_clause(Student, term, ["user_id", "first_name"])
+    return clause.compile(dialect=postgresql.dialect())
+
+
+def test_numeric_term_matches_integer_columns_by_equality():
+    compiled = compile_clause("42")
+    assert "students.user_id = %(user_id_1)s" in str(compiled)
+    assert "CAST" not in str(compiled)
+    assert compiled.params["user_id_1"] == 42
+
+
+def test_out_of_range_number_skips_integer_columns():
+    # A 14-digit student id number would overflow the int4 parameter
+    compiled = compile_clause("30000012345678")
+    assert "user_id" not in str(compiled)
+    assert list(compiled.params.values()) == ["%30000012345678%"]
+
+
+def test_like_wildcards_match_literally():
+    compiled = compile_clause("50%_a")
+    assert "ILIKE" in str(compiled)
+    assert list(compiled.params.values()) == ["%50\\%\\_a%"]
@@ -0,0 +1,42 @@
+import io
+import json
+import threading
+
+from student.importer import read_upload
+
+
+class RecordingFile(io.BytesIO):
+    """Spooled upload stand-in that remembers which threads read it."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.threads = set()
+
+    def read1(self, *args):
+        self.threads.add(threading.get_ident())
+        return super().read1(*args)
+
+    def read(self, *args):
+        self.threads.add(threading.get_ident())
+        return super().read(*args)
+
+
+async def collect(file, ndjson: bool, chunk_size: int) -> list[dict]:
+    return [record async for record in read_upload(file, ndjson=ndjson, chunk_size=chunk_size)]
+
+
+async def test_ndjson_is_streamed_off_the_event_loop():
+    records = [{"student_id_number": str(n)} for n in range(5)]
+    file = RecordingFile("\n".join(json.dumps(r) for r in records).encode() + b"\n\n")
+
+    assert await collect(file, ndjson=True, chunk_size=2) == records
+    assert file.threads
+    assert threading.get_ident() not in file.threads
+
+
+async def test_json_export_page_is_unwrapped():
+    records = [{"student_id_number": "1"}, {"student_id_number": "2"}]
+    file = RecordingFile(json.dumps({"data": {"items": records}}).encode())
+
+    assert await collect(file, ndjson=False, chunk_size=1) == records
+    assert threading.get_ident() not in file.threads
@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 from core.utils.service import BasicService
 from core.models import User
 from core.schemas.get_all import GetAll
+from core.utils.cache_invalidation import publish_invalidation, user_scope
 
 from .schemas import (
     UserResponse, 
@@ -116,6 +117,7 @@ class UserService:
 
     async def delete(self, id: int):
         await self.service.delete(model=User, filters=[User.id == id])
+        await publish_invalidation(self.session, user_scope(id))
         return {"message": "User delete successfully"}
 
     
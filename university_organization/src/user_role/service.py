@@ -8,6 +8,7 @@ from .schemas import UserRoleCreate, UserRoleUpdate
 from core.utils.service import BasicService
 from core.models.user_role_association import UserRole
 from core.models.user import User
+from core.utils.cache_invalidation import publish_invalidation, user_scope
 
 
 class UserRoleService:
@@ -19,7 +20,7 @@ class UserRoleService:
 
     async def create(self, create_data: UserRoleCreate):
         """Create a new UserRole if it does not already exist."""
-        return await self.service.create(
+        created = await self.service.create(
             model=UserRole,
             filters=[
                 UserRole.user_id == create_data.user_id,
@@ -27,6 +28,8 @@ class UserRoleService:
             ],
             create_data=create_data,
         )
+        await publish_invalidation(self.session, user_scope(create_data.user_id))
+        return created
 
     async def get_by_id(self, id: int):
         """Retrieve a UserRole by its ID."""
@@ -83,7 +86,7 @@ class UserRoleService:
 
     async def update(self, id: int, update_data: UserRoleUpdate):
         """Update an existing UserRole by ID."""
-        return await self.service.update(
+        updated = await self.service.update(
             model=UserRole,
             filters=[UserRole.id == id],
             unique_filters=[
@@ -92,10 +95,14 @@ class UserRoleService:
             ],
             update_data=update_data,
         )
+        await publish_invalidation(self.session)
+        return updated
 
     async def delete(self, id: int):
         """Delete a UserRole by ID."""
-        return await self.service.delete(
+        deleted = await self.service.delete(
             model=UserRole,
             filters=[UserRole.id == id],
         )
+        await publish_invalidation(self.session)
+        return deleted
@@ -67,4 +67,5 @@ class TokenPaylod(BaseModel):
     group_id: int | None = None
     username: str | None = None
     role: str | None = None
-    permissions: list[str] = Field(default_factory=list)
+    # Bit i set <=> the user holds the permission with id i, see auth/utils/permission_registry.py
+    permission_mask: int = 0
@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import time
+from typing import Iterable
+
+from sqlalchemy import select
+
+from auth.schemas.auth import TokenPaylod
+from core.config import settings
+from core.database.db_helper import db_helper
+from core.models.permission import Permission
+from core.models.role import Role
+from core.models.role_permission_association import RolePermission
+from core.utils.cache_invalidation import SCOPE_ALL, subscribe
+from auth.utils.permission_registry import permission_registry
+
+log = logging.getLogger(__name__)
+
+# A token whose digest disagrees with the cache reloads it at most this often
+MISMATCH_RELOAD_AFTER = 5
+
+
+def permissions_digest(permissions: Iterable[str]) -> str:
+    """Must match permissions_digest() of the organization service that issues tokens."""
+    joined = "\n".join(sorted(set(permissions)))
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+
+class RolePermissionCache:
+    """
+    Short-TTL cache of role name -> permission names.
+
+    Tokens carry a digest of the user's permission set, which acts as its
+    version: when the cached roles do not add up to the token's digest they
+    are reloaded, so a permission change is picked up on the first request
+    made with a token issued after the change.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, frozenset[str]]] = {}
+
+    async def _load(self, roles: list[str]) -> None:
+        stmt = (
+            select(Role.name, Permission.name)
+            .join(RolePermission, RolePermission.role_id == Role.id)
+            .join(Permission, Permission.id == RolePermission.permission_id)
+            .where(Role.name.in_(roles))
+        )
+        async with db_helper.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+
+        loaded_at = time.monotonic()
+        by_role: dict[str, set[str]] = {role: set() for role in roles}
+        for role, permission in rows:
+            by_role[role].add(permission)
+        for role, names in by_role.items():
+            self._entries[role] = (loaded_at, frozenset(names))
+
+    def _cached(self, role: str) -> frozenset[str] | None:
+        entry = self._entries.get(role)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def _union(self, roles: list[str]) -> frozenset[str]:
+        return frozenset().union(*(self._cached(role) or () for role in roles))
+
+    def _age(self, roles: list[str]) -> float:
+        return time.monotonic() - min(self._entries[role][0] for role in roles)
+
+    async def resolve(self, roles: list[str], expected_digest: str | None = None) -> frozenset[str]:
+        """Union of the permissions of `roles`."""
+        if any(self._cached(role) is None for role in roles):
+            await self._load(roles)
+        elif (
+            expected_digest is not None
+            and permissions_digest(self._union(roles)) != expected_digest
+            and self._age(roles) > MISMATCH_RELOAD_AFTER
+        ):
+            await self._load(roles)
+
+        permissions = self._union(roles)
+        if expected_digest is not None and permissions_digest(permissions) != expected_digest:
+            # Token predates the latest change (or vice versa); the database wins
+            log.debug(f"Permission digest mismatch for roles={roles}, using database state")
+        return permissions
+
+    def invalidate(self, role: str | None = None) -> None:
+        if role is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(role, None)
+
+
+role_permission_cache = RolePermissionCache(ttl=settings.auth.permission_cache_ttl)
+subscribe(lambda scope: role_permission_cache.invalidate() if scope == SCOPE_ALL else None)
+
+
+async def principal_from_claims(payload: dict) -> TokenPaylod | None:
+    """
+    Build the principal from verified token claims alone.
+
+    Returns None when the token does not carry enough claims (tokens issued
+    before claims were added, or a student token without group_id); the
+    caller then falls back to the database lookup.
+    """
+    user_id = payload.get("user_id")
+    username = payload.get("username")
+    roles = payload.get("role")
+    if isinstance(roles, str):
+        roles = [roles]
+    if not user_id or not username or not roles:
+        return None
+
+    role = roles[0]
+    group_id = payload.get("group_id")
+    if role == "student" and group_id is None:
+        return None
+
+    permissions = await role_permission_cache.resolve(roles, expected_digest=payload.get("perms"))
+    return TokenPaylod(
+        valid=True,
+        user_id=user_id,
+        group_id=group_id,
+        username=username,
+        role=role,
+        permission_mask=permission_registry.mask(permissions),
+    )
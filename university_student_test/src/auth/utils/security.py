@@ -15,6 +15,9 @@ from core.database.db_helper import db_helper
 from core.models.user import User
 from core.models.role import Role
 from core.models.student import Student
+from auth.utils.claims import principal_from_claims
+from auth.utils.principal_cache import principal_cache
+from auth.utils.permission_registry import mask_of, permission_registry
 
 oauth2_scheme = APIKeyHeader(name="Authorization")
 
@@ -49,6 +52,11 @@ async def validate_token_subscriber(token: str) -> TokenPaylod:
     except InvalidTokenError:
         return TokenPaylod(valid=False)
 
+    if settings.auth.mode == "claims":
+        principal = await principal_from_claims(payload)
+        if principal is not None:
+            return principal
+
     async with db_helper.session_factory() as session:
         user: User | None = await get_user(session, username=username)
         group = None
@@ -68,15 +76,28 @@ async def validate_token_subscriber(token: str) -> TokenPaylod:
         group_id=group.group_id if group else None,
         username=user.username,
         role=user.roles[0].name if user.roles else None,
-        permissions=[p.name for r in user.roles for p in r.permissions],
+        permission_mask=mask_of(p.id for r in user.roles for p in r.permissions),
     )
 
+def _token_exp(token: str) -> float | None:
+    """`exp` of an already validated token."""
+    return jwt.decode(token, options={"verify_signature": False}).get("exp")
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> TokenPaylod:
-    payload = await validate_token_subscriber(token)
-
-    if not payload:
+    if not settings.cache.principal_enabled:
+        payload = await validate_token_subscriber(token)
+    else:
+        key = principal_cache.key(token)
+        payload = principal_cache.get(key)
+        if payload is None:
+            payload = await validate_token_subscriber(token)
+            if payload.valid:
+                principal_cache.put(key, payload, token_exp=_token_exp(token))
+
+    if not payload.valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
@@ -87,22 +108,17 @@ def require_permission(*permissions: str, any_of: bool = True) -> Callable:
     """
     Dependency to protect routes by required permissions.
 
+    The required permissions are compiled to a mask once, here, so the check
+    itself is a single AND against the principal's mask.
     """
+    required = permission_registry.compile(permissions)
+
     async def checker(user: TokenPaylod = Depends(get_current_user)) -> TokenPaylod:
-        user_perms = set(user.permissions or [])
-
-        if any_of:
-            if not any(p in user_perms for p in permissions):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Permission denied",
-                )
-        else:
-            if not all(p in user_perms for p in permissions):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Permission denied",
-                )
+        if not required.allows(user.permission_mask, any_of=any_of):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permission denied",
+            )
 
         return user
 
@@ -0,0 +1,133 @@
+"""
+Best attempt per student: nested GROUP BY + selectinload against DISTINCT ON.
+
+    python -m benchmarks.best_attempts --students 10000 --quizzes 20 --attempts 5 --runs 10
+
+Seeds students x quizzes x attempts results (1M by default) in a
+transaction that is rolled back at the end, then times
+ResultService.get_by_field for one quiz and for all quizzes against the
+query it replaced. Both run on the current schema, where
+ix_results_quiz_id_student_id_grade_id also serves the old quiz_id filter.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.orm import selectinload
+
+from benchmarks.fixtures import run_tag, seed_quiz, seed_students, summary, timed
+from core.models.results import Result
+from core.models.user import User
+from result.service import ResultService
+
+
+async def nested_group_by(session, quiz_id: int | None) -> list:
+    """get_by_field before the DISTINCT ON rewrite."""
+    sub_max_grade = select(Result.student_id, func.max(Result.grade).label("max_grade"))
+    if quiz_id:
+        sub_max_grade = sub_max_grade.where(Result.quiz_id == quiz_id)
+    sub_max_grade = sub_max_grade.group_by(Result.student_id).subquery()
+
+    sub_latest_id = select(func.max(Result.id).label("latest_id")).join(
+        sub_max_grade,
+        and_(
+            Result.student_id == sub_max_grade.c.student_id,
+            Result.grade == sub_max_grade.c.max_grade,
+        ),
+    )
+    if quiz_id:
+        sub_latest_id = sub_latest_id.where(Result.quiz_id == quiz_id)
+    sub_latest_id = sub_latest_id.group_by(Result.student_id).subquery()
+
+    stmt = (
+        select(Result)
+        .where(Result.id.in_(select(sub_latest_id.c.latest_id)))
+        .options(
+            selectinload(Result.student).selectinload(User.student),
+            selectinload(Result.group),
+            selectinload(Result.subject),
+            selectinload(Result.quiz),
+        )
+        .order_by(Result.grade.desc(), Result.created_at.desc())
+    )
+    results = (await session.execute(stmt)).unique().scalars().all()
+    # The old endpoint returned ORM objects; drop them so runs stay independent
+    session.expunge_all()
+    return results
+
+
+async def seed_results(session, students: int, quizzes: int, attempts: int) -> list[int]:
+    tag = run_tag()
+    ids = await seed_quiz(session, tag)
+    student_ids = await seed_students(session, tag, ids["group_id"], students)
+
+    quiz_ids = [ids["quiz_id"]]
+    for number in range(1, quizzes):
+        quiz_ids.append((await seed_quiz(session, f"{tag}-{number}"))["quiz_id"])
+
+    await session.execute(
+        text(
+            """
+            WITH attempts AS (
+                SELECT student_id, quiz_id, attempt, (random() * 25)::int AS correct
+                FROM unnest(CAST(:student_ids AS int[])) AS student_id,
+                     unnest(CAST(:quiz_ids AS int[])) AS quiz_id,
+                     generate_series(1, :attempts) AS attempt
+            )
+            INSERT INTO results (student_id, teacher_id, group_id, subject_id, quiz_id,
+                                 correct_answers, incorrect_answers, grade, created_at)
+            SELECT student_id, :teacher_id, :group_id, :subject_id, quiz_id,
+                   correct, 25 - correct,
+                   CASE WHEN correct >= 22 THEN 5 WHEN correct >= 18 THEN 4 WHEN correct >= 14 THEN 3 ELSE 2 END,
+                   now() - attempt * interval '1 hour'
+            FROM attempts
+            """
+        ),
+        {
+            "teacher_id": ids["teacher_id"],
+            "group_id": ids["group_id"],
+            "subject_id": ids["subject_id"],
+            "student_ids": student_ids,
+            "quiz_ids": quiz_ids,
+            "attempts": attempts,
+        },
+    )
+    await session.execute(text("ANALYZE users, students, results"))
+    return quiz_ids
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.database.db_helper import db_helper
+
+    try:
+        async with db_helper.session_factory() as session:
+            try:
+                quiz_ids = await seed_results(session, args.students, args.quizzes, args.attempts)
+                total = args.students * args.quizzes * args.attempts
+                print(f"{total} results, {args.students} students, {args.quizzes} quizzes")
+
+                service = ResultService(session)
+                for label, quiz_id, runs in (("one quiz", quiz_ids[0], args.runs), ("all quizzes", None, args.all_runs)):
+                    old = await timed(lambda: nested_group_by(session, quiz_id), runs)
+                    new = await timed(lambda: service.get_by_field(quiz_id=quiz_id), runs)
+                    print(f"{label:>12}  nested GROUP BY: {summary(old)}")
+                    print(f"{label:>12}  DISTINCT ON:     {summary(new)}")
+            finally:
+                await session.rollback()
+    finally:
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark best-attempt ranking of results")
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--quizzes", type=int, default=20)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=10, help="Runs of the one-quiz query")
+    parser.add_argument("--all-runs", type=int, default=3, help="Runs of the all-quizzes query")
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Shared fixtures of the benchmark scripts.
+
+Read benchmarks seed their rows inside one transaction and roll it back,
+so nothing they create survives a run; ANALYZE inside the transaction
+counts the uncommitted rows, so the planner sees realistic statistics.
+Write benchmarks commit their fixtures and remove them with drop_seeded().
+"""
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def run_tag() -> str:
+    """Unique prefix of the usernames and names created by one run."""
+    return f"bench-{uuid.uuid4().hex[:8]}"
+
+
+async def seed_quiz(session: AsyncSession, tag: str, questions: int = 0, question_number: int = 25) -> dict[str, int]:
+    """Teacher, faculty, group, subject and an active quiz, plus `questions` linked questions with dense ordinals."""
+    teacher_id = (await session.execute(
+        text("INSERT INTO users (username, password) VALUES (:username, 'x') RETURNING id"),
+        {"username": f"{tag}-teacher"},
+    )).scalar_one()
+    faculty_id = (await session.execute(
+        text("INSERT INTO facultys (name) VALUES (:name) RETURNING id"), {"name": tag},
+    )).scalar_one()
+    group_id = (await session.execute(
+        text("INSERT INTO groups (faculty_id, name) VALUES (:faculty_id, :name) RETURNING id"),
+        {"faculty_id": faculty_id, "name": tag},
+    )).scalar_one()
+    subject_id = (await session.execute(
+        text("INSERT INTO subjects (name) VALUES (:name) RETURNING id"), {"name": tag},
+    )).scalar_one()
+    quiz_id = (await session.execute(
+        text(
+            """
+            INSERT INTO quizzes (user_id, group_id, subject_id, quiz_name, question_number,
+                                 quiz_time, start_time, quiz_pin, is_activate)
+            VALUES (:user_id, :group_id, :subject_id, :name, :question_number, 60, now(), :pin, true)
+            RETURNING id
+            """
+        ),
+        {
+            "user_id": teacher_id,
+            "group_id": group_id,
+            "subject_id": subject_id,
+            "name": tag,
+            "question_number": question_number,
+            "pin": tag,
+        },
+    )).scalar_one()
+
+    if questions:
+        await session.execute(
+            text(
+                """
+                WITH created AS (
+                    INSERT INTO questions (subject_id, user_id, text, option_a, option_b, option_c, option_d)
+                    SELECT :subject_id, :user_id, 'Question ' || n, 'right ' || n, 'b ' || n, 'c ' || n, 'd ' || n
+                    FROM generate_series(1, :questions) AS n
+                    RETURNING id
+                )
+                INSERT INTO question_quiz (question_id, quiz_id, ordinal)
+                SELECT id, :quiz_id, row_number() OVER (ORDER BY id) FROM created
+                """
+            ),
+            {"subject_id": subject_id, "user_id": teacher_id, "quiz_id": quiz_id, "questions": questions},
+        )
+
+    return {
+        "teacher_id": teacher_id,
+        "faculty_id": faculty_id,
+        "group_id": group_id,
+        "subject_id": subject_id,
+        "quiz_id": quiz_id,
+    }
+
+
+async def seed_students(session: AsyncSession, tag: str, group_id: int, count: int) -> list[int]:
+    """`count` student users of a group; returns their user ids."""
+    user_ids = (await session.execute(
+        text(
+            """
+            INSERT INTO users (username, password)
+            SELECT :tag || '-' || n, 'x' FROM generate_series(1, :count) AS n
+            RETURNING id
+            """
+        ),
+        {"tag": tag, "count": count},
+    )).scalars().all()
+    await session.execute(
+        text(
+            """
+            INSERT INTO students (
+                user_id, group_id, first_name, last_name, third_name, full_name,
+                student_id_number, image_path, birth_date, phone, gender, university,
+                specialty, student_status, education_form, education_type, payment_form,
+                education_lang, level, semester, address, avg_gpa
+            )
+            SELECT id, :group_id, 'First' || id, 'Last' || id, 'Third' || id, 'Full name ' || id,
+                   'SID' || id, '', DATE '2004-01-01', '', 'Erkak', 'NSUMT',
+                   'Specialty', 'Studying', 'Full-time', 'Bachelor', 'Contract',
+                   'Uzbek', '2', '3', '', 4.0
+            FROM users WHERE id = ANY(:user_ids)
+            """
+        ),
+        {"group_id": group_id, "user_ids": list(user_ids)},
+    )
+    return list(user_ids)
+
+
+async def drop_seeded(session: AsyncSession, tag: str) -> None:
+    """Delete everything seeded under `tag`; quizzes, questions and results go with their users."""
+    await session.execute(text("DELETE FROM users WHERE username LIKE :tag || '%'"), {"tag": tag})
+    await session.execute(text("DELETE FROM subjects WHERE name LIKE :tag || '%'"), {"tag": tag})
+    await session.execute(text("DELETE FROM facultys WHERE name LIKE :tag || '%'"), {"tag": tag})
+    await session.commit()
+
+
+async def timed(call: Callable[[], Awaitable], runs: int) -> list[float]:
+    """Wall time of `runs` sequential calls, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    median = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {median:8.2f} ms   p95 {p95:8.2f} ms"
@@ -0,0 +1,80 @@
+"""
+Question sampling: ORDER BY random() against dense-ordinal sampling.
+
+    python -m benchmarks.question_sampler --sizes 1000 10000 100000 -k 25 --runs 50
+
+For every bank size a quiz with that many linked questions is seeded in a
+transaction that is rolled back at the end. `--holes` unlinks that share
+of the questions without closing the gaps, to time the exact fill that
+sparse ordinals fall back to.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import func, select, text
+
+from benchmarks.fixtures import run_tag, seed_quiz, summary, timed
+from core.models.question_quiz import QuestionQuiz
+from core.models.questions import Question
+from core.utils.question_sampler import get_max_ordinal, sample_quiz_questions
+
+
+async def order_by_random(session, quiz_id: int, k: int) -> list:
+    """The query start_quiz ran before ordinal sampling."""
+    stmt = (
+        select(Question)
+        .join(QuestionQuiz, QuestionQuiz.question_id == Question.id)
+        .where(QuestionQuiz.quiz_id == quiz_id)
+        .order_by(func.random())
+        .limit(k)
+    )
+    return (await session.execute(stmt)).scalars().all()
+
+
+async def bench_size(session, size: int, k: int, runs: int, holes: float) -> None:
+    ids = await seed_quiz(session, run_tag(), questions=size, question_number=k)
+    quiz_id = ids["quiz_id"]
+    if holes:
+        await session.execute(
+            text("DELETE FROM question_quiz WHERE quiz_id = :quiz_id AND random() < :holes"),
+            {"quiz_id": quiz_id, "holes": holes},
+        )
+    await session.execute(text("ANALYZE questions, question_quiz"))
+    max_ordinal = await get_max_ordinal(session, quiz_id)
+
+    async def sample():
+        questions = await sample_quiz_questions(session, quiz_id, k, max_ordinal)
+        assert len({q.id for q in questions}) == len(questions) == k
+
+    baseline = await timed(lambda: order_by_random(session, quiz_id, k), runs)
+    ordinal = await timed(sample, runs)
+    print(f"{size:>8} questions  ORDER BY random(): {summary(baseline)}")
+    print(f"{size:>8} questions  ordinal sampling:  {summary(ordinal)}")
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.database.db_helper import db_helper
+
+    try:
+        async with db_helper.session_factory() as session:
+            try:
+                for size in args.sizes:
+                    await bench_size(session, size, args.k, args.runs, args.holes)
+            finally:
+                await session.rollback()
+    finally:
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark quiz question sampling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("-k", type=int, default=25, help="Questions per quiz start")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--holes", type=float, default=0.0, help="Share of links removed without closing gaps")
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Quiz submission throughput: the two-commit pipeline against save_submission.
+
+    python -m benchmarks.submissions --questions 25 --concurrency 1 10 50 --submissions 2000
+
+Each worker has its own session and submits graded answers for seeded
+students, as end_quiz does behind the HTTP layer. The old pipeline
+(answers INSERT + COMMIT, SELECT quiz, INSERT result + COMMIT + refresh)
+is timed against QuizProcessService.end_quiz with the write-behind queue
+off. Fixtures are committed under a unique tag and deleted afterwards.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import insert, select, text
+
+from benchmarks.fixtures import drop_seeded, run_tag, seed_quiz, seed_students, summary
+from core.models import Quiz, Result
+from core.models.user_answer import UserAnswer
+from core.utils.basic_service import BasicService
+from core.utils.quiz_cache import answer_key_cache, load_answer_key
+from quiz_process.schemas import QuizProcessBase, QuizSubmission, ResultCreate
+from quiz_process.service import QuizProcessService
+
+
+async def two_commit_submission(session, submission: QuizSubmission, student_id: int) -> None:
+    """end_quiz before the single-transaction pipeline."""
+    await session.execute(insert(UserAnswer).values([
+        {"quiz_id": submission.quiz_id, "user_id": student_id, "question_id": q.id, "options": q.option}
+        for q in submission.questions
+    ]))
+    await session.commit()
+
+    quiz = (await session.execute(select(Quiz).where(Quiz.id == submission.quiz_id))).scalars().first()
+    answer_key = await answer_key_cache.get(submission.quiz_id, lambda quiz_id: load_answer_key(session, quiz_id))
+    correct = sum(bool(answer_key.is_correct(q.id, q.option)) for q in submission.questions)
+    await BasicService(session).create(
+        model=Result,
+        obj_items=ResultCreate(
+            student_id=student_id,
+            teacher_id=quiz.user_id,
+            subject_id=quiz.subject_id,
+            group_id=quiz.group_id,
+            quiz_id=submission.quiz_id,
+            grade=5 if correct * 100 >= 86 * quiz.question_number else 2,
+            correct_answers=correct,
+            incorrect_answers=len(submission.questions) - correct,
+        ),
+    )
+
+
+async def end_quiz_submission(session, submission: QuizSubmission, student_id: int) -> None:
+    await QuizProcessService(session).end_quiz(submission=submission, student_id=student_id)
+
+
+async def run(session_factory, submit, submissions: list[tuple[QuizSubmission, int]], concurrency: int):
+    latencies: list[float] = []
+    pending = iter(submissions)
+
+    async def worker():
+        async with session_factory() as session:
+            for submission, student_id in pending:
+                started = time.perf_counter()
+                await submit(session, submission, student_id)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(submissions) / (time.perf_counter() - started), latencies
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.database.db_helper import db_helper
+
+    tag = run_tag()
+    try:
+        async with db_helper.session_factory() as session:
+            ids = await seed_quiz(session, tag, questions=args.questions, question_number=args.questions)
+            student_ids = await seed_students(session, tag, ids["group_id"], args.students)
+            rows = (await session.execute(
+                text("SELECT question_id FROM question_quiz WHERE quiz_id = :quiz_id"), {"quiz_id": ids["quiz_id"]}
+            )).scalars().all()
+            await session.commit()
+
+        def submissions() -> list[tuple[QuizSubmission, int]]:
+            return [
+                (
+                    QuizSubmission(
+                        quiz_id=ids["quiz_id"],
+                        questions=[
+                            QuizProcessBase(id=question_id, option=random.choice((f"right {n}", f"b {n}")))
+                            for n, question_id in enumerate(rows, start=1)
+                        ],
+                    ),
+                    random.choice(student_ids),
+                )
+                for _ in range(args.submissions)
+            ]
+
+        for concurrency in args.concurrency:
+            for label, submit in (("two commits", two_commit_submission), ("one transaction", end_quiz_submission)):
+                rate, latencies = await run(db_helper.session_factory, submit, submissions(), concurrency)
+                print(f"concurrency {concurrency:>3}  {label:<15} {rate:8.1f} submissions/s   {summary(latencies)}")
+
+        # Both pipelines must have stored every submission in full
+        async with db_helper.session_factory() as session:
+            answers, results = (await session.execute(
+                text(
+                    "SELECT (SELECT count(*) FROM user_answers WHERE quiz_id = :quiz_id),"
+                    " (SELECT count(*) FROM results WHERE quiz_id = :quiz_id)"
+                ),
+                {"quiz_id": ids["quiz_id"]},
+            )).one()
+        expected = 2 * len(args.concurrency) * args.submissions
+        if (answers, results) != (expected * args.questions, expected):
+            raise RuntimeError(f"Stored {answers} answers and {results} results, expected {expected} submissions")
+    finally:
+        async with db_helper.session_factory() as session:
+            await drop_seeded(session, tag)
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark quiz submissions per second")
+    parser.add_argument("--questions", type=int, default=25, help="Answers per submission")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--submissions", type=int, default=2000, help="Submissions per measurement")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -56,7 +56,41 @@ class DatabaseConfig(BaseModel):
 
 class OrganizationUrls(BaseModel):
     permissions: str
-    
+
+
+class CacheConfig(BaseModel):
+    # Per-worker cache of quiz metadata + question pool used by /quiz_process/start
+    quiz_pool_ttl: int = 300
+    quiz_pool_max_size: int = 512
+    quiz_pool_max_questions: int = 5000
+    # Per-worker answer keys used to grade /quiz_process/end
+    answer_key_ttl: int = 1800
+    # A submission naming a question the key lacks reloads it at most this often
+    answer_key_refresh_after: int = 5
+    # Validated principals keyed by token hash, see auth/utils/principal_cache.py
+    principal_enabled: bool = True
+    principal_ttl: int = 60
+    principal_max_size: int = 10_000
+    # total=cached list counts, see core/utils/totals.py
+    total_ttl: int = 30
+    total_max_size: int = 1024
+
+
+class AuthConfig(BaseModel):
+    # "database": load user, roles and permissions on every request
+    # "claims": trust the verified token claims and resolve permissions from a short-TTL cache
+    mode: Literal["database", "claims"] = "database"
+    permission_cache_ttl: int = 60
+
+
+class WriteBehindConfig(BaseModel):
+    # Opt-in: /quiz_process/end returns right after the result is stored and
+    # user_answers rows are inserted in batches by a background task
+    enabled: bool = False
+    batch_size: int = 1000
+    flush_interval: float = 0.5
+    max_queue_size: int = 100_000
+
 
 class AppSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -69,6 +103,9 @@ class AppSettings(BaseSettings):
     gunicorn: GunicornConfig = GunicornConfig()
     logging: LoggingConfig = LoggingConfig()
     server: ServerConfig = ServerConfig()
+    auth: AuthConfig = AuthConfig()
+    cache: CacheConfig = CacheConfig()
+    write_behind: WriteBehindConfig = WriteBehindConfig()
     db: DatabaseConfig
     jwt: JwtConfig
     file_url: FileUrl
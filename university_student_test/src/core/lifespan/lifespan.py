@@ -4,6 +4,10 @@ from fastapi import FastAPI
 from core.lifespan.permissions_sync import sync_permissions
 
 from core.database.db_helper import db_helper
+from core.utils.write_behind import user_answer_writer
+from core.utils.cache_invalidation import invalidation_listener
+from auth.utils.permission_registry import permission_registry
+from core.config import settings
 from core.config import LOG_DEFAULT_FORMAT
 import logging
 import os
@@ -26,9 +30,17 @@ async def lifespan(app: FastAPI):
         print(f"Created main folder: {UPLOAD_DIR}")
     
     await sync_permissions(app)
+    await permission_registry.refresh()
+    
+    if settings.write_behind.enabled:
+        await user_answer_writer.start()
+
+    await invalidation_listener.start()
 
     yield
     
     
     logging.info("🛑 Lifespan shutdown...")
+    await invalidation_listener.stop()
+    await user_answer_writer.stop()
     await db_helper.dispose()
@@ -19,6 +19,8 @@ __all__ = [
     "Question",
     "QuestionQuiz",
     "Result",
+    "LatestResult",
+    "ResultRollup",
     "UserAnswer"
 ]
 
@@ -49,5 +51,7 @@ from .quiz import Quiz
 from .questions import Question
 from .question_quiz import QuestionQuiz
 from .results import Result
+from .latest_result import LatestResult
+from .result_rollup import ResultRollup
 
 from .user_answer import UserAnswer
@@ -5,7 +5,7 @@ from sqlalchemy.orm import relationship
 
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 
 from typing import TYPE_CHECKING
 
@@ -18,11 +18,16 @@ if TYPE_CHECKING:
 
 class Question(Base, IntIdPkMixin):
     __tablename__ = "questions"
+    __table_args__ = (
+        # A teacher's question bank, optionally narrowed to one subject
+        Index("ix_questions_user_id_subject_id", "user_id", "subject_id"),
+    )
     
     
     subject_id: Mapped[int | None] = mapped_column(
         ForeignKey("subjects.id", ondelete="CASCADE"), 
-        nullable=True
+        nullable=True,
+        index=True
     )
     
     user_id: Mapped[int | None] = mapped_column(
@@ -1,11 +1,12 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, ForeignKey, text
+from sqlalchemy import String, Integer, ForeignKey, Text, text
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
+from .mixins.searchable import SearchableMixin
 
 if TYPE_CHECKING:
     from .results import Result
@@ -17,18 +18,21 @@ if TYPE_CHECKING:
 
 
 
-class Quiz(Base, IntIdPkMixin):
+class Quiz(Base, IntIdPkMixin, SearchableMixin):
     __tablename__ = "quizzes"
+    __searchable__ = ("search_document",)
     
     # --- Foreign Keys ---
     user_id: Mapped[int | None] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=True
+        nullable=True,
+        index=True
     )
 
     group_id: Mapped[int | None] = mapped_column(
         ForeignKey("groups.id", ondelete="SET NULL"),
-        nullable=True
+        nullable=True,
+        index=True
     )
 
     subject_id: Mapped[int | None] = mapped_column(
@@ -44,6 +48,9 @@ class Quiz(Base, IntIdPkMixin):
     quiz_pin: Mapped[str] = mapped_column(String(100), nullable=False)
     is_activate: Mapped[bool] = mapped_column( nullable=False, server_default=text("false")  # sets DB default for new rows and migration
 )
+    # Lowercased quiz name, teacher names, group and subject name; maintained by
+    # database triggers (migration c5a8e2f4d913), never written by the application
+    search_document: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
 
 
     # --- Relationships ---
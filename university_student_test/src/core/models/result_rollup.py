@@ -0,0 +1,44 @@
+from datetime import date
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+
+from .base import Base
+from .mixins.int_id_pk import IntIdPkMixin
+
+# Grades end_quiz hands out; one histogram column each
+GRADES = (2, 3, 4, 5)
+
+
+class ResultRollup(Base, IntIdPkMixin):
+    """
+    Results pre-aggregated per (quiz, group, subject, teacher, day).
+
+    Inserts are added next to the `results` row (core/utils/result_rollups.py);
+    deletes, including cascades, are subtracted by a trigger on `results`
+    (migration b8d2f6a0c4e9). Statistics are sums over these rows.
+    """
+
+    __tablename__ = "result_rollups"
+    __table_args__ = (
+        UniqueConstraint("quiz_id", "group_id", "subject_id", "teacher_id", "day"),
+        Index("ix_result_rollups_group_id_day", "group_id", "day"),
+        Index("ix_result_rollups_teacher_id_day", "teacher_id", "day"),
+    )
+
+    # --- Foreign Keys ---
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("quizzes.id", ondelete="CASCADE"))
+    group_id: Mapped[int] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"))
+    subject_id: Mapped[int] = mapped_column(ForeignKey("subjects.id", ondelete="CASCADE"))
+    teacher_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+
+    # --- Columns ---
+    day: Mapped[date] = mapped_column(nullable=False)
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    grade_sum: Mapped[float] = mapped_column(nullable=False, default=0)
+    grade_2: Mapped[int] = mapped_column(nullable=False, default=0)
+    grade_3: Mapped[int] = mapped_column(nullable=False, default=0)
+    grade_4: Mapped[int] = mapped_column(nullable=False, default=0)
+    grade_5: Mapped[int] = mapped_column(nullable=False, default=0)
+    correct_sum: Mapped[int] = mapped_column(nullable=False, default=0)
+    incorrect_sum: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -6,17 +6,19 @@ from typing import TYPE_CHECKING
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
 from .mixins.user_fk_id import UserFkId
+from .mixins.searchable import SearchableMixin
 
 if TYPE_CHECKING:
     from .group import Group
 
 
 
-class Student(Base, IntIdPkMixin, UserFkId):
+class Student(Base, IntIdPkMixin, UserFkId, SearchableMixin):
     
     _user_back_populates = "student"
+    __searchable__ = ("first_name", "last_name", "third_name", "student_id_number")
     
-    group_id: Mapped[int] = mapped_column(ForeignKey("groups.id" , ondelete="CASCADE"))
+    group_id: Mapped[int] = mapped_column(ForeignKey("groups.id" , ondelete="CASCADE"), index=True)
 
 
     first_name: Mapped[str]
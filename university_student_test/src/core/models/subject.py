@@ -5,6 +5,7 @@ from sqlalchemy.orm import relationship
 
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
+from .mixins.searchable import SearchableMixin
 
 from typing import TYPE_CHECKING
 
@@ -14,7 +15,8 @@ if TYPE_CHECKING:
     from .quiz import Quiz
 
 
-class Subject(Base, IntIdPkMixin):
+class Subject(Base, IntIdPkMixin, SearchableMixin):
+    __searchable__ = ("name",)
     
     name: Mapped[str] = mapped_column(String(250), nullable=False)
     
@@ -1,6 +1,7 @@
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
 from .mixins.user_fk_id import UserFkId
+from .mixins.searchable import SearchableMixin
 from sqlalchemy.orm import Mapped , mapped_column , relationship
 from sqlalchemy import ForeignKey
 from typing import TYPE_CHECKING
@@ -10,9 +11,10 @@ if TYPE_CHECKING:
     from .group_teacher import GroupTeacher
     from .subject_teacher_association import SubjectTeacher
 
-class Teacher(Base, IntIdPkMixin, UserFkId):
+class Teacher(Base, IntIdPkMixin, UserFkId, SearchableMixin):
     
     _user_back_populates = "teacher"
+    __searchable__ = ("first_name", "last_name", "patronymic")
 
     chair_id: Mapped[int] = mapped_column(ForeignKey("chairs.id" , ondelete="CASCADE"))
     
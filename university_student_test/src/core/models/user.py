@@ -2,6 +2,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import String
 from .mixins.int_id_pk import IntIdPkMixin
 from .base import Base
+from .mixins.searchable import SearchableMixin
 
 from typing import TYPE_CHECKING
 
@@ -17,10 +18,11 @@ if TYPE_CHECKING:
     from .user_answer import UserAnswer
 
 
-class User(Base, IntIdPkMixin):
+class User(Base, IntIdPkMixin, SearchableMixin):
     __tablename__ = "users"
+    __searchable__ = ("username",)
 
-    username: Mapped[str] = mapped_column(nullable=False)
+    username: Mapped[str] = mapped_column(unique=True, nullable=False)
     password: Mapped[str] = mapped_column(nullable=False)
 
 
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 
 from .base import Base
 from .mixins.int_id_pk import IntIdPkMixin
@@ -12,6 +12,9 @@ if TYPE_CHECKING:
     from .role import Role
 
 class UserRole(Base, IntIdPkMixin):
+    __table_args__ = (
+        UniqueConstraint("user_id", "role_id"),
+    )
     
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     role_id: Mapped[int] = mapped_column(ForeignKey("roles.id", ondelete="CASCADE"))
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Plain SQL rather than postgresql.insert().on_conflict_do_update(): the
+# dialect construct is not cacheable, so SQLAlchemy would compile it again
+# on every submitted quiz
+UPSERT_LATEST_RESULT = text(
+    """
+    INSERT INTO latest_results (teacher_id, student_id, result_id, created_at)
+    VALUES (:teacher_id, :student_id, :result_id, :created_at)
+    ON CONFLICT (teacher_id, student_id) DO UPDATE
+    SET result_id = excluded.result_id,
+        created_at = excluded.created_at,
+        updated_at = now()
+    WHERE latest_results.created_at <= excluded.created_at
+    """
+)
+
+
+async def record_latest_result(
+    session: AsyncSession,
+    result_id: int,
+    teacher_id: int,
+    student_id: int,
+    created_at: datetime,
+) -> None:
+    """
+    Point the (teacher, student) row of `latest_results` at a new result.
+
+    Runs in the caller's transaction, right after the `results` insert; the
+    WHERE keeps a concurrently committed newer attempt from being overwritten.
+    """
+    await session.execute(
+        UPSERT_LATEST_RESULT,
+        {
+            "teacher_id": teacher_id,
+            "student_id": student_id,
+            "result_id": result_id,
+            "created_at": created_at,
+        },
+    )
@@ -0,0 +1,142 @@
+import logging
+import random
+
+from sqlalchemy import delete, select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models.question_quiz import QuestionQuiz
+from core.models.questions import Question
+from core.utils.quiz_cache import PoolQuestion
+
+log = logging.getLogger(__name__)
+
+MAX_ROUNDS = 8
+
+
+async def get_max_ordinal(session: AsyncSession, quiz_id: int) -> int:
+    """Upper bound of the ordinal range of a quiz (served by the (quiz_id, ordinal) index)."""
+    stmt = select(func.coalesce(func.max(QuestionQuiz.ordinal), 0)).where(
+        QuestionQuiz.quiz_id == quiz_id
+    )
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def unlink_question(session: AsyncSession, question_id: int) -> None:
+    """
+    Remove a question from every quiz, keeping each quiz's ordinals dense:
+    the quiz's last ordinal moves into the freed slot. Runs in the caller's
+    transaction.
+    """
+    freed = (await session.execute(
+        delete(QuestionQuiz)
+        .where(QuestionQuiz.question_id == question_id)
+        .returning(QuestionQuiz.quiz_id, QuestionQuiz.ordinal)
+    )).all()
+
+    for quiz_id, ordinal in freed:
+        last = (
+            select(func.max(QuestionQuiz.ordinal))
+            .where(QuestionQuiz.quiz_id == quiz_id)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(QuestionQuiz)
+            .where(
+                QuestionQuiz.quiz_id == quiz_id,
+                QuestionQuiz.ordinal == last,
+                QuestionQuiz.ordinal > ordinal,
+            )
+            .values(ordinal=ordinal)
+        )
+
+
+def _draw_ordinals(max_ordinal: int, tried: set[int], k: int) -> list[int]:
+    """Draw `k` distinct ordinals from 1..max_ordinal that are not in `tried`."""
+    untried = max_ordinal - len(tried)
+    if untried <= k * 2:
+        remaining = [o for o in range(1, max_ordinal + 1) if o not in tried]
+        return random.sample(remaining, min(k, len(remaining)))
+
+    picks: set[int] = set()
+    while len(picks) < k:
+        ordinal = random.randint(1, max_ordinal)
+        if ordinal not in tried:
+            picks.add(ordinal)
+    return list(picks)
+
+
+async def sample_quiz_questions(
+    session: AsyncSession,
+    quiz_id: int,
+    k: int,
+    max_ordinal: int,
+) -> list[PoolQuestion]:
+    """
+    Pick `k` distinct questions of a quiz uniformly at random.
+
+    Instead of ORDER BY random() over the whole question_quiz join, random
+    ordinals are drawn in Python and fetched through the (quiz_id, ordinal)
+    unique index, so the cost grows with `k`, not with the size of the bank.
+    Ordinals are kept dense by unlink_question(); a miss (e.g. a stale
+    cached max_ordinal) is re-drawn from the ordinals not tried yet, and a
+    shortfall left after MAX_ROUNDS is filled exactly with ORDER BY random()
+    over the untried ordinals, so the sample stays uniform and complete.
+    """
+    if k <= 0 or max_ordinal <= 0:
+        return []
+
+    tried: set[int] = set()
+    questions: list[PoolQuestion] = []
+
+    for _ in range(MAX_ROUNDS):
+        need = k - len(questions)
+        if need <= 0 or len(tried) >= max_ordinal:
+            break
+
+        picks = _draw_ordinals(max_ordinal, tried, need)
+        tried.update(picks)
+
+        rows = (await session.execute(
+            _questions_stmt(quiz_id).where(QuestionQuiz.ordinal.in_(picks))
+        )).all()
+        questions.extend(_pool_question(row) for row in rows)
+    else:
+        need = k - len(questions)
+        if need > 0:
+            log.warning(
+                f"Ordinal sampling for quiz_id={quiz_id} stopped after {MAX_ROUNDS} rounds "
+                f"with {len(questions)}/{k} questions; filling the rest with ORDER BY random()"
+            )
+            rows = (await session.execute(
+                _questions_stmt(quiz_id)
+                .where(QuestionQuiz.ordinal.not_in(tried))
+                .order_by(func.random())
+                .limit(need)
+            )).all()
+            questions.extend(_pool_question(row) for row in rows)
+
+    random.shuffle(questions)
+    return questions[:k]
+
+
+def _questions_stmt(quiz_id: int):
+    return (
+        select(
+            Question.id,
+            Question.text,
+            Question.option_a,
+            Question.option_b,
+            Question.option_c,
+            Question.option_d,
+        )
+        .join(QuestionQuiz, QuestionQuiz.question_id == Question.id)
+        .where(QuestionQuiz.quiz_id == quiz_id)
+    )
+
+
+def _pool_question(row) -> PoolQuestion:
+    return PoolQuestion(
+        id=row.id,
+        text=row.text,
+        options=(row.option_a, row.option_b, row.option_c, row.option_d),
+    )
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Generic, Protocol, TypeVar
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.utils.cache_invalidation import SCOPE_ALL, subscribe
+from core.models.question_quiz import QuestionQuiz
+from core.models.questions import Question
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PoolQuestion:
+    id: int
+    text: str
+    options: tuple[str, str, str, str]
+
+    def to_dict(self, randomize_options: bool = True) -> dict:
+        """Same shape as Question.to_dict()."""
+        options = list(self.options)
+        if randomize_options:
+            random.shuffle(options)
+
+        return {
+            "id": self.id,
+            "text": self.text,
+            "options": options,
+        }
+
+
+@dataclass(slots=True)
+class QuizPool:
+    quiz_id: int
+    user_id: int | None
+    group_id: int | None
+    subject_id: int | None
+    quiz_pin: str
+    is_activate: bool
+    start_time: datetime
+    question_number: int
+    quiz_time: int
+    teacher_first_name: str | None
+    teacher_last_name: str | None
+    group_name: str | None
+    subject_name: str | None
+    # Upper bound of question_quiz.ordinal; `questions` is left empty for pools
+    # larger than quiz_pool_max_questions and sampled in the database instead
+    max_ordinal: int = 0
+    questions: list[PoolQuestion] = field(default_factory=list)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def sample(self, k: int | None = None) -> list[PoolQuestion]:
+        """Pick `k` distinct questions uniformly at random (defaults to question_number)."""
+        k = self.question_number if k is None else k
+        return random.sample(self.questions, min(k, len(self.questions)))
+
+    def has_question(self, question_id: int) -> bool:
+        return any(q.id == question_id for q in self.questions)
+
+
+@dataclass(slots=True)
+class AnswerKey:
+    """question_id -> md5 digest of the correct option (option_a) of one quiz."""
+
+    quiz_id: int
+    keys: dict[int, bytes] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @staticmethod
+    def digest(option: str) -> bytes:
+        return hashlib.md5(option.encode("utf-8")).digest()
+
+    def is_correct(self, question_id: int, option: str) -> bool | None:
+        """None when the question does not belong to the quiz."""
+        key = self.keys.get(question_id)
+        if key is None:
+            return None
+        return key == self.digest(option)
+
+    def has_question(self, question_id: int) -> bool:
+        return question_id in self.keys
+
+
+class QuizCacheEntry(Protocol):
+    quiz_id: int
+    loaded_at: float
+
+    def has_question(self, question_id: int) -> bool: ...
+
+
+EntryType = TypeVar("EntryType", bound=QuizCacheEntry)
+
+
+class QuizCache(Generic[EntryType]):
+    """
+    In-process cache of per-quiz entries keyed by quiz_id.
+
+    Entries expire after `ttl` seconds, so workers that did not see an
+    invalidation (each gunicorn worker has its own cache) converge on their own.
+    Concurrent misses for the same quiz share a single load.
+    """
+
+    def __init__(self, name: str, ttl: int, max_size: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[int, EntryType] = OrderedDict()
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def _get_fresh(self, quiz_id: int) -> EntryType | None:
+        entry = self._entries.get(quiz_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at > self.ttl:
+            self._entries.pop(quiz_id, None)
+            return None
+        self._entries.move_to_end(quiz_id)
+        return entry
+
+    def put(self, entry: EntryType) -> None:
+        self._entries[entry.quiz_id] = entry
+        self._entries.move_to_end(entry.quiz_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self,
+        quiz_id: int,
+        loader: Callable[[int], Awaitable[EntryType | None]],
+    ) -> EntryType | None:
+        entry = self._get_fresh(quiz_id)
+        if entry is not None:
+            return entry
+
+        lock = self._locks.setdefault(quiz_id, asyncio.Lock())
+        async with lock:
+            # Another request may have loaded it while we waited
+            entry = self._get_fresh(quiz_id)
+            if entry is not None:
+                return entry
+
+            entry = await loader(quiz_id)
+            if entry is not None:
+                self.put(entry)
+                log.debug(f"{self.name} loaded: quiz_id={quiz_id}")
+
+        self._locks.pop(quiz_id, None)
+        return entry
+
+    async def refresh(
+        self,
+        quiz_id: int,
+        loader: Callable[[int], Awaitable[EntryType | None]],
+        min_age: float,
+    ) -> EntryType | None:
+        """
+        Reload an entry in place unless it was loaded less than `min_age`
+        seconds ago. The old entry stays visible to other requests meanwhile,
+        and concurrent refreshes of one quiz share a single load.
+        """
+        lock = self._locks.setdefault(quiz_id, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(quiz_id)
+            if entry is not None and time.monotonic() - entry.loaded_at < min_age:
+                return entry
+
+            entry = await loader(quiz_id)
+            if entry is not None:
+                self.put(entry)
+                log.debug(f"{self.name} refreshed: quiz_id={quiz_id}")
+
+        self._locks.pop(quiz_id, None)
+        return entry
+
+    def invalidate(self, quiz_id: int) -> None:
+        if self._entries.pop(quiz_id, None) is not None:
+            log.debug(f"{self.name} invalidated: quiz_id={quiz_id}")
+
+    def invalidate_question(self, question_id: int) -> None:
+        """Drop every cached entry that contains the given question."""
+        stale = [
+            quiz_id
+            for quiz_id, entry in self._entries.items()
+            if entry.has_question(question_id)
+        ]
+        for quiz_id in stale:
+            self.invalidate(quiz_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+quiz_pool_cache: QuizCache[QuizPool] = QuizCache(
+    name="Quiz pool",
+    ttl=settings.cache.quiz_pool_ttl,
+    max_size=settings.cache.quiz_pool_max_size,
+)
+
+answer_key_cache: QuizCache[AnswerKey] = QuizCache(
+    name="Answer key",
+    ttl=settings.cache.answer_key_ttl,
+    max_size=settings.cache.quiz_pool_max_size,
+)
+
+
+def invalidate_quiz(quiz_id: int) -> None:
+    quiz_pool_cache.invalidate(quiz_id)
+    answer_key_cache.invalidate(quiz_id)
+
+
+def invalidate_question(question_id: int) -> None:
+    quiz_pool_cache.invalidate_question(question_id)
+    answer_key_cache.invalidate_question(question_id)
+
+
+def handle_invalidation(scope: str) -> None:
+    """Drop entries named by a "quiz:<id>" / "question:<id>" scope published on the bus."""
+    if scope == SCOPE_ALL:
+        quiz_pool_cache.clear()
+        answer_key_cache.clear()
+        return
+    kind, _, value = scope.partition(":")
+    if kind == "quiz":
+        invalidate_quiz(int(value))
+    elif kind == "question":
+        invalidate_question(int(value))
+
+
+subscribe(handle_invalidation)
+
+
+async def load_answer_key(session: AsyncSession, quiz_id: int) -> AnswerKey:
+    """Build the answer key of a quiz; only ids and 16-byte digests leave the database."""
+    stmt = (
+        select(QuestionQuiz.question_id, func.md5(Question.option_a))
+        .join(Question, Question.id == QuestionQuiz.question_id)
+        .where(QuestionQuiz.quiz_id == quiz_id)
+    )
+    rows = (await session.execute(stmt)).all()
+    return AnswerKey(
+        quiz_id=quiz_id,
+        keys={question_id: bytes.fromhex(md5_hex) for question_id, md5_hex in rows},
+    )
+
+
+def answer_key_from_pool(pool: QuizPool) -> AnswerKey:
+    """Answer key of a fully cached pool, built without a query."""
+    return AnswerKey(
+        quiz_id=pool.quiz_id,
+        keys={q.id: AnswerKey.digest(q.options[0]) for q in pool.questions},
+    )
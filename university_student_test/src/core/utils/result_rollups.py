@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models.result_rollup import GRADES
+
+# Columns that are summed when a rollup row already exists
+ADDITIVE_COLUMNS = (
+    "attempts",
+    "grade_sum",
+    *(f"grade_{grade}" for grade in GRADES),
+    "correct_sum",
+    "incorrect_sum",
+)
+
+# Plain SQL for the same reason as core/utils/latest_results.py: the
+# dialect's on_conflict_do_update() would be compiled on every call
+UPSERT_RESULT_ROLLUP = text(
+    f"""
+    INSERT INTO result_rollups (quiz_id, group_id, subject_id, teacher_id, day, {", ".join(ADDITIVE_COLUMNS)})
+    VALUES (:quiz_id, :group_id, :subject_id, :teacher_id, :day, {", ".join(f":{column}" for column in ADDITIVE_COLUMNS)})
+    ON CONFLICT (quiz_id, group_id, subject_id, teacher_id, day) DO UPDATE
+    SET {", ".join(f"{column} = result_rollups.{column} + excluded.{column}" for column in ADDITIVE_COLUMNS)},
+        updated_at = now()
+    """
+)
+
+
+async def record_result_rollup(
+    session: AsyncSession,
+    quiz_id: int,
+    group_id: int,
+    subject_id: int,
+    teacher_id: int,
+    grade: float,
+    correct_answers: int,
+    incorrect_answers: int,
+    created_at: datetime,
+) -> None:
+    """Add one result to its (quiz, group, subject, teacher, day) rollup, in the caller's transaction."""
+    await session.execute(
+        UPSERT_RESULT_ROLLUP,
+        {
+            "quiz_id": quiz_id,
+            "group_id": group_id,
+            "subject_id": subject_id,
+            "teacher_id": teacher_id,
+            "day": created_at.date(),
+            "attempts": 1,
+            "grade_sum": grade,
+            "correct_sum": correct_answers,
+            "incorrect_sum": incorrect_answers,
+            **{f"grade_{value}": int(grade == value) for value in GRADES},
+        },
+    )
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+# exact: COUNT(*); estimate: planner statistics; cached: COUNT(*) reused for a TTL; none: skipped
+TotalMode = Literal["exact", "estimate", "cached", "none"]
+
+
+class TotalCounter:
+    """Computes the `total` of a paginated list according to a TotalMode."""
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._cache: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+    @staticmethod
+    def fingerprint(stmt: Select) -> str:
+        compiled = stmt.compile()
+        params = json.dumps(compiled.params, sort_keys=True, default=str)
+        return hashlib.sha1(f"{compiled}|{params}".encode("utf-8")).hexdigest()
+
+    async def _exact(self, session: AsyncSession, count_stmt: Select) -> int:
+        return (await session.execute(count_stmt)).scalar() or 0
+
+    async def _cached(self, session: AsyncSession, count_stmt: Select) -> int:
+        key = self.fingerprint(count_stmt)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return entry[1]
+
+        total = await self._exact(session, count_stmt)
+        self._cache[key] = (time.monotonic() + self.ttl, total)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return total
+
+    async def _estimate(self, session: AsyncSession, rows_stmt: Select, table: str | None) -> int | None:
+        if table is not None:
+            # Unfiltered list: the planner's row count of the whole table
+            reltuples = (await session.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": table},
+            )).scalar()
+            # -1: never vacuumed/analyzed, no estimate yet
+            return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+        # Filtered list: the planner's row estimate for the page query without LIMIT/OFFSET.
+        # Compiled with :named parameters so text() binds them; search terms never enter the SQL.
+        compiled = rows_stmt.limit(None).offset(None).compile(
+            dialect=postgresql.dialect(paramstyle="named"),
+            compile_kwargs={"render_postcompile": True},
+        )
+        plan = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"), compiled.params)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def total(
+        self,
+        session: AsyncSession,
+        mode: TotalMode,
+        count_stmt: Select,
+        rows_stmt: Select | None = None,
+        table: str | None = None,
+    ) -> int | None:
+        """
+        `count_stmt` is the exact COUNT query. For "estimate", pass `table`
+        when the list is unfiltered, otherwise `rows_stmt`, the row query the
+        planner is asked about; without either, or when the planner has no
+        answer, the exact count is used.
+        """
+        if mode == "none":
+            return None
+        if mode == "cached":
+            return await self._cached(session, count_stmt)
+        if mode == "estimate" and (table is not None or rows_stmt is not None):
+            try:
+                # A failed EXPLAIN must not abort the caller's transaction
+                async with session.begin_nested():
+                    estimate = await self._estimate(session, rows_stmt, table)
+            except (SQLAlchemyError, KeyError, IndexError, TypeError, ValueError):
+                log.exception("Row estimate failed, falling back to an exact count")
+                estimate = None
+            if estimate is not None:
+                return estimate
+        return await self._exact(session, count_stmt)
+
+
+total_counter = TotalCounter(
+    ttl=settings.cache.total_ttl,
+    max_size=settings.cache.total_max_size,
+)
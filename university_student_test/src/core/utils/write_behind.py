@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from typing import Type
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from core.database.db_helper import db_helper
+from core.models import Base, UserAnswer
+from core.utils.metrics import metrics
+
+log = logging.getLogger(__name__)
+
+FLUSH_RETRIES = 3
+
+
+class WriteBehindQueue:
+    """
+    Buffers rows in an asyncio queue and inserts them in large batches from a
+    background task (executemany through SQLAlchemy's insertmanyvalues).
+
+    `offer()` never blocks: when the writer is not running or the queue is
+    full it returns False and the caller should write the rows inline.
+    """
+
+    def __init__(
+        self,
+        model: Type[Base],
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int,
+        flush_interval: float,
+        max_queue_size: int,
+    ):
+        self.model = model
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue_size)
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+        prefix = f"write_behind.{model.__tablename__}"
+        metrics.gauge(f"{prefix}.queue_depth", self.queue.qsize)
+        self.flush_latency = metrics.histogram(f"{prefix}.flush_latency_ms")
+        self.flushed_rows = metrics.counter(f"{prefix}.flushed_rows")
+        self.failed_rows = metrics.counter(f"{prefix}.failed_rows")
+        self.rejected_rows = metrics.counter(f"{prefix}.rejected_rows")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def has_room(self, count: int) -> bool:
+        """Whether `offer()` of `count` rows would be accepted right now."""
+        return self.running and self.queue.maxsize - self.queue.qsize() >= count
+
+    def offer(self, rows: list[dict]) -> bool:
+        if not self.running:
+            return False
+        if not self.has_room(len(rows)):
+            self.rejected_rows.inc(len(rows))
+            return False
+        for row in rows:
+            self.queue.put_nowait(row)
+        return True
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        log.info(f"Write-behind writer started for {self.model.__tablename__}")
+
+    async def stop(self) -> None:
+        """Stop the background task and flush whatever is still queued."""
+        if self._task is not None:
+            # Let the current flush finish instead of cancelling it mid-batch
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+        while not self.queue.empty():
+            await self._flush(self._take_batch())
+        log.info(f"Write-behind writer for {self.model.__tablename__} drained")
+
+    def _take_batch(self, first: dict | None = None) -> list[dict]:
+        batch = [first] if first is not None else []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                first = await asyncio.wait_for(self.queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                continue
+            # Give concurrent submissions a moment to pile up into one batch
+            if self.queue.qsize() + 1 < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+            await self._flush(self._take_batch(first))
+
+    async def _insert(self, batch: list[dict]) -> None:
+        async with self.session_factory() as session:
+            await session.execute(insert(self.model), batch)
+            await session.commit()
+
+    async def _flush(self, batch: list[dict]) -> None:
+        """
+        Insert a batch, retrying transient failures. A batch rejected by the
+        data itself (e.g. an FK violation after a question was deleted) is
+        bisected, so only the offending rows are dropped.
+        """
+        if not batch:
+            return
+
+        for attempt in range(1, FLUSH_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                await self._insert(batch)
+            except (IntegrityError, DataError):
+                # Retrying can not help; find the bad rows instead
+                if len(batch) == 1:
+                    self.failed_rows.inc()
+                    log.exception(f"Dropped invalid {self.model.__tablename__} row: {batch[0]}")
+                    return
+                middle = len(batch) // 2
+                await self._flush(batch[:middle])
+                await self._flush(batch[middle:])
+                return
+            except SQLAlchemyError:
+                log.exception(
+                    f"Write-behind flush of {len(batch)} {self.model.__tablename__} rows failed "
+                    f"(attempt {attempt}/{FLUSH_RETRIES})"
+                )
+                await asyncio.sleep(attempt)
+                continue
+
+            self.flush_latency.observe((time.perf_counter() - started) * 1000)
+            self.flushed_rows.inc(len(batch))
+            log.debug(f"Flushed {len(batch)} {self.model.__tablename__} rows")
+            return
+
+        self.failed_rows.inc(len(batch))
+        log.error(f"Dropped {len(batch)} {self.model.__tablename__} rows after {FLUSH_RETRIES} attempts: {batch}")
+
+
+user_answer_writer = WriteBehindQueue(
+    model=UserAnswer,
+    session_factory=db_helper.session_factory,
+    batch_size=settings.write_behind.batch_size,
+    flush_interval=settings.write_behind.flush_interval,
+    max_queue_size=settings.write_behind.max_queue_size,
+)
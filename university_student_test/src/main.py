@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from core.config import settings
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
@@ -6,6 +6,9 @@ from pathlib import Path
 
 from router import router as api_router
 from core.lifespan.lifespan import lifespan
+from core.utils.metrics import metrics
+from auth.schemas.auth import TokenPaylod
+from auth.utils.security import require_permission
 import uvicorn
 
 app = FastAPI(
@@ -24,6 +27,14 @@ app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 app.include_router(api_router)
 
 
+@app.get("/metrics", tags=["Metrics"])
+async def get_metrics(
+    _ : TokenPaylod = Depends(require_permission("read:metrics")),
+):
+    """In-process metrics of this worker."""
+    return metrics.snapshot()
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import APIRouter, Depends, UploadFile, File, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .service import QuestionService, QuestionUpdate, QuestionBase
 from .schemas import QuestionCreate
+from core.utils.totals import TotalMode
 from auth.schemas.auth import TokenPaylod
 from auth.utils.security import require_permission
 from core.database.db_helper import db_helper
@@ -66,6 +67,7 @@ async def get_by_id(
 async def get_all(
     limit: int = 20,
     offset: int = 0,
+    total: TotalMode = Query("exact", description="How `total` is computed: exact, estimate, cached or none"),
     service: QuestionService = Depends(get_question_service),
     current_user: TokenPaylod = Depends(require_permission("read:questions")),
 ):
@@ -74,7 +76,8 @@ async def get_all(
         limit=limit,
         offset=offset,
         user_id=current_user.user_id,
-        is_admin=current_user.role
+        is_admin=current_user.role,
+        total_mode=total,
     )
 
 
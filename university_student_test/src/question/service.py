@@ -5,6 +5,9 @@ from sqlalchemy import insert, select
 from sqlalchemy import func , desc
 from openpyxl import load_workbook
 from core.models.questions import Question
+from core.utils.cache_invalidation import publish_invalidation, question_scope
+from core.utils.question_sampler import unlink_question
+from core.utils.totals import TotalMode, total_counter
 from fastapi import HTTPException, status, UploadFile
 import tempfile
 
@@ -92,7 +95,8 @@ class QuestionService:
         is_admin: str, 
         user_id: int, 
         limit: int = 20, 
-        offset: int = 0
+        offset: int = 0,
+        total_mode: TotalMode = "exact",
     ):
         stmt = select(Question)
         if is_admin != "admin":
@@ -106,8 +110,13 @@ class QuestionService:
             count_stmt = count_stmt.where(Question.user_id == user_id)
 
 
-        total_result = await self.session.execute(count_stmt)
-        total = total_result.scalar_one()
+        total = await total_counter.total(
+            self.session,
+            mode=total_mode,
+            count_stmt=count_stmt,
+            rows_stmt=stmt,
+            table=Question.__tablename__ if is_admin == "admin" else None,
+        )
 
         # Pagination
         stmt = stmt.limit(limit).offset(offset)
@@ -158,6 +167,7 @@ class QuestionService:
 
         await self.session.commit()
         await self.session.refresh(question)
+        await publish_invalidation(self.session, question_scope(question_id))
         return question
 
 
@@ -185,9 +195,11 @@ class QuestionService:
                     detail="You are not allowed to delete this question"
                 )
 
-            # Delete the question
+            # Delete the question; its quiz links go first so ordinals stay dense
+            await unlink_question(self.session, question_id)
             await self.session.delete(question)
             await self.session.commit()
+            await publish_invalidation(self.session, question_scope(question_id))
 
             return {"message": "Deleted successfully"}
         
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Query, Path
 
 from .service import QuizService
+from core.utils.totals import TotalMode
 from .schemas import QuizBase, QuizUpdate
 from auth.schemas.auth import TokenPaylod
 from auth.utils.security import require_permission
@@ -57,6 +58,7 @@ async def get_all(
     limit: int = Query(20, ge=1, le=100),  
     offset: int = Query(0, ge=0),
     search: str | None = Query(None, max_length=100),  
+    total: TotalMode = Query("exact", description="How `total` is computed: exact, estimate, cached or none"),
     service: QuizService = Depends(get_quiz_service),
     current_user: TokenPaylod = Depends(require_permission("read:quiz")),
 ):
@@ -68,6 +70,7 @@ async def get_all(
         offset=offset,
         search=search,  
         group_id=current_user.group_id,
+        total_mode=total,
     )
 
 
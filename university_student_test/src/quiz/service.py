@@ -1,5 +1,5 @@
 from fastapi import HTTPException, status
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy import desc
@@ -8,10 +8,11 @@ from core.models.quiz import Quiz
 from core.models.question_quiz import QuestionQuiz
 from core.models.questions import Question
 from core.models.user import User
-from core.models.teacher import Teacher
-from core.models.group import Group
-from core.models.subject import Subject
 from core.utils.basic_service import BasicService
+from core.utils.totals import TotalMode, total_counter
+from core.utils.search import contains
+from core.utils.quiz_cache import answer_key_cache, load_answer_key
+from core.utils.cache_invalidation import publish_invalidation, quiz_scope
 from .schemas import QuizUpdate, QuizBase
 
 
@@ -125,6 +126,7 @@ class QuizService:
         search: str | None = None,
         offset: int = 0,
         group_id: int | None = None,
+        total_mode: TotalMode = "exact",
     ) -> dict:
         """Retrieve all quizzes with filters and pagination."""
         
@@ -139,23 +141,8 @@ class QuizService:
         # Helper function to apply search filters
         def apply_search_filters(stmt):
             if search:
-                stmt = (
-                    stmt
-                    .join(Quiz.user)
-                    .join(User.teacher)
-                    .join(Quiz.group)
-                    .join(Quiz.subject)
-                    .filter(
-                        or_(
-                            Teacher.first_name.ilike(f"%{search}%"),
-                            Teacher.last_name.ilike(f"%{search}%"),
-                            Teacher.patronymic.ilike(f"%{search}%"),
-                            Group.name.ilike(f"%{search}%"),
-                            Subject.name.ilike(f"%{search}%"),
-                            Quiz.quiz_name.ilike(f"%{search}%")
-                        )
-                    )
-                )
+                # Teacher, group and subject names are folded into search_document
+                stmt = stmt.where(contains(Quiz.search_document, search.lower()))
             return stmt
         
         # Build count query with all filters
@@ -163,10 +150,6 @@ class QuizService:
         count_stmt = apply_base_filters(count_stmt)
         count_stmt = apply_search_filters(count_stmt)
         
-        # Execute count query
-        total_result = await self.session.execute(count_stmt)
-        total = total_result.scalar_one()
-        
         # Build main query
         stmt = (
             select(Quiz)
@@ -181,6 +164,16 @@ class QuizService:
         stmt = apply_base_filters(stmt)
         stmt = apply_search_filters(stmt)
         
+        # Execute count query
+        unfiltered = group_id is None and is_admin == "admin" and not search
+        total = await total_counter.total(
+            self.session,
+            mode=total_mode,
+            count_stmt=count_stmt,
+            rows_stmt=stmt,
+            table=Quiz.__tablename__ if unfiltered else None,
+        )
+        
         # Apply ordering and pagination
         stmt = stmt.order_by(desc(Quiz.id)).limit(limit).offset(offset)
         
@@ -227,11 +220,13 @@ class QuizService:
         """Update quiz details."""
         await self.get_quiz_by_id(quiz_id, user_id, is_admin)
         filters = [Quiz.id == quiz_id]
-        return await self.basic_service.update(
+        updated = await self.basic_service.update(
             model=Quiz,
             filters=filters,
             update_data=quiz_data
         )
+        await publish_invalidation(self.session, quiz_scope(quiz_id))
+        return updated
 
     async def delete_quiz(
         self,
@@ -242,7 +237,9 @@ class QuizService:
         """Delete a quiz."""
         await self.get_quiz_by_id(quiz_id, user_id, is_admin)
         filters = [Quiz.id == quiz_id]
-        return await self.basic_service.delete(model=Quiz, filters=filters)
+        deleted = await self.basic_service.delete(model=Quiz, filters=filters)
+        await publish_invalidation(self.session, quiz_scope(quiz_id))
+        return deleted
 
     async def create_quiz_questions(self, quiz_id: int, user_id: int, subject_id: int, limit: int):
             """Attach limited number of unique questions to the quiz."""
@@ -264,10 +261,12 @@ class QuizService:
             questions = questions[:limit]
 
             # fetch already existing links
-            stmt_existing = select(QuestionQuiz.question_id).where(
+            stmt_existing = select(QuestionQuiz.question_id, QuestionQuiz.ordinal).where(
                 QuestionQuiz.quiz_id == quiz_id
             )
-            existing_ids = set((await self.session.execute(stmt_existing)).scalars().all())
+            existing = (await self.session.execute(stmt_existing)).all()
+            existing_ids = {row.question_id for row in existing}
+            last_ordinal = max((row.ordinal for row in existing), default=0)
 
             # filter new questions
             new_questions = [q for q in questions if q.id not in existing_ids]
@@ -276,9 +275,10 @@ class QuizService:
                 return {"created_links": 0}
 
             # create new QuestionQuiz entries
+            # ordinals stay dense (1..N) per quiz for random sampling
             new_links = [
-                QuestionQuiz(quiz_id=quiz_id, question_id=q.id)
-                for q in new_questions
+                QuestionQuiz(quiz_id=quiz_id, question_id=q.id, ordinal=last_ordinal + idx)
+                for idx, q in enumerate(new_questions, start=1)
             ]
 
             self.session.add_all(new_links)
@@ -304,5 +304,12 @@ class QuizService:
 
         # Commit the changes
         await self.session.commit()
+        await publish_invalidation(self.session, quiz_scope(quiz_id))
+
+        # Warm the answer key so the first submissions grade from memory
+        if active:
+            await answer_key_cache.get(
+                quiz_id, lambda qid: load_answer_key(self.session, qid)
+            )
 
         return quiz_data
@@ -39,7 +39,8 @@ async def start_quiz(
     return await service.start_quiz(
         quiz_id=quiz_id,
         quiz_pin=quiz_pin,
-        user_id=current_user.user_id,
+        role=current_user.role,
+        user_group_id=current_user.group_id,
         group_id=group_id,
     )
 
@@ -1,18 +1,34 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select , func
+from sqlalchemy import select
 from fastapi import HTTPException, status
 from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import SQLAlchemyError
 
-from .schemas import ResultCreate , QuizSubmission, UserAnswerCreate
+from .schemas import ResultCreate , QuizSubmission
 from core.models.user import User
 from core.models.user_answer import UserAnswer
 from core.models.question_quiz import QuestionQuiz
 
 from core.utils.basic_service import BasicService
+from core.utils.quiz_cache import (
+    quiz_pool_cache,
+    answer_key_cache,
+    load_answer_key,
+    answer_key_from_pool,
+    QuizPool,
+    PoolQuestion,
+    AnswerKey,
+)
+from core.utils.write_behind import user_answer_writer
+from core.utils.latest_results import record_latest_result
+from core.utils.result_rollups import record_result_rollup
+from core.utils.question_sampler import sample_quiz_questions, get_max_ordinal
+from core.config import settings
 from core.models import Quiz , Question , Result
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
-from sqlalchemy import insert
+from sqlalchemy import insert, func, literal, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from core.logging import logging
 
@@ -29,101 +45,141 @@ class QuizProcessService:
         self,
         quiz_id: int,
         quiz_pin: str,
-        user_id: int,
+        role: str | None,
+        user_group_id: int | None,
         group_id: int | None = None
     ) -> dict:
-        # Fetch student + roles
-        student_stmt = (
-            select(User)
-            .where(User.id == user_id)
-            .options(
-                selectinload(User.student),
-                selectinload(User.roles)
-            )
-        )
-        student = (await self.session.execute(student_stmt)).scalars().first()
-        if not student or not student.roles:
+        # Determine group (role and group come from the validated token)
+        if not role:
             raise HTTPException(status_code=403, detail="User information or roles missing.")
-        
-        # Determine group
-        role_name = student.roles[0].name
-        if role_name == "admin":
+        if role == "admin":
             if not group_id:
                 raise HTTPException(status_code=400, detail="Group ID required for admin.")
             target_group_id = group_id
         else:
-            if not student.student:
+            if not user_group_id:
                 raise HTTPException(status_code=403, detail="User is not a student.")
-            target_group_id = student.student.group_id
+            target_group_id = user_group_id
         
-        # Fetch quiz
-        quiz_stmt = (
-            select(Quiz)
-            .where(
-                Quiz.id == quiz_id,
-                Quiz.quiz_pin == quiz_pin,
-                Quiz.group_id == target_group_id
-            )
-            .options(
-                selectinload(Quiz.user).selectinload(User.teacher),
-                selectinload(Quiz.group),
-                selectinload(Quiz.subject)
-            )
-        )
-        quiz = (await self.session.execute(quiz_stmt)).scalars().first()
-        if not quiz:
+        # Fetch quiz pool (served from memory once warm)
+        pool = await quiz_pool_cache.get(quiz_id, self._load_quiz_pool)
+        if not pool or pool.quiz_pin != quiz_pin or pool.group_id != target_group_id:
             raise HTTPException(status_code=404, detail="Quiz not found or inaccessible.")
-        if not quiz.is_activate:
+        if not pool.is_activate:
             raise HTTPException(status_code=405, detail="Test is not active.")
         
         # Time validation
         tz = ZoneInfo("Asia/Tashkent")
         now = datetime.now(tz)
-        start_time = quiz.start_time.replace(tzinfo=tz)
+        start_time = pool.start_time.replace(tzinfo=tz)
         if now < start_time:
             raise HTTPException(status_code=403, detail="Test has not started yet.")
         
-        # ================================
-        # FIXED: Fetch questions through QuestionQuiz junction table
-        # ================================
-        stmt_questions = (
-            select(Question)
-            .join(QuestionQuiz, QuestionQuiz.question_id == Question.id)
-            .where(QuestionQuiz.quiz_id == quiz.id)
-            .order_by(func.random())
-            .limit(quiz.question_number)
-        )
-        questions = (await self.session.execute(stmt_questions)).scalars().all()
-        
+        if pool.questions:
+            questions = pool.sample()
+        else:
+            questions = await sample_quiz_questions(
+                session=self.session,
+                quiz_id=pool.quiz_id,
+                k=pool.question_number,
+                max_ordinal=pool.max_ordinal,
+            )
         if not questions:
             raise HTTPException(status_code=404, detail="No questions for this quiz.")
         
-        teacher = getattr(quiz.user, "teacher", None)
+        # Make sure the answer key is ready before submissions arrive
+        await answer_key_cache.get(
+            pool.quiz_id,
+            lambda quiz_id: self._load_answer_key(quiz_id, pool),
+        )
+        
         return {
-            "user_id": quiz.user_id,
-            "teacher_first_name": getattr(teacher, "first_name", None),
-            "teacher_last_name": getattr(teacher, "last_name", None),
-            "group_id": quiz.group.id if quiz.group else None,
-            "group_name": quiz.group.name if quiz.group else None,
-            "subject_id": quiz.subject.id if quiz.subject else None,
-            "subject_name": quiz.subject.name if quiz.subject else None,
-            "duration": quiz.quiz_time,
+            "user_id": pool.user_id,
+            "teacher_first_name": pool.teacher_first_name,
+            "teacher_last_name": pool.teacher_last_name,
+            "group_id": pool.group_id,
+            "group_name": pool.group_name,
+            "subject_id": pool.subject_id,
+            "subject_name": pool.subject_name,
+            "duration": pool.quiz_time,
             "questions": [q.to_dict(randomize_options=True) for q in questions]
         }
 
 
+    async def _load_answer_key(self, quiz_id: int, pool: QuizPool) -> AnswerKey:
+        """Build the key from the cached pool when it holds every question."""
+        if pool.questions:
+            return answer_key_from_pool(pool)
+        return await load_answer_key(self.session, quiz_id)
+
+
+    async def _load_quiz_pool(self, quiz_id: int) -> QuizPool | None:
+        """Load quiz metadata and its full question list for the pool cache."""
+        quiz_stmt = (
+            select(Quiz)
+            .where(Quiz.id == quiz_id)
+            .options(
+                selectinload(Quiz.user).selectinload(User.teacher),
+                selectinload(Quiz.group),
+                selectinload(Quiz.subject)
+            )
+        )
+        quiz = (await self.session.execute(quiz_stmt)).scalars().first()
+        if not quiz:
+            return None
+        
+        max_ordinal = await get_max_ordinal(self.session, quiz.id)
+        
+        # Very large banks are not held in memory; start_quiz samples them by ordinal
+        rows = []
+        if max_ordinal <= settings.cache.quiz_pool_max_questions:
+            stmt_questions = (
+                select(
+                    Question.id,
+                    Question.text,
+                    Question.option_a,
+                    Question.option_b,
+                    Question.option_c,
+                    Question.option_d,
+                )
+                .join(QuestionQuiz, QuestionQuiz.question_id == Question.id)
+                .where(QuestionQuiz.quiz_id == quiz.id)
+            )
+            rows = (await self.session.execute(stmt_questions)).all()
+        
+        teacher = getattr(quiz.user, "teacher", None)
+        return QuizPool(
+            quiz_id=quiz.id,
+            user_id=quiz.user_id,
+            group_id=quiz.group_id,
+            subject_id=quiz.subject_id,
+            quiz_pin=quiz.quiz_pin,
+            is_activate=quiz.is_activate,
+            start_time=quiz.start_time,
+            question_number=quiz.question_number,
+            quiz_time=quiz.quiz_time,
+            teacher_first_name=getattr(teacher, "first_name", None),
+            teacher_last_name=getattr(teacher, "last_name", None),
+            group_name=quiz.group.name if quiz.group else None,
+            subject_name=quiz.subject.name if quiz.subject else None,
+            max_ordinal=max_ordinal,
+            questions=[
+                PoolQuestion(
+                    id=row.id,
+                    text=row.text,
+                    options=(row.option_a, row.option_b, row.option_c, row.option_d),
+                )
+                for row in rows
+            ],
+        )
 
     
 
     async def end_quiz(self, submission: QuizSubmission, student_id: int):
         """Process quiz submission, calculate score, and save result."""
 
-        await self.save_user_answers(submission = submission, user_id = student_id)
-
-        # Fetch quiz
-        quiz_stmt = select(Quiz).where(Quiz.id == submission.quiz_id)
-        quiz_result = await self.session.execute(quiz_stmt)
-        quiz_data = quiz_result.scalars().first()
+        # Quiz metadata comes from the pool cache (no query once warm)
+        quiz_data = await quiz_pool_cache.get(submission.quiz_id, self._load_quiz_pool)
 
         if not quiz_data:
             raise HTTPException(
@@ -132,23 +188,31 @@ class QuizProcessService:
             )
             
         
-        # Fetch all submitted questions
-        submitted_ids = [q.id for q in submission.questions]
-        stmt = select(Question).where(Question.id.in_(submitted_ids))
-        result = await self.session.execute(stmt)
-        question_records = {q.id: q for q in result.scalars().all()}
-        
-        
-        
+        # Grade against the cached answer key (no Question rows are fetched)
+        answer_key = await answer_key_cache.get(
+            submission.quiz_id,
+            lambda quiz_id: load_answer_key(self.session, quiz_id),
+        )
+
+        # A question missing from the key may have been attached after it was
+        # cached (possibly on another worker). Reload it, but at most once per
+        # answer_key_refresh_after seconds, so made-up ids can not turn every
+        # submission into a query; ids still missing are graded as not in the quiz
+        if not all(answer_key.has_question(q.id) for q in submission.questions):
+            answer_key = await answer_key_cache.refresh(
+                submission.quiz_id,
+                lambda quiz_id: load_answer_key(self.session, quiz_id),
+                min_age=settings.cache.answer_key_refresh_after,
+            ) or answer_key
 
         correct_count = 0
         incorrect_count = 0
 
         for q in submission.questions:
-            question = question_records.get(q.id)
-            if not question:
+            is_correct = answer_key.is_correct(q.id, q.option)
+            if is_correct is None:
                 continue
-            if q.option == question.option_a:
+            if is_correct:
                 correct_count += 1
             else:
                 incorrect_count += 1
@@ -178,8 +242,19 @@ class QuizProcessService:
             incorrect_answers=incorrect_count
         )
 
-        # Save to DB
-        await self.service.create(model=Result, obj_items=result_data)
+        # Save answers + result in a single transaction, or hand the answers
+        # to the write-behind queue when it is enabled and has room. They are
+        # only queued once the result is committed, so a failed submission
+        # never leaves queued answers behind.
+        answer_rows = self._answer_rows(submission=submission, user_id=student_id)
+        queue_answers = bool(answer_rows) and user_answer_writer.has_room(len(answer_rows))
+        await self.save_submission(
+            result_data=result_data,
+            answer_rows=[] if queue_answers else answer_rows,
+        )
+        if queue_answers and not user_answer_writer.offer(answer_rows):
+            # The queue filled up or stopped meanwhile
+            await self.save_answers(answer_rows)
 
         logger.info(
             f"QUIZ_PROCESS_END | "
@@ -208,9 +283,8 @@ class QuizProcessService:
         
         
 
-    async def save_user_answers(self, submission: QuizSubmission, user_id: int):
-        
-        stmt = insert(UserAnswer).values([
+    def _answer_rows(self, submission: QuizSubmission, user_id: int) -> list[dict]:
+        return [
             {
                 "quiz_id": submission.quiz_id,
                 "user_id": user_id,
@@ -218,7 +292,86 @@ class QuizProcessService:
                 "options": q.option
             }
             for q in submission.questions
-        ])
-        
-        await self.session.execute(stmt)
-        await self.session.commit()
+        ]
+
+
+    async def save_answers(self, answer_rows: list[dict]) -> None:
+        """Write answers of an already saved result inline."""
+        try:
+            await self.session.execute(insert(UserAnswer), answer_rows)
+            await self.session.commit()
+        except SQLAlchemyError:
+            logger.exception(f"Failed to save {len(answer_rows)} answers inline")
+            await self.session.rollback()
+            raise
+
+    async def save_submission(
+        self,
+        result_data: ResultCreate,
+        answer_rows: list[dict],
+    ) -> int:
+        """
+        Write the user's answers and the result in one statement and one commit.
+
+        The answers go in through a data-modifying CTE attached to the
+        `INSERT INTO results ... RETURNING id`, so nothing is re-read afterwards.
+        The student's `latest_results` row and the result's rollup are upserted
+        in the same transaction.
+        """
+        stmt = (
+            insert(Result)
+            .values(**result_data.model_dump())
+            .returning(Result.id, Result.created_at)
+        )
+
+        if answer_rows:
+            # unnest() of two array parameters instead of a multi-row VALUES:
+            # the statement has the same shape for any number of answers, so
+            # SQLAlchemy compiles it once and reuses it from its cache
+            answers = func.unnest(
+                literal([row["question_id"] for row in answer_rows], ARRAY(Integer)),
+                literal([row["options"] for row in answer_rows], ARRAY(String)),
+            ).table_valued("question_id", "options").render_derived(name="answers")
+            answers_cte = (
+                insert(UserAnswer)
+                .from_select(
+                    ["quiz_id", "user_id", "question_id", "options"],
+                    select(
+                        literal(result_data.quiz_id),
+                        literal(result_data.student_id),
+                        answers.c.question_id,
+                        answers.c.options,
+                    ),
+                )
+                .returning(UserAnswer.id)
+                .cte("inserted_answers")
+            )
+            stmt = stmt.add_cte(answers_cte)
+
+        try:
+            result_id, created_at = (await self.session.execute(stmt)).one()
+            await record_latest_result(
+                self.session,
+                result_id=result_id,
+                teacher_id=result_data.teacher_id,
+                student_id=result_data.student_id,
+                created_at=created_at,
+            )
+            await record_result_rollup(
+                self.session,
+                quiz_id=result_data.quiz_id,
+                group_id=result_data.group_id,
+                subject_id=result_data.subject_id,
+                teacher_id=result_data.teacher_id,
+                grade=result_data.grade,
+                correct_answers=result_data.correct_answers,
+                incorrect_answers=result_data.incorrect_answers,
+                created_at=created_at,
+            )
+            await self.session.commit()
+        except SQLAlchemyError:
+            logger.exception(f"Failed to save submission for quiz_id={result_data.quiz_id}")
+            await self.session.rollback()
+            raise
+
+        return result_id
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.database.db_helper import db_helper
 
 from auth.schemas.auth import TokenPaylod
 from auth.utils.security import require_permission
 from .service import ResultService
+from core.utils.totals import TotalMode
 
 router = APIRouter(
     tags=["Result"],
@@ -19,10 +21,32 @@ def get_service(session: AsyncSession = Depends(db_helper.session_getter)) -> Re
 @router.get("/user_answers/{user_id}")
 async def user_answers(
     user_id: int,
+    quiz_id: int | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    after: str | None = Query(None, description="`next_cursor` of the previous page"),
+    stream: bool = Query(False, description="Return every answer as NDJSON instead of one page"),
     service: ResultService = Depends(get_service),
     _ : TokenPaylod = Depends(require_permission("read:result")),
 ):
-    return await service.get_users_answers(user_id=user_id)
+    if stream:
+        return StreamingResponse(
+            _stream_users_answers(user_id=user_id, quiz_id=quiz_id),
+            media_type="application/x-ndjson",
+        )
+    return await service.get_users_answers(
+        user_id=user_id,
+        quiz_id=quiz_id,
+        limit=limit,
+        after=after,
+    )
+
+
+async def _stream_users_answers(user_id: int, quiz_id: int | None):
+    # The request's session is closed before a streamed body is sent, so the
+    # stream holds its own for as long as it runs
+    async with db_helper.session_factory() as session:
+        async for chunk in ResultService(session=session).stream_users_answers(user_id=user_id, quiz_id=quiz_id):
+            yield chunk
 
 @router.get("/get/{result_id}")
 async def get_by_id(
@@ -68,6 +92,7 @@ async def get_by_username(
 async def get_all(
     limit: int = 20,
     offset: int = 0,
+    total: TotalMode = Query("exact", description="How `total` is computed: exact, estimate, cached or none"),
     service: ResultService = Depends(get_service),
     current_user: TokenPaylod = Depends(require_permission("read:result")),
 ):
@@ -77,6 +102,7 @@ async def get_all(
         is_admin=current_user.role,
         limit=limit,
         offset=offset,
+        total_mode=total,
     )
 
 
@@ -0,0 +1,74 @@
+"""
+Column projection of results for the listing endpoints.
+
+Only the columns a result item shows are selected, through explicit outer
+joins, and rows are serialized straight from the returned tuples: no
+`Result`, `User` or 25-column `Student` objects enter the identity map.
+"""
+from sqlalchemy import Row, Select, select
+
+from core.models.group import Group
+from core.models.quiz import Quiz
+from core.models.results import Result
+from core.models.student import Student
+from core.models.subject import Subject
+
+RESULT_ITEM_COLUMNS = (
+    Result.id,
+    Result.grade,
+    Result.correct_answers,
+    Result.incorrect_answers,
+    Result.created_at,
+    Result.teacher_id,
+    Result.student_id,
+    Student.first_name,
+    Student.last_name,
+    Student.third_name,
+    Result.group_id,
+    Group.name.label("group_name"),
+    Result.subject_id,
+    Subject.name.label("subject_name"),
+    Result.quiz_id,
+    Quiz.quiz_name,
+)
+
+
+def select_result_items() -> Select:
+    """SELECT of RESULT_ITEM_COLUMNS from `results`; callers add filters, ordering and paging."""
+    return (
+        select(*RESULT_ITEM_COLUMNS)
+        .select_from(Result)
+        .outerjoin(Student, Student.user_id == Result.student_id)
+        .outerjoin(Group, Group.id == Result.group_id)
+        .outerjoin(Subject, Subject.id == Result.subject_id)
+        .outerjoin(Quiz, Quiz.id == Result.quiz_id)
+    )
+
+
+def result_item(row: Row) -> dict:
+    """JSON-ready item of a row selected by select_result_items()."""
+    return {
+        "id": row.id,
+        "grade": row.grade,
+        "correct": row.correct_answers,
+        "incorrect": row.incorrect_answers,
+        "created_at": row.created_at.isoformat(),
+        "student": {
+            "id": row.student_id,
+            "first_name": row.first_name,
+            "last_name": row.last_name,
+            "third_name": row.third_name,
+        },
+        "group": {
+            "id": row.group_id,
+            "name": row.group_name,
+        } if row.group_name is not None else None,
+        "subject": {
+            "id": row.subject_id,
+            "name": row.subject_name,
+        } if row.subject_name is not None else None,
+        "quiz": {
+            "id": row.quiz_id,
+            "name": row.quiz_name,
+        } if row.quiz_name is not None else None,
+    }
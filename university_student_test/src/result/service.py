@@ -1,47 +1,107 @@
-from typing import Optional
+import json
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException, status
-from sqlalchemy import select, and_
+from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.models.results import Result
+from core.models.latest_result import LatestResult
+from core.utils.totals import TotalMode, total_counter
+from core.utils.cursor import encode_cursor, decode_cursor
 from core.models.user_answer import UserAnswer
 from sqlalchemy.orm import selectinload
 from core.models.questions import Question
 from sqlalchemy import func
 
-from core.models.student import Student
 from core.models.user import User
+from .projection import select_result_items, result_item
+
+# Rows fetched per round trip when streaming answers
+STREAM_BATCH_SIZE = 1000
 
 class ResultService:
     def __init__(self, session: AsyncSession):
         self.session = session
         
         
-    async def get_users_answers(self, user_id: int):
+    @staticmethod
+    def _users_answers_stmt(user_id: int, quiz_id: int | None = None):
+        """A student's answers with the question columns, newest first."""
         stmt = (
-            select(UserAnswer)
+            select(
+                UserAnswer.id,
+                UserAnswer.quiz_id,
+                UserAnswer.question_id,
+                UserAnswer.options,
+                Question.text,
+                Question.option_a,
+                Question.option_b,
+                Question.option_c,
+                Question.option_d,
+            )
+            .join(Question, Question.id == UserAnswer.question_id)
             .where(UserAnswer.user_id == user_id)
-            .options(selectinload(UserAnswer.question))
+            .order_by(UserAnswer.id.desc())
         )
+        if quiz_id is not None:
+            stmt = stmt.where(UserAnswer.quiz_id == quiz_id)
+        return stmt
 
-        result = await self.session.execute(stmt)
-        user_answers = result.scalars().all()
+    @staticmethod
+    def _user_answer_item(row) -> dict:
+        return {
+            "id": row.id,
+            "quiz_id": row.quiz_id,
+            "question_id": row.question_id,
+            "question_text": row.text,
+            "correct_answers": row.option_a,
+            "selected_option": row.options,
+            "option_a": row.option_a,
+            "option_b": row.option_b,
+            "option_c": row.option_c,
+            "option_d": row.option_d,
+        }
+
+    async def get_users_answers(
+        self,
+        user_id: int,
+        quiz_id: int | None = None,
+        limit: int = 50,
+        after: str | None = None,
+    ) -> dict:
+        """
+        One page of a student's answers, newest first.
 
-        return [
-            {
-                "question_id": ua.question_id,
-                "question_text": ua.question.text,
-                "correct_answers": ua.question.option_a,  
-                "selected_option": ua.options,
-                "option_a": ua.question.option_a,
-                "option_b": ua.question.option_b,
-                "option_c": ua.question.option_c,
-                "option_d": ua.question.option_d,
-            }
-            for ua in user_answers
-        ]
+        Keyset pagination on the answer id: pass the returned `next_cursor`
+        as `after` to get the next page.
+        """
+        stmt = self._users_answers_stmt(user_id=user_id, quiz_id=quiz_id)
+        if after is not None:
+            stmt = stmt.where(UserAnswer.id < decode_cursor(after))
 
+        # One extra row tells whether another page exists
+        rows = (await self.session.execute(stmt.limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
 
-        
+        return {
+            "data": [self._user_answer_item(row) for row in rows],
+            "next_cursor": encode_cursor(rows[-1].id) if has_more else None,
+        }
+
+    async def stream_users_answers(
+        self,
+        user_id: int,
+        quiz_id: int | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Every answer of a student as NDJSON lines, read through a server-side
+        cursor in batches of STREAM_BATCH_SIZE so memory does not grow with
+        the history.
+        """
+        stmt = self._users_answers_stmt(user_id=user_id, quiz_id=quiz_id)
+        result = await self.session.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield "".join(json.dumps(self._user_answer_item(row)) + "\n" for row in rows)
 
     async def get_by_id(
         self,
@@ -54,63 +114,24 @@ class ResultService:
         Admins can access any result; non-admins only their own.
         """
 
-        # Load result with related entities
-        stmt = (
-            select(Result)
-            .where(Result.id == id)
-            .options(
-                selectinload(Result.student).selectinload(User.student),
-                selectinload(Result.group),
-                selectinload(Result.subject),
-                selectinload(Result.quiz),
-            )
-        )
-
-        result = await self.session.execute(stmt)
-        result_obj = result.scalar_one_or_none()
+        row = (await self.session.execute(
+            select_result_items().where(Result.id == id)
+        )).one_or_none()
 
-        if not result_obj:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Result not found"
             )
 
         # Check access permissions for non-admins
-        if is_admin != "admin" and result_obj.teacher_id != user_id:
+        if is_admin != "admin" and row.teacher_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied"
             )
 
-        # Prepare structured response (same style as get_all)
-        student_user = result_obj.student.student if result_obj.student else None
-
-        data = {
-            "id": result_obj.id,
-            "grade": result_obj.grade,
-            "correct": result_obj.correct_answers,
-            "incorrect": result_obj.incorrect_answers,
-            "student": {
-                "id": result_obj.student_id,
-                "first_name": student_user.first_name if student_user else None,
-                "last_name": student_user.last_name if student_user else None,
-                "third_name": student_user.third_name if student_user else None,
-            } if result_obj.student else None,
-            "group": {
-                "id": result_obj.group_id,
-                "name": result_obj.group.name
-            } if result_obj.group else None,
-            "subject": {
-                "id": result_obj.subject_id,
-                "name": result_obj.subject.name
-            } if result_obj.subject else None,
-            "quiz": {
-                "id": result_obj.quiz_id,
-                "name": result_obj.quiz.quiz_name
-            } if result_obj.quiz else None,
-        }
-
-        return data
+        return result_item(row)
 
     
     async def get_by_field(
@@ -120,156 +141,98 @@ class ResultService:
         """
         Get the single highest grade result for each unique student_id.
         If grades are tied, it takes the most recent attempt (highest ID).
+
+        One DISTINCT ON pass ranks the attempts; with a quiz_id it walks
+        ix_results_quiz_id_student_id_grade_id in order. Related names come
+        from joined columns instead of separate selectinload queries.
         """
         
-        # 1. Subquery: Find the highest grade achieved by each student in THIS quiz
-        sub_max_grade = (
-            select(
-                Result.student_id,
-                func.max(Result.grade).label('max_grade')
-            )
-        )
-        if quiz_id:
-            sub_max_grade = sub_max_grade.where(Result.quiz_id == quiz_id)
-        
-        sub_max_grade = sub_max_grade.group_by(Result.student_id).subquery()
-
-        # 2. Subquery: Find the latest Result ID for that specific max grade
-        # This handles the case where a student might have two attempts with the same score
-        sub_latest_id = (
-            select(
-                func.max(Result.id).label('latest_id')
-            )
-            .join(
-                sub_max_grade,
-                and_(
-                    Result.student_id == sub_max_grade.c.student_id,
-                    Result.grade == sub_max_grade.c.max_grade
-                )
-            )
+        # 1. Ranking: first row per student ordered by grade, then id
+        best_attempts = (
+            select(Result.id)
+            .distinct(Result.student_id)
+            .order_by(Result.student_id, Result.grade.desc(), Result.id.desc())
         )
         if quiz_id:
-            sub_latest_id = sub_latest_id.where(Result.quiz_id == quiz_id)
-            
-        sub_latest_id = sub_latest_id.group_by(Result.student_id).subquery()
+            best_attempts = best_attempts.where(Result.quiz_id == quiz_id)
+        best_attempts = best_attempts.subquery()
 
-        # 3. Main Query: Fetch the full records using only the IDs from Step 2
+        # 2. Main Query: the winning rows with the names they are shown with
         stmt = (
-            select(Result)
-            .where(Result.id.in_(select(sub_latest_id.c.latest_id)))
-            .options(
-                selectinload(Result.student).selectinload(User.student),
-                selectinload(Result.group),
-                selectinload(Result.subject),
-                selectinload(Result.quiz),
-            )
+            select_result_items()
+            .join(best_attempts, best_attempts.c.id == Result.id)
             .order_by(Result.grade.desc(), Result.created_at.desc())
         )
 
-        execute_result = await self.session.execute(stmt)
-        results = execute_result.unique().scalars().all()
+        rows = (await self.session.execute(stmt)).all()
 
-        if not results:
+        if not rows:
             raise HTTPException(
                 status_code=404,
                 detail="No results found."
             )
 
-        return results
+        return [result_item(row) for row in rows]
 
     async def get_all(
         self,
         user_id: int,
         is_admin: str | None = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        total_mode: TotalMode = "exact",
     ) -> dict[str, list[dict] | int]:
         """
         Retrieve only the latest (most recent) result per student.
         Admins see all, non-admins only their results.
+
+        Reads the `latest_results` projection: for a teacher an index range
+        over (teacher_id, created_at), for admins the newest row per student.
         """
-        # --- STEP 1: Subquery: get latest created_at per student ---
-        latest_subq = (
-            select(
-                Result.student_id,
-                func.max(Result.created_at).label("latest_created_at")
-            )
-            .group_by(Result.student_id)
-            .subquery()  # ✅ ADD THIS!
-        )
+        stmt = select_result_items()
         
-        # --- STEP 2: Join subquery to main table to get full Result rows ---
-        stmt = (
-            select(Result)
-            .join(
-                latest_subq,
-                (Result.student_id == latest_subq.c.student_id)
-                & (Result.created_at == latest_subq.c.latest_created_at)
+        # --- STEP 1: Select the latest results from the projection ---
+        if is_admin != "admin":
+            # Backward scan of ix_latest_results_teacher_id_created_at, stopped by LIMIT
+            stmt = (
+                stmt
+                .join(LatestResult, LatestResult.result_id == Result.id)
+                .where(LatestResult.teacher_id == user_id)
+                .order_by(LatestResult.created_at.desc())
             )
-            .options(
-                selectinload(Result.student).selectinload(User.student),
-                selectinload(Result.group),
-                selectinload(Result.subject),
-                selectinload(Result.quiz),
+            count_stmt = select(func.count()).select_from(LatestResult).where(LatestResult.teacher_id == user_id)
+        else:
+            # A student may have a latest result with several teachers; keep the newest
+            latest_ids = (
+                select(LatestResult.result_id)
+                .distinct(LatestResult.student_id)
+                .order_by(LatestResult.student_id, LatestResult.created_at.desc(), LatestResult.id.desc())
             )
-            .order_by(Result.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
+            stmt = stmt.where(Result.id.in_(latest_ids)).order_by(Result.created_at.desc())
+            count_stmt = select(func.count(func.distinct(LatestResult.student_id)))
         
-        # --- STEP 3: Filter for non-admin users ---
-        if is_admin != "admin":
-            stmt = stmt.where(Result.teacher_id == user_id)
-        
-        # --- STEP 4: Count how many unique students have results ---
-        count_stmt = select(func.count(func.distinct(Result.student_id)))
-        
-        if is_admin != "admin":
-            count_stmt = count_stmt.where(Result.teacher_id == user_id)
+        rows_stmt = stmt
+        stmt = stmt.limit(limit).offset(offset)
         
-        total_result = await self.session.execute(count_stmt)
-        total = total_result.scalar() or 0
+        # --- STEP 2: Count how many students have a latest result ---
+        total = await total_counter.total(
+            self.session,
+            mode=total_mode,
+            count_stmt=count_stmt,
+            rows_stmt=rows_stmt,
+        )
         
-        # --- STEP 5: Execute main query ---
-        result = await self.session.execute(stmt)
-        results = result.scalars().all()
+        # --- STEP 3: Execute main query ---
+        rows = (await self.session.execute(stmt)).all()
         
-        if not results:
+        if not rows:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No results found"
             )
         
-        # --- STEP 6: Transform into list of dicts ---
-        data = []
-        for r in results:
-            student_user = r.student.student if r.student else None
-            item = {
-                "id": r.id,
-                "grade": r.grade,
-                "correct": r.correct_answers,
-                "incorrect": r.incorrect_answers,
-                "created_at": r.created_at.isoformat(),
-                "student": {
-                    "id": r.student_id,
-                    "first_name": student_user.first_name if student_user else None,
-                    "last_name": student_user.last_name if student_user else None,
-                    "third_name": student_user.third_name if student_user else None,
-                } if r.student else None,
-                "group": {
-                    "id": r.group_id,
-                    "name": r.group.name
-                } if r.group else None,
-                "subject": {
-                    "id": r.subject_id,
-                    "name": r.subject.name
-                } if r.subject else None,
-                "quiz": {
-                    "id": r.quiz_id,
-                    "name": r.quiz.quiz_name
-                } if r.quiz else None,
-            }
-            data.append(item)
+        # --- STEP 4: Serialize the rows ---
+        data = [result_item(row) for row in rows]
         
         return {"total": total, "data": data}
     
@@ -280,9 +243,10 @@ class ResultService:
 
         Admins can delete any result; non-admins only their own.
         """
-        result_obj = await self.get_by_id(id=id, user_id=user_id, is_admin=is_admin)
+        # Existence and access check
+        await self.get_by_id(id=id, user_id=user_id, is_admin=is_admin)
 
-        await self.session.delete(result_obj)
+        await self.session.execute(delete(Result).where(Result.id == id))
         await self.session.commit()
 
         return {"message": "Deleted successfully"}
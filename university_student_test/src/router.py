@@ -3,6 +3,7 @@ from question.api import router as question_router
 from quiz.api import router as quiz_router
 from quiz_process.api import router as quiz_process_router
 from result.api import router as result_router
+from statistics.api import router as statistics_router
 
 router = APIRouter()
 
@@ -12,3 +13,4 @@ router.include_router(question_router)
 router.include_router(quiz_router)
 router.include_router(quiz_process_router)
 router.include_router(result_router)
+router.include_router(statistics_router)
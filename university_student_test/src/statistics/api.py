@@ -1,4 +1,13 @@
-from fastapi import APIRouter
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.schemas.auth import TokenPaylod
+from auth.utils.security import require_permission
+from core.database.db_helper import db_helper
+from .schemas import QuizItemAnalysis, StatisticsResponse
+from .service import StatisticsService
 
 
 router = APIRouter(
@@ -6,14 +15,50 @@ router = APIRouter(
     prefix='/statistics'
 )
 
-@router.get('/faculty/{id}')
-async def faculty_statistics():
-    pass
 
-@router.get('/chair/{id}')
-async def chair_statistics():
-    pass
+def get_service(session: AsyncSession = Depends(db_helper.session_getter)) -> StatisticsService:
+    """Dependency to provide StatisticsService instance."""
+    return StatisticsService(session=session)
+
+
+@router.get('/faculty/{id}', response_model=StatisticsResponse)
+async def faculty_statistics(
+    id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    service: StatisticsService = Depends(get_service),
+    _ : TokenPaylod = Depends(require_permission("read:statistics")),
+):
+    """Grade statistics of a faculty, broken down by group."""
+    return await service.faculty_statistics(id=id, date_from=date_from, date_to=date_to)
+
+@router.get('/chair/{id}', response_model=StatisticsResponse)
+async def chair_statistics(
+    id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    service: StatisticsService = Depends(get_service),
+    _ : TokenPaylod = Depends(require_permission("read:statistics")),
+):
+    """Grade statistics of a chair, broken down by teacher."""
+    return await service.chair_statistics(id=id, date_from=date_from, date_to=date_to)
+
+@router.get('/teacher/{id}', response_model=StatisticsResponse)
+async def teacher_statistics(
+    id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    service: StatisticsService = Depends(get_service),
+    _ : TokenPaylod = Depends(require_permission("read:statistics")),
+):
+    """Grade statistics of a teacher's quizzes, broken down by subject."""
+    return await service.teacher_statistics(id=id, date_from=date_from, date_to=date_to)
 
-@router.get('/teacher/{id}')
-async def teacher_statistics():
-    pass
\ No newline at end of file
+@router.get('/quiz/{id}/items', response_model=QuizItemAnalysis)
+async def quiz_items(
+    id: int,
+    service: StatisticsService = Depends(get_service),
+    _ : TokenPaylod = Depends(require_permission("read:statistics")),
+):
+    """Difficulty, discrimination and distractor use per question, grades per group."""
+    return await service.quiz_items(id=id)
@@ -0,0 +1,158 @@
+"""
+Item analysis of quizzes: difficulty, discrimination and distractor use per question.
+
+    python -m statistics.item_analysis --from 2025-09-01 --to 2026-01-31 -o semester.ndjson
+
+Each student's latest answer to each question is copied out of PostgreSQL
+as integer columns (asyncpg copy_from_query), parsed straight into NumPy
+arrays and analysed with vectorized counting; no ORM objects are built.
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import sys
+from datetime import date, datetime, time
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models.quiz import Quiz
+
+log = logging.getLogger(__name__)
+
+# Share of students in the upper and lower groups of the discrimination index (Kelley)
+DISCRIMINATION_GROUP = 0.27
+
+# Answer codes: option_a is the correct option, anything unmatched is "other"
+CHOICES = ("a", "b", "c", "d", "other")
+
+LATEST_ANSWERS_SQL = """
+    SELECT DISTINCT ON (ua.user_id, ua.question_id)
+        ua.user_id,
+        ua.question_id,
+        CASE ua.options
+            WHEN q.option_a THEN 0
+            WHEN q.option_b THEN 1
+            WHEN q.option_c THEN 2
+            WHEN q.option_d THEN 3
+            ELSE 4
+        END
+    FROM user_answers ua
+    JOIN questions q ON q.id = ua.question_id
+    WHERE ua.quiz_id = $1
+    ORDER BY ua.user_id, ua.question_id, ua.id DESC
+"""
+
+
+async def load_answers(session: AsyncSession, quiz_id: int) -> np.ndarray:
+    """(user_id, question_id, choice) rows of a quiz as an int64 array of shape (n, 3)."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+
+    buffer = io.BytesIO()
+    await raw.driver_connection.copy_from_query(LATEST_ANSWERS_SQL, quiz_id, output=buffer, format="csv")
+    buffer.seek(0)
+    if not buffer.getbuffer().nbytes:
+        return np.empty((0, 3), dtype=np.int64)
+    return np.loadtxt(buffer, delimiter=",", dtype=np.int64, ndmin=2)
+
+
+def analyse_items(answers: np.ndarray) -> dict:
+    """
+    Item statistics of one quiz from its (user_id, question_id, choice) rows.
+
+    difficulty: share of correct answers. discrimination: difficulty in the
+    upper minus the lower DISCRIMINATION_GROUP of students ranked by score.
+    options: share of answers per option, b/c/d being the distractors.
+    """
+    if not len(answers):
+        return {"students": 0, "items": []}
+
+    user_ids, user_index = np.unique(answers[:, 0], return_inverse=True)
+    question_ids, question_index = np.unique(answers[:, 1], return_inverse=True)
+    choice = answers[:, 2]
+    correct = choice == 0
+    students, questions = len(user_ids), len(question_ids)
+
+    answered = np.bincount(question_index, minlength=questions)
+    difficulty = np.bincount(question_index, weights=correct, minlength=questions) / answered
+
+    option_counts = np.bincount(
+        question_index * len(CHOICES) + choice,
+        minlength=questions * len(CHOICES),
+    ).reshape(questions, len(CHOICES))
+    option_share = option_counts / answered[:, None]
+
+    discrimination = np.full(questions, np.nan)
+    group_size = int(round(students * DISCRIMINATION_GROUP))
+    if group_size and students >= 2 * group_size:
+        score = np.bincount(user_index, weights=correct, minlength=students)
+        ranking = np.argsort(score, kind="stable")
+
+        def group_difficulty(members: np.ndarray) -> np.ndarray:
+            in_group = np.zeros(students, dtype=bool)
+            in_group[members] = True
+            rows = in_group[user_index]
+            group_answered = np.bincount(question_index[rows], minlength=questions)
+            group_correct = np.bincount(question_index[rows], weights=correct[rows], minlength=questions)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return group_correct / group_answered
+
+        discrimination = group_difficulty(ranking[-group_size:]) - group_difficulty(ranking[:group_size])
+
+    items = [
+        {
+            "question_id": int(question_id),
+            "answered": int(answered[i]),
+            "difficulty": round(float(difficulty[i]), 4),
+            "discrimination": None if np.isnan(discrimination[i]) else round(float(discrimination[i]), 4),
+            "options": {name: round(float(share), 4) for name, share in zip(CHOICES, option_share[i])},
+        }
+        for i, question_id in enumerate(question_ids)
+    ]
+    return {"students": students, "items": items}
+
+
+async def quiz_item_analysis(session: AsyncSession, quiz_id: int) -> dict:
+    return analyse_items(await load_answers(session, quiz_id))
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.database.db_helper import db_helper
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        async with db_helper.session_factory() as session:
+            stmt = select(Quiz.id).order_by(Quiz.start_time)
+            if args.date_from:
+                stmt = stmt.where(Quiz.start_time >= datetime.combine(args.date_from, time.min))
+            if args.date_to:
+                stmt = stmt.where(Quiz.start_time <= datetime.combine(args.date_to, time.max))
+            quiz_ids = (await session.execute(stmt)).scalars().all()
+
+            for quiz_id in quiz_ids:
+                analysis = await quiz_item_analysis(session, quiz_id)
+                output.write(json.dumps({"quiz_id": quiz_id, **analysis}) + "\n")
+                log.info(f"Item analysis: quiz_id={quiz_id} students={analysis['students']} items={len(analysis['items'])}")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        await db_helper.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Item analysis of every quiz started in a date range")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Last day (YYYY-MM-DD)")
+    parser.add_argument("-o", "--output", help="NDJSON file, one line per quiz (default: stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
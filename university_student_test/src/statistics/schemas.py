@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+
+
+class GradeStatistics(BaseModel):
+    attempts: int = 0
+    average_grade: float | None = None
+    grades: dict[int, int] = {}
+    correct_answers: int = 0
+    incorrect_answers: int = 0
+
+
+class GradeStatisticsItem(GradeStatistics):
+    id: int
+    name: str | None = None
+
+
+class StatisticsResponse(BaseModel):
+    summary: GradeStatistics
+    breakdown: list[GradeStatisticsItem]
+
+
+class ItemStatistics(BaseModel):
+    question_id: int
+    answered: int
+    difficulty: float
+    discrimination: float | None = None
+    options: dict[str, float]
+
+
+class QuizItemAnalysis(BaseModel):
+    quiz_id: int
+    students: int
+    items: list[ItemStatistics]
+    groups: list[GradeStatisticsItem]
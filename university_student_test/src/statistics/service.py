@@ -1,43 +1,172 @@
+from datetime import date
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
+from core.models.chair import Chair
 from core.models.faculty import Faculty
 from core.models.group import Group
-from core.models.student import Student
-from sqlalchemy.orm import selectinload
+from core.models.subject import Subject
+from core.models.teacher import Teacher
+from core.models.quiz import Quiz
+from core.models.result_rollup import GRADES, ResultRollup
+
+from .item_analysis import quiz_item_analysis
+from .schemas import GradeStatistics, GradeStatisticsItem, QuizItemAnalysis, StatisticsResponse
 
 
 class StatisticsService:
+    """
+    Grade statistics summed from the result_rollups table, never from
+    `results`: each answer reads one row per (quiz, group, subject,
+    teacher, day) in scope.
+    """
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def faculty_statistics(self, id: int):
+    async def _exists(self, model, id: int, detail: str) -> None:
+        found = (await self.session.execute(select(model.id).where(model.id == id))).scalar_one_or_none()
+        if found is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=detail
+            )
+
+    async def _breakdown(
+        self,
+        key,
+        name,
+        join_target,
+        join_on,
+        scope,
+        date_from: date | None,
+        date_to: date | None,
+    ) -> StatisticsResponse:
+        """Sum the rollups in `scope` per `key`; the summary is the sum of the breakdown."""
         stmt = (
-            select(Faculty)
-            .where(Faculty.id == id)
-            .options(
-                selectinload(Faculty.groups).selectinload(Group.students)
+            select(
+                key.label("id"),
+                name.label("name"),
+                func.sum(ResultRollup.attempts).label("attempts"),
+                func.sum(ResultRollup.grade_sum).label("grade_sum"),
+                *(func.sum(getattr(ResultRollup, f"grade_{grade}")).label(f"grade_{grade}") for grade in GRADES),
+                func.sum(ResultRollup.correct_sum).label("correct_sum"),
+                func.sum(ResultRollup.incorrect_sum).label("incorrect_sum"),
             )
-        ) 
+            .select_from(ResultRollup)
+            .join(join_target, join_on)
+            .where(scope)
+            .group_by(key, name)
+            .order_by(name)
+        )
+        if date_from is not None:
+            stmt = stmt.where(ResultRollup.day >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(ResultRollup.day <= date_to)
 
-        result = await self.session.execute(stmt)
-        faculty = result.scalar_one_or_none()
+        rows = (await self.session.execute(stmt)).all()
 
-        if not faculty:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Faculty not found"
-            )
+        breakdown = []
+        totals = dict.fromkeys(("attempts", "grade_sum", "correct_sum", "incorrect_sum"), 0)
+        histogram = dict.fromkeys(GRADES, 0)
+        for row in rows:
+            grades = {grade: row._mapping[f"grade_{grade}"] for grade in GRADES}
+            breakdown.append(GradeStatisticsItem(
+                id=row.id,
+                name=row.name,
+                attempts=row.attempts,
+                average_grade=round(row.grade_sum / row.attempts, 2) if row.attempts else None,
+                grades=grades,
+                correct_answers=row.correct_sum,
+                incorrect_answers=row.incorrect_sum,
+            ))
+            for column in totals:
+                totals[column] += row._mapping[column]
+            for grade, count in grades.items():
+                histogram[grade] += count
+
+        summary = GradeStatistics(
+            attempts=totals["attempts"],
+            average_grade=round(totals["grade_sum"] / totals["attempts"], 2) if totals["attempts"] else None,
+            grades=histogram,
+            correct_answers=totals["correct_sum"],
+            incorrect_answers=totals["incorrect_sum"],
+        )
+        return StatisticsResponse(summary=summary, breakdown=breakdown)
 
-        student_ids = []
+    async def faculty_statistics(
+        self,
+        id: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> StatisticsResponse:
+        """Results of the faculty's groups, per group."""
+        await self._exists(Faculty, id, "Faculty not found")
+        return await self._breakdown(
+            key=Group.id,
+            name=Group.name,
+            join_target=Group,
+            join_on=Group.id == ResultRollup.group_id,
+            scope=Group.faculty_id == id,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
-        for group in faculty.groups:
-            for student in group.students:
-                student_ids.append(student.id)
+    async def chair_statistics(
+        self,
+        id: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> StatisticsResponse:
+        """Results of quizzes by the chair's teachers, per teacher."""
+        await self._exists(Chair, id, "Chair not found")
+        return await self._breakdown(
+            key=Teacher.id,
+            name=func.concat_ws(" ", Teacher.last_name, Teacher.first_name, Teacher.patronymic),
+            join_target=Teacher,
+            join_on=Teacher.user_id == ResultRollup.teacher_id,
+            scope=Teacher.chair_id == id,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
+    async def teacher_statistics(
+        self,
+        id: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> StatisticsResponse:
+        """Results of the teacher's quizzes, per subject."""
+        user_id = (await self.session.execute(
+            select(Teacher.user_id).where(Teacher.id == id)
+        )).scalar_one_or_none()
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Teacher not found"
+            )
+        return await self._breakdown(
+            key=Subject.id,
+            name=Subject.name,
+            join_target=Subject,
+            join_on=Subject.id == ResultRollup.subject_id,
+            scope=ResultRollup.teacher_id == user_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
-    async def chair_statistics(self, id: int):
-        pass
-    
-    async def teacher_statistics(self, id: int):
-        pass
\ No newline at end of file
+    async def quiz_items(self, id: int) -> QuizItemAnalysis:
+        """Item analysis of a quiz's questions and its grade distribution per group."""
+        await self._exists(Quiz, id, "Quiz not found")
+        analysis = await quiz_item_analysis(self.session, id)
+        groups = await self._breakdown(
+            key=Group.id,
+            name=Group.name,
+            join_target=Group,
+            join_on=Group.id == ResultRollup.group_id,
+            scope=ResultRollup.quiz_id == id,
+            date_from=None,
+            date_to=None,
+        )
+        return QuizItemAnalysis(quiz_id=id, groups=groups.breakdown, **analysis)
@@ -0,0 +1,11 @@
+import os
+from pathlib import Path
+
+# Settings come from the environment; fall back to the template so the unit
+# tests run without a .env. Nothing here connects to the database.
+ENV_TEMPLATE = Path(__file__).resolve().parents[2] / ".env.template"
+
+for line in ENV_TEMPLATE.read_text(encoding="utf-8").splitlines():
+    key, sep, value = line.partition("=")
+    if sep and not key.startswith("#") and "<" not in value:
+        os.environ.setdefault(key.strip(), value.strip())
@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+
+from statistics.item_analysis import analyse_items
+
+
+def rows(*answers: tuple[int, int, int]) -> np.ndarray:
+    return np.array(answers, dtype=np.int64)
+
+
+def test_empty_quiz():
+    assert analyse_items(np.empty((0, 3), dtype=np.int64)) == {"students": 0, "items": []}
+
+
+def test_difficulty_discrimination_and_option_shares():
+    # (user_id, question_id, choice); choice 0 is correct, 4 is "other"
+    answers = rows(
+        (1, 10, 0), (1, 20, 0),  # score 2: upper group
+        (2, 10, 0), (2, 20, 1),  # score 1
+        (3, 10, 1), (3, 20, 0),  # score 1
+        (4, 10, 4), (4, 20, 2),  # score 0: lower group
+    )
+
+    analysis = analyse_items(answers)
+
+    assert analysis["students"] == 4
+    first, second = analysis["items"]
+    assert first["question_id"] == 10
+    assert first["answered"] == 4
+    assert first["difficulty"] == 0.5
+    # round(4 * 0.27) = 1 student per group: user 1 against user 4
+    assert first["discrimination"] == 1.0
+    assert first["options"] == {"a": 0.5, "b": 0.25, "c": 0.0, "d": 0.0, "other": 0.25}
+
+    assert second["difficulty"] == 0.5
+    assert second["discrimination"] == 1.0
+    assert second["options"] == {"a": 0.5, "b": 0.25, "c": 0.25, "d": 0.0, "other": 0.0}
+
+
+def test_discrimination_uses_only_the_upper_and_lower_groups():
+    # Ten students; groups of round(10 * 0.27) = 3. Question 20 is answered
+    # correctly by the three weakest students only
+    answers = []
+    for user_id in range(1, 11):
+        strong = user_id > 3
+        answers.append((user_id, 10, 0 if strong else 1))
+        answers.append((user_id, 30, 0 if user_id > 5 else 2))
+        answers.append((user_id, 20, 3 if strong else 0))
+
+    items = {item["question_id"]: item for item in analyse_items(rows(*answers))["items"]}
+
+    assert items[10]["difficulty"] == 0.7
+    assert items[10]["discrimination"] == 1.0
+    assert items[20]["difficulty"] == 0.3
+    assert items[20]["discrimination"] == -1.0
+    assert items[30]["discrimination"] == 1.0
+
+
+def test_cohort_too_small_for_discrimination():
+    analysis = analyse_items(rows((1, 10, 0), (1, 20, 1)))
+
+    assert analysis["students"] == 1
+    assert all(item["discrimination"] is None for item in analysis["items"])
+    assert [item["difficulty"] for item in analysis["items"]] == [1.0, 0.0]
+    assert not any(math.isnan(share) for item in analysis["items"] for share in item["options"].values())
@@ -0,0 +1,119 @@
+import random
+from collections import namedtuple
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core.utils import question_sampler
+from core.utils.question_sampler import MAX_ROUNDS, _draw_ordinals, sample_quiz_questions
+
+Row = namedtuple("Row", "id text option_a option_b option_c option_d")
+
+
+class Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """
+    Answers the sampler's two queries from `bank` (ordinal -> question id):
+    `ordinal IN (...)` lookups, and the ORDER BY random() fill that excludes
+    the ordinals already tried.
+    """
+
+    def __init__(self, bank: dict[int, int]):
+        self.bank = bank
+        self.lookups: list[list[int]] = []
+        self.fills: list[tuple[set[int], int]] = []
+
+    @staticmethod
+    def _row(question_id: int) -> Row:
+        return Row(question_id, f"Question {question_id}", "a", "b", "c", "d")
+
+    async def execute(self, stmt):
+        ordinals = [
+            value
+            for value in stmt.compile(dialect=postgresql.dialect()).params.values()
+            if isinstance(value, list)
+        ][0]
+        if stmt._order_by_clauses:
+            excluded = set(ordinals)
+            self.fills.append((excluded, stmt._limit))
+            untried = [q for o, q in self.bank.items() if o not in excluded]
+            return Result([self._row(q) for q in random.sample(untried, min(stmt._limit, len(untried)))])
+
+        self.lookups.append(ordinals)
+        return Result([self._row(self.bank[o]) for o in ordinals if o in self.bank])
+
+
+@pytest.mark.parametrize(
+    "max_ordinal, tried, k",
+    [
+        (10_000, set(range(1, 50)), 25),  # rejection sampling
+        (60, set(range(1, 30, 2)), 25),  # dense remainder: untried <= 2k
+        (40, set(range(1, 40)), 1),  # one ordinal left
+    ],
+)
+def test_draw_ordinals_are_distinct_and_untried(max_ordinal, tried, k):
+    for _ in range(50):
+        picks = _draw_ordinals(max_ordinal, tried, k)
+
+        assert len(picks) == k
+        assert len(set(picks)) == k
+        assert not set(picks) & tried
+        assert all(1 <= ordinal <= max_ordinal for ordinal in picks)
+
+
+def test_draw_ordinals_returns_every_untried_ordinal_when_k_is_larger():
+    tried = {2, 4, 6}
+    picks = _draw_ordinals(8, tried, 10)
+
+    assert sorted(picks) == [1, 3, 5, 7, 8]
+
+
+def test_draw_ordinals_with_everything_tried():
+    assert _draw_ordinals(5, {1, 2, 3, 4, 5}, 3) == []
+
+
+async def test_dense_ordinals_are_sampled_in_one_round():
+    session = FakeSession({ordinal: 100 + ordinal for ordinal in range(1, 1001)})
+
+    questions = await sample_quiz_questions(session, quiz_id=1, k=25, max_ordinal=1000)
+
+    assert len(questions) == 25
+    assert len({q.id for q in questions}) == 25
+    assert len(session.lookups) == 1
+    assert session.fills == []
+
+
+async def test_misses_are_redrawn_from_untried_ordinals():
+    # Ordinals above 50 are gone (a stale, larger cached max_ordinal)
+    session = FakeSession({ordinal: ordinal for ordinal in range(1, 51)})
+
+    questions = await sample_quiz_questions(session, quiz_id=1, k=40, max_ordinal=100)
+
+    assert len({q.id for q in questions}) == 40
+    drawn = [ordinal for lookup in session.lookups for ordinal in lookup]
+    assert len(drawn) == len(set(drawn))
+
+
+async def test_shortfall_after_max_rounds_is_filled_exactly(monkeypatch):
+    session = FakeSession({ordinal: ordinal for ordinal in range(1, 101)})
+    # Every draw lands on ordinals the bank does not have
+    monkeypatch.setattr(
+        question_sampler,
+        "_draw_ordinals",
+        lambda max_ordinal, tried, k: [1000 + len(tried) + n for n in range(k)],
+    )
+
+    questions = await sample_quiz_questions(session, quiz_id=1, k=10, max_ordinal=10_000)
+
+    assert len(session.lookups) == MAX_ROUNDS
+    (excluded, limit), = session.fills
+    assert excluded == {ordinal for lookup in session.lookups for ordinal in lookup}
+    assert limit == 10
+    assert len({q.id for q in questions}) == 10
@@ -0,0 +1,43 @@
+import asyncio
+
+from core.utils.quiz_cache import AnswerKey, QuizCache
+
+
+def make_cache() -> QuizCache[AnswerKey]:
+    return QuizCache(name="Answer key", ttl=60, max_size=10)
+
+
+async def test_refresh_is_skipped_for_a_fresh_entry():
+    cache = make_cache()
+    cached = AnswerKey(quiz_id=1, keys={10: AnswerKey.digest("a")})
+    cache.put(cached)
+    loads = 0
+
+    async def loader(quiz_id):
+        nonlocal loads
+        loads += 1
+        return AnswerKey(quiz_id=quiz_id)
+
+    # A made-up question id on every submission must not reach the database
+    for _ in range(5):
+        assert await cache.refresh(1, loader, min_age=5) is cached
+    assert loads == 0
+    assert cached.is_correct(999, "a") is None
+
+
+async def test_refresh_replaces_an_old_entry_once():
+    cache = make_cache()
+    cache.put(AnswerKey(quiz_id=1, keys={10: AnswerKey.digest("a")}, loaded_at=0))
+    loads = 0
+
+    async def loader(quiz_id):
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return AnswerKey(quiz_id=quiz_id, keys={10: AnswerKey.digest("a"), 11: AnswerKey.digest("b")})
+
+    keys = await asyncio.gather(*(cache.refresh(1, loader, min_age=5) for _ in range(10)))
+
+    assert loads == 1
+    assert all(key.has_question(11) for key in keys)
+    assert (await cache.get(1, loader)).has_question(11)